@@ -0,0 +1,115 @@
+import json
+import os
+import re
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import unquote, urlparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from git_discovery import git_changed_files  # noqa: E402
+
+_REPO = re.compile(r"^/repos/(?P<owner>[^/]+)/(?P<name>[^/]+)(?P<rest>/.*)?$")
+
+
+class FakeGitHubServer:
+    """
+    Local stand-in for the parts of the GitHub REST API the reviewer uses.
+
+    Serves the repository, commit and compare endpoints for one local git
+    repository, answering with the file entries (status, patch, line counts,
+    blob SHA) GitHub would return for the same diff.
+    """
+
+    def __init__(self, repo_dir: str, full_name: str = "bench/synthetic", host: str = "127.0.0.1",
+                 port: int = 0):
+        """
+        Args:
+            repo_dir: Git repository to serve
+            full_name: Repository name (owner/repo) the fake answers to
+            host: Interface to listen on
+            port: Port to listen on, 0 picks a free one
+        """
+        self.repo_dir = repo_dir
+        self.full_name = full_name
+        self.requests = 0
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """API base URL of the fake (GITHUB_API_URL)."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeGitHubServer":
+        """Starts serving in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stops the server."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _files(self, head: str, base: Optional[str]) -> List[Dict[str, Any]]:
+        """Builds the "files" array of a commit or compare response."""
+        entries = []
+        for change in git_changed_files(head, self.repo_dir, base_sha=base):
+            entries.append({
+                "sha": change.blob_sha or "0" * 40,
+                "filename": change.path,
+                "status": change.status,
+                "additions": change.additions,
+                "deletions": change.deletions,
+                "changes": change.additions + change.deletions,
+                "patch": change.patch,
+            })
+        return entries
+
+    def _route(self, path: str) -> Optional[Dict[str, Any]]:
+        """Returns the JSON body for a GET path, or None for unknown paths."""
+        match = _REPO.match(path)
+        if not match or f"{match['owner']}/{match['name']}" != self.full_name:
+            return None
+        repo_url = f"{self.base_url}/repos/{self.full_name}"
+        rest = match["rest"] or ""
+        if not rest:
+            owner = {"login": match["owner"], "id": 1, "type": "Organization"}
+            return {"id": 1, "name": match["name"], "full_name": self.full_name, "owner": owner,
+                    "private": False, "url": repo_url, "default_branch": "main"}
+        if rest.startswith("/commits/"):
+            sha = unquote(rest[len("/commits/"):])
+            return {"sha": sha, "url": f"{repo_url}/commits/{sha}", "files": self._files(sha, None)}
+        if rest.startswith("/compare/"):
+            base, _, head = unquote(rest[len("/compare/"):]).partition("...")
+            return {"url": f"{repo_url}/compare/{base}...{head}", "status": "ahead",
+                    "commits": [], "files": self._files(head, base)}
+        return None
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):  # keep benchmark output clean
+                pass
+
+            def do_GET(self):
+                server.requests += 1
+                try:
+                    body = server._route(urlparse(self.path).path)
+                    status = 200 if body is not None else 404
+                except Exception as error:
+                    body, status = {"message": str(error)}, 500
+                data = json.dumps(body if body is not None else {"message": "Not Found"}).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
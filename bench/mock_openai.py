@@ -0,0 +1,136 @@
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+
+_FILE_HEADER = re.compile(r"^### FILE: (\S+)", re.MULTILINE)
+
+
+class MockOpenAIServer:
+    """
+    Local OpenAI-compatible chat completions endpoint for offline benchmarks.
+
+    Answers every chat with a short canned review after a configurable
+    latency. Multi-file review requests get one section per file, so the
+    reviewer's batch splitting behaves as in production. Every
+    rate_limit_every-th request is rejected with a 429 carrying retry-after
+    and x-ratelimit headers.
+    """
+
+    def __init__(self, latency: float = 0.5, jitter: float = 0.2, rate_limit_every: int = 0,
+                 retry_after: float = 1.0, host: str = "127.0.0.1", port: int = 0, seed: int = 0):
+        """
+        Args:
+            latency: Mean seconds before a completion is returned
+            jitter: Maximum random deviation from the mean latency, in seconds
+            rate_limit_every: Reject every n-th request with a 429 (0 disables)
+            retry_after: Seconds announced in the retry-after header of a 429
+            host: Interface to listen on
+            port: Port to listen on, 0 picks a free one
+            seed: Random seed for the latency jitter
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.requests = 0
+        self.rate_limited = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """OpenAI base_url of the stub."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "MockOpenAIServer":
+        """Starts serving in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stops the server."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _next_request(self) -> Tuple[bool, float]:
+        """Counts a request and decides whether it is rate limited and how long it takes."""
+        with self._lock:
+            self.requests += 1
+            limited = bool(self.rate_limit_every) and self.requests % self.rate_limit_every == 0
+            if limited:
+                self.rate_limited += 1
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+        return limited, delay
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):  # keep benchmark output clean
+                pass
+
+            def _send(self, status: int, body: dict, headers: Optional[dict] = None) -> None:
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                if not self.path.endswith("/chat/completions"):
+                    self._send(404, {"error": {"message": f"Unknown endpoint {self.path}"}})
+                    return
+                limited, delay = server._next_request()
+                if limited:
+                    self._send(429, {"error": {"message": "Rate limit reached", "type": "rate_limit"}}, {
+                        "retry-after": str(server.retry_after),
+                        "x-ratelimit-remaining-requests": "0",
+                        "x-ratelimit-reset-requests": f"{server.retry_after}s",
+                    })
+                    return
+                time.sleep(delay)
+                prompt = "\n".join(str(message.get("content") or "") for message in request.get("messages", []))
+                files = _FILE_HEADER.findall(prompt)
+                if files:
+                    content = "\n\n".join(f"### FILE: {path}\nNo major issues. Consider adding docstrings."
+                                          for path in files)
+                else:
+                    content = ("**Optimization Suggestions**: Cache repeated lookups.\n"
+                               "**Coding Standards**: Replace print/console.log with a logger.")
+                prompt_tokens = max(1, len(prompt) // 4)
+                completion_tokens = max(1, len(content) // 4)
+                self._send(200, {
+                    "id": f"chatcmpl-bench-{server.requests}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": request.get("model", "mock"),
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }],
+                    "usage": {
+                        "prompt_tokens": prompt_tokens,
+                        "completion_tokens": completion_tokens,
+                        "total_tokens": prompt_tokens + completion_tokens,
+                    },
+                }, {
+                    "x-ratelimit-remaining-requests": "1000",
+                    "x-ratelimit-reset-requests": "1s",
+                })
+
+        return Handler
@@ -0,0 +1,101 @@
+"""
+Sends a fake GitHub push webhook to a running review service.
+
+Builds the push payload for a commit range of a local git repository (the
+service clones it through its path, so it must run with
+REVIEW_SERVICE_LOCAL_CLONE_ROOT set to a directory above the repository),
+signs it like GitHub does and, with --wait, polls the job until it finishes.
+
+Example:
+    python bench/post_webhook.py --repo /tmp/project --before HEAD~3 --secret s3cret --wait
+"""
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import Any, Dict
+
+
+def rev_parse(repo_dir: str, revision: str) -> str:
+    """Resolves a revision of the local repository to a commit SHA."""
+    return subprocess.run(["git", "-C", repo_dir, "rev-parse", f"{revision}^{{commit}}"], check=True,
+                          capture_output=True, text=True).stdout.strip()
+
+
+def push_payload(repo_dir: str, full_name: str, before: str, after: str, actor: str) -> Dict[str, Any]:
+    """
+    Builds the fields of a push webhook the service reads.
+
+    Args:
+        repo_dir: Local repository, used as the clone URL
+        full_name: Repository name (owner/repo) to report
+        before: Branch head before the push
+        after: Branch head after the push
+        actor: Login of the pusher
+
+    Returns:
+        Webhook payload
+    """
+    return {
+        "ref": "refs/heads/main",
+        "before": before,
+        "after": after,
+        "deleted": False,
+        "repository": {"full_name": full_name, "clone_url": os.path.abspath(repo_dir)},
+        "sender": {"login": actor},
+    }
+
+
+def post(url: str, event: str, payload: Dict[str, Any], secret: str) -> Dict[str, Any]:
+    """Posts one signed webhook delivery and returns the service's answer."""
+    body = json.dumps(payload).encode("utf-8")
+    headers = {"Content-Type": "application/json", "X-GitHub-Event": event}
+    if secret:
+        digest = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+        headers["X-Hub-Signature-256"] = f"sha256={digest}"
+    request = urllib.request.Request(f"{url}/webhook", data=body, headers=headers, method="POST")
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return json.loads(response.read())
+
+
+def main():
+    """Posts the webhook and optionally waits for the job."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8080", help="Review service base URL")
+    parser.add_argument("--repo", required=True, help="Local git repository to review")
+    parser.add_argument("--full-name", default="local/project", help="Repository name to report")
+    parser.add_argument("--before", default="HEAD~1", help="Branch head before the push")
+    parser.add_argument("--after", default="HEAD", help="Branch head after the push")
+    parser.add_argument("--actor", default="local-user", help="Login of the pusher")
+    parser.add_argument("--secret", default=os.getenv("WEBHOOK_SECRET", ""), help="Webhook secret")
+    parser.add_argument("--wait", action="store_true", help="Poll the job until it finishes")
+    args = parser.parse_args()
+
+    payload = push_payload(args.repo, args.full_name, rev_parse(args.repo, args.before),
+                           rev_parse(args.repo, args.after), args.actor)
+    start = time.perf_counter()
+    try:
+        answer = post(args.url, "push", payload, args.secret)
+    except urllib.error.HTTPError as error:
+        sys.exit(f"Webhook rejected: {error.code} {error.read().decode('utf-8', 'replace')}")
+    print(json.dumps(answer))
+    if not args.wait or "job" not in answer:
+        return
+    while True:
+        with urllib.request.urlopen(f"{args.url}/jobs/{answer['job']}", timeout=30) as response:
+            job = json.loads(response.read())
+        if job["status"] in ("done", "failed"):
+            break
+        time.sleep(0.2)
+    job["seconds"] = round(time.perf_counter() - start, 3)
+    print(json.dumps(job, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Offline throughput benchmark for the code reviewer.
+
+Builds a synthetic git repository, starts a local OpenAI-compatible stub and
+a fake GitHub API, runs src/run_autogen_review.py end to end against them and
+reports files per second, p50/p95 file latency and peak RSS. No API quota is
+used; the reviewer runs unmodified, pointed at the stubs through
+OPENAI_BASE_URL and GITHUB_API_URL.
+
+Example:
+    python bench/run_benchmark.py --files 200 --latency 0.3 --rate-limit-every 25
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from fake_github import FakeGitHubServer
+from mock_openai import MockOpenAIServer
+from synthetic_repo import DEFAULT_MIX, create_repo
+
+REVIEWER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "run_autogen_review.py")
+
+
+def percentile(values: List[float], share: float) -> Optional[float]:
+    """
+    Returns the nearest-rank percentile of a list of values.
+
+    Args:
+        values: Sample
+        share: Percentile as a fraction, e.g. 0.95
+
+    Returns:
+        Percentile value, None for an empty sample
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(share * len(ordered))) - 1))]
+
+
+def file_latencies(profile: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Extracts the review latency of every file from a run profile.
+
+    Files reviewed together in one batched request all get the latency of
+    that request.
+
+    Args:
+        profile: Run profile written by the reviewer
+
+    Returns:
+        Mapping of file path to seconds spent reviewing it
+    """
+    latencies: Dict[str, float] = {}
+    for span in profile.get("spans", []):
+        attributes = span.get("attributes", {})
+        if span["name"] == "review_file" and "path" in attributes:
+            latencies[attributes["path"]] = span["wall"]
+        elif span["name"] == "review_batch":
+            for path in attributes.get("paths", []):
+                latencies[path] = span["wall"]
+    return latencies
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    """Parses an extension mix such as ".py=40,.js=20"."""
+    mix = {}
+    for item in value.split(","):
+        extension, _, weight = item.strip().partition("=")
+        if extension not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"Unsupported extension '{extension}'")
+        mix[extension] = int(weight or 1)
+    return mix
+
+
+def run_once(args: argparse.Namespace, repo_dir: str, base_sha: str, head_sha: str,
+             openai_server: MockOpenAIServer, github_server: FakeGitHubServer,
+             work_dir: str, index: int) -> Dict[str, Any]:
+    """
+    Runs the reviewer once and collects its measurements.
+
+    Returns:
+        Measurements of the run
+    """
+    profile_path = os.path.join(work_dir, f"run-profile-{index}.json")
+    env = dict(os.environ)
+    env.update({
+        "OPENAI_API_KEY": "bench",
+        "OPENAI_BASE_URL": openai_server.base_url,
+        "GITHUB_API_URL": github_server.base_url,
+        "GITHUB_TOKEN": "bench",
+        "GITHUB_REPOSITORY": github_server.full_name,
+        "GITHUB_SHA": head_sha,
+        "PUSH_BEFORE_SHA": base_sha,
+        "GITHUB_ACTOR": "bench",
+        "CHANGED_FILES_SOURCE": args.source,
+        "GIT_REPO_DIR": repo_dir,
+        # Every run must do the full work
+        "REVIEW_CACHE_PATH": "",
+        "LINT_CACHE_DIR": "",
+        "REPORT_BASENAME": os.path.join(work_dir, f"report-{index}"),
+        "REPORT_FORMATS": args.report_formats,
+        "RUN_PROFILE_PATH": profile_path,
+        "LLM_REQUESTS_PER_MINUTE": str(args.requests_per_minute),
+    })
+    env.pop("GMAIL_USER", None)
+    requests_before = openai_server.requests
+    limited_before = openai_server.rate_limited
+
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, REVIEWER], cwd=repo_dir, env=env,
+                               capture_output=not args.verbose, text=True)
+    wall = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise RuntimeError(f"Reviewer exited with {completed.returncode}:\n{completed.stderr or ''}")
+
+    with open(profile_path, encoding="utf-8") as profile_file:
+        profile = json.load(profile_file)
+    latencies = list(file_latencies(profile).values())
+    return {
+        "wall_seconds": round(wall, 3),
+        "files_per_second": round(args.files / wall, 3) if wall else None,
+        "files_reviewed": len(latencies),
+        "file_latency_p50": percentile(latencies, 0.50),
+        "file_latency_p95": percentile(latencies, 0.95),
+        "peak_rss_mb": profile["totals"]["peak_rss_mb"],
+        "llm_requests": openai_server.requests - requests_before,
+        "rate_limited": openai_server.rate_limited - limited_before,
+        "stages": {
+            name: stage["wall"] for name, stage in profile["stages"].items() if stage["kind"] == "stage"
+        },
+    }
+
+
+def main():
+    """Runs the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=50, help="Changed files in the synthetic commit")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX,
+                        help="Extension weights, e.g. '.py=40,.js=20,.tsx=15,.css=15,.html=10'")
+    parser.add_argument("--min-lines", type=int, default=20, help="Smallest file length")
+    parser.add_argument("--max-lines", type=int, default=200, help="Largest file length")
+    parser.add_argument("--changed-share", type=float, default=0.8,
+                        help="Share of files modified rather than added")
+    parser.add_argument("--latency", type=float, default=0.5, help="Mean LLM latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.2, help="LLM latency jitter in seconds")
+    parser.add_argument("--rate-limit-every", type=int, default=0,
+                        help="Answer every n-th LLM request with a 429 (0 disables)")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="retry-after seconds of a 429")
+    parser.add_argument("--requests-per-minute", type=int, default=0,
+                        help="Client-side LLM rate limit passed to the reviewer (0 disables)")
+    parser.add_argument("--source", choices=("git", "api"), default="api",
+                        help="Changed-file discovery: local git or the fake GitHub API")
+    parser.add_argument("--report-formats", default="json", help="REPORT_FORMATS for the reviewer")
+    parser.add_argument("--runs", type=int, default=1, help="Number of measured runs")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--verbose", action="store_true", help="Show the reviewer's log output")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="review-bench-") as work_dir:
+        repo_dir = os.path.join(work_dir, "repo")
+        base_sha, head_sha = create_repo(repo_dir, args.files, args.mix, args.min_lines, args.max_lines,
+                                         args.changed_share, args.seed)
+        openai_server = MockOpenAIServer(args.latency, args.jitter, args.rate_limit_every,
+                                         args.retry_after, seed=args.seed).start()
+        github_server = FakeGitHubServer(repo_dir).start()
+        try:
+            runs = [
+                run_once(args, repo_dir, base_sha, head_sha, openai_server, github_server, work_dir, index)
+                for index in range(args.runs)
+            ]
+        finally:
+            openai_server.stop()
+            github_server.stop()
+
+    # ru_maxrss of the children covers the reviewer and the linters it started
+    children_peak_kb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    results = {
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "verbose")},
+        "runs": runs,
+        "best_files_per_second": max(run["files_per_second"] for run in runs),
+        "children_peak_rss_mb": round(children_peak_kb / 1024, 1),
+    }
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
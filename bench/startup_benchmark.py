@@ -0,0 +1,136 @@
+"""
+Cold-start benchmark for the code reviewer.
+
+Times the reviewer in runs that should finish without touching the LLM:
+importing the module, failing environment validation, a push without
+changed files and a lint-only push (every file marked linguist-generated
+under GENERATED_CODE_POLICY=lint). Each scenario runs in a fresh
+interpreter with -X importtime, so the report shows wall time, the time
+spent importing and whether AutoGen was loaded at all.
+
+Example:
+    python bench/startup_benchmark.py --repeat 5
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from synthetic_repo import create_repo
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+REVIEWER = os.path.join(SRC_DIR, "run_autogen_review.py")
+
+# "import time: self [us] | cumulative | module", nesting shown by indentation
+_IMPORT_LINE = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \| (\s*)(\S+)")
+
+# Modules the lazy imports keep out of runs that never call the LLM
+HEAVY_MODULES = ("autogen", "openai", "github", "fpdf", "httpx")
+
+
+def parse_import_times(stderr: str) -> Dict[str, Any]:
+    """
+    Summarizes -X importtime output.
+
+    Args:
+        stderr: Interpreter stderr
+
+    Returns:
+        Total import seconds and the heavy top-level modules that were loaded
+    """
+    total_us = 0
+    loaded = set()
+    for line in stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if not match:
+            continue
+        cumulative, indent, module = match.groups()
+        top_level = module.split(".")[0]
+        if top_level in HEAVY_MODULES:
+            loaded.add(top_level)
+        if not indent:
+            total_us += int(cumulative)
+    return {"import_seconds": round(total_us / 1e6, 4), "heavy_modules": sorted(loaded)}
+
+
+def run_scenario(command: List[str], env: Dict[str, str], cwd: str, repeat: int) -> Dict[str, Any]:
+    """
+    Runs one scenario repeatedly in fresh interpreters.
+
+    Returns:
+        Median wall and import time, exit code and loaded heavy modules
+    """
+    walls, imports = [], []
+    result: Dict[str, Any] = {}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        completed = subprocess.run([sys.executable, "-X", "importtime", *command], cwd=cwd, env=env,
+                                   capture_output=True, text=True)
+        walls.append(time.perf_counter() - start)
+        result = parse_import_times(completed.stderr)
+        imports.append(result["import_seconds"])
+        result["exit_code"] = completed.returncode
+    result["wall_seconds"] = round(statistics.median(walls), 4)
+    result["import_seconds"] = round(statistics.median(imports), 4)
+    return result
+
+
+def main():
+    """Runs the startup benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per scenario (the median is reported)")
+    parser.add_argument("--files", type=int, default=5, help="Changed files in the lint-only push")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="review-startup-") as work_dir:
+        repo_dir = os.path.join(work_dir, "repo")
+        base_sha, _ = create_repo(repo_dir, args.files)
+        with open(os.path.join(repo_dir, ".gitattributes"), "w", encoding="utf-8") as attributes:
+            attributes.write("* linguist-generated\n")
+        subprocess.run(["git", "-C", repo_dir, "add", ".gitattributes"], check=True)
+        subprocess.run(["git", "-C", repo_dir, "commit", "-q", "-m", "mark generated"], check=True)
+        head_sha = subprocess.run(["git", "-C", repo_dir, "rev-parse", "HEAD"], check=True,
+                                  capture_output=True, text=True).stdout.strip()
+
+        base_env = {
+            key: value for key, value in os.environ.items()
+            if key not in ("OPENAI_API_KEY", "GITHUB_SHA", "GITHUB_ACTOR", "GITHUB_TOKEN", "GMAIL_USER")
+        }
+        run_env = dict(base_env, **{
+            "OPENAI_API_KEY": "bench",
+            "GITHUB_ACTOR": "bench",
+            "GITHUB_SHA": head_sha,
+            "CHANGED_FILES_SOURCE": "git",
+            "GIT_REPO_DIR": repo_dir,
+            "REVIEW_CACHE_PATH": "",
+            "LINT_CACHE_DIR": "",
+            "REPORT_BASENAME": os.path.join(work_dir, "report"),
+            "REPORT_FORMATS": "json",
+            "RUN_PROFILE_PATH": "",
+        })
+        scenarios = {
+            "import": (["-c", "import run_autogen_review"], dict(base_env, PYTHONPATH=os.pathsep.join(
+                filter(None, [SRC_DIR, base_env.get("PYTHONPATH")])))),
+            "bad_env": ([REVIEWER], base_env),
+            "no_changes": ([REVIEWER], dict(run_env, PUSH_BEFORE_SHA=head_sha)),
+            "lint_only": ([REVIEWER], dict(run_env, PUSH_BEFORE_SHA=base_sha, GENERATED_CODE_POLICY="lint")),
+        }
+        results = {
+            name: run_scenario(command, env, repo_dir, args.repeat) for name, (command, env) in scenarios.items()
+        }
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
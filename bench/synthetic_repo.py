@@ -0,0 +1,188 @@
+import os
+import random
+import shutil
+import subprocess
+from typing import Dict, Tuple
+
+# Default share of each file type in a synthetic repository
+DEFAULT_MIX = {".py": 40, ".js": 20, ".tsx": 15, ".css": 15, ".html": 10}
+
+# The reviewer's own checkout: its linter configs and installed Node linters
+REVIEWER_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+LINT_CONFIGS = (".eslintrc.json", ".stylelintrc.json", ".htmlvalidaterc.json")
+
+
+def _python_file(rng: random.Random, lines: int) -> str:
+    """Generates a Python module of roughly the given length."""
+    parts = ['"""Synthetic module."""\nimport os\n\n']
+    while sum(part.count("\n") for part in parts) < lines:
+        name = f"function_{rng.randrange(10 ** 6)}"
+        parts.append(
+            f"def {name}(value, items=None):\n"
+            f"    \"\"\"Returns a derived value.\"\"\"\n"
+            f"    total = 0\n"
+            f"    for item in items or []:\n"
+            f"        total += item * {rng.randrange(1, 9)}\n"
+            f"    print(total)\n"
+            f"    return value + total + len(os.sep)\n\n\n"
+        )
+    return "".join(parts)
+
+
+def _javascript_file(rng: random.Random, lines: int) -> str:
+    """Generates a JavaScript module of roughly the given length."""
+    parts = []
+    while sum(part.count("\n") for part in parts) < lines:
+        name = f"handler{rng.randrange(10 ** 6)}"
+        parts.append(
+            f"function {name}(items) {{\n"
+            f"  var total = 0;\n"
+            f"  for (var i = 0; i < items.length; i++) {{\n"
+            f"    total += items[i] * {rng.randrange(1, 9)};\n"
+            f"  }}\n"
+            f"  console.log(total);\n"
+            f"  return total;\n"
+            f"}}\n\n"
+        )
+    return "".join(parts) + "module.exports = {};\n"
+
+
+def _tsx_file(rng: random.Random, lines: int) -> str:
+    """Generates a React component file of roughly the given length."""
+    parts = ['import React from "react";\n\n']
+    while sum(part.count("\n") for part in parts) < lines:
+        name = f"Widget{rng.randrange(10 ** 6)}"
+        parts.append(
+            f"export function {name}(props: {{ label: string; count: number }}) {{\n"
+            f"  const doubled = props.count * {rng.randrange(1, 9)};\n"
+            f"  return (\n"
+            f"    <div onClick={{() => console.log(doubled)}}>\n"
+            f"      <span>{{props.label}}</span>\n"
+            f"    </div>\n"
+            f"  );\n"
+            f"}}\n\n"
+        )
+    return "".join(parts)
+
+
+def _css_file(rng: random.Random, lines: int) -> str:
+    """Generates a stylesheet of roughly the given length."""
+    parts = []
+    while sum(part.count("\n") for part in parts) < lines:
+        parts.append(
+            f".block-{rng.randrange(10 ** 6)} {{\n"
+            f"  color: #{rng.randrange(16 ** 6):06x};\n"
+            f"  margin: {rng.randrange(20)}px;\n"
+            f"  padding: {rng.randrange(20)}px {rng.randrange(20)}px;\n"
+            f"}}\n\n"
+        )
+    return "".join(parts)
+
+
+def _html_file(rng: random.Random, lines: int) -> str:
+    """Generates an HTML page of roughly the given length."""
+    items = "".join(
+        f"      <li><a href=\"/item/{rng.randrange(10 ** 6)}\">Item {index}</a></li>\n"
+        for index in range(max(lines - 12, 1))
+    )
+    return (
+        "<!DOCTYPE html>\n<html lang=\"en\">\n  <head>\n    <title>Synthetic page</title>\n  </head>\n"
+        f"  <body>\n    <img src=\"logo.png\">\n    <ul>\n{items}    </ul>\n  </body>\n</html>\n"
+    )
+
+
+GENERATORS = {
+    ".py": _python_file,
+    ".js": _javascript_file,
+    ".tsx": _tsx_file,
+    ".css": _css_file,
+    ".html": _html_file,
+}
+
+
+def _git(repo_dir: str, *args: str) -> str:
+    """Runs git in the synthetic repository."""
+    return subprocess.run(
+        ["git", "-C", repo_dir, *args], check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+def create_repo(repo_dir: str, files: int, mix: Dict[str, int] = DEFAULT_MIX,
+                min_lines: int = 20, max_lines: int = 200, changed_share: float = 1.0,
+                seed: int = 0) -> Tuple[str, str]:
+    """
+    Creates a git repository whose head commit changes a mix of source files.
+
+    The base commit holds the files in their first version; the head commit
+    rewrites part of every changed file and adds the rest, so both small
+    diffs and whole new files are reviewed. The base commit also carries the
+    reviewer's linter configs, and the reviewer's node_modules is linked in
+    (untracked), so the Node linters run offline as they would in CI.
+
+    Args:
+        repo_dir: Directory to create the repository in
+        files: Number of files changed by the head commit
+        mix: Relative weight of each extension
+        min_lines: Smallest file length in lines
+        max_lines: Largest file length in lines
+        changed_share: Share of the files that already exist in the base commit
+        seed: Random seed, so runs are comparable
+
+    Returns:
+        Tuple of (base commit SHA, head commit SHA)
+    """
+    rng = random.Random(seed)
+    extensions = rng.choices(list(mix), weights=list(mix.values()), k=files)
+    os.makedirs(repo_dir, exist_ok=True)
+    _git(repo_dir, "init", "-q")
+    _git(repo_dir, "config", "user.email", "bench@example.com")
+    _git(repo_dir, "config", "user.name", "bench")
+
+    paths = [
+        os.path.join(f"pkg{index % 10}", f"module_{index}{extension}")
+        for index, extension in enumerate(extensions)
+    ]
+    existing = set(rng.sample(paths, int(len(paths) * changed_share)))
+    with open(os.path.join(repo_dir, "README.md"), "w", encoding="utf-8") as readme:
+        readme.write("Synthetic benchmark repository\n")
+    _add_lint_setup(repo_dir)
+    for path in existing:
+        _write(repo_dir, path, GENERATORS[os.path.splitext(path)[1]](rng, rng.randint(min_lines, max_lines)))
+    _git(repo_dir, "add", "-A")
+    _git(repo_dir, "commit", "-q", "-m", "base")
+    base_sha = _git(repo_dir, "rev-parse", "HEAD")
+
+    for path in paths:
+        extension = os.path.splitext(path)[1]
+        content = GENERATORS[extension](rng, rng.randint(min_lines, max_lines))
+        if path in existing:
+            # Keep the first half of the old version so the diff has context
+            with open(os.path.join(repo_dir, path), encoding="utf-8") as old_file:
+                old_lines = old_file.read().splitlines(keepends=True)
+            content = "".join(old_lines[:len(old_lines) // 2]) + content
+        _write(repo_dir, path, content)
+    _git(repo_dir, "add", "-A")
+    _git(repo_dir, "commit", "-q", "-m", "head")
+    return base_sha, _git(repo_dir, "rev-parse", "HEAD")
+
+
+def _add_lint_setup(repo_dir: str) -> None:
+    """Copies the reviewer's linter configs into the repository and links its node_modules."""
+    for config_name in LINT_CONFIGS:
+        config_path = os.path.join(REVIEWER_ROOT, config_name)
+        if os.path.isfile(config_path):
+            shutil.copy(config_path, os.path.join(repo_dir, config_name))
+    node_modules = os.path.join(REVIEWER_ROOT, "node_modules")
+    if os.path.isdir(node_modules):
+        # ESLint and Stylelint resolve plugins and shared configs from here
+        os.symlink(node_modules, os.path.join(repo_dir, "node_modules"))
+        with open(os.path.join(repo_dir, ".git", "info", "exclude"), "a", encoding="utf-8") as exclude:
+            exclude.write("/node_modules\n")
+
+
+def _write(repo_dir: str, path: str, content: str) -> None:
+    """Writes one file below the repository root."""
+    full_path = os.path.join(repo_dir, path)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    with open(full_path, "w", encoding="utf-8") as file:
+        file.write(content)
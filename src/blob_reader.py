@@ -0,0 +1,113 @@
+import logging
+import subprocess
+import threading
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class BlobReadError(Exception):
+    """Raised when the git object database cannot be read."""
+
+
+class GitBlobReader:
+    """
+    Streams blobs from the git object database through one long-lived
+    "git cat-file --batch" process.
+
+    Works against working trees, bare mirrors and partial clones alike, so
+    changed files can be reviewed without checking them out. Reads are
+    serialized; the process is started on first use and restarted after an
+    error.
+    """
+
+    def __init__(self, repo_dir: str = "."):
+        """
+        Args:
+            repo_dir: Working tree or (bare) repository to read from
+        """
+        self.repo_dir = repo_dir
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+
+    def _start(self) -> None:
+        """Starts the cat-file process."""
+        try:
+            self._process = subprocess.Popen(
+                ["git", "-C", self.repo_dir, "cat-file", "--batch"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL
+            )
+        except OSError as error:
+            raise BlobReadError(f"Could not start git cat-file: {error}") from error
+
+    def read(self, object_name: str, max_size: Optional[int] = None) -> Tuple[Optional[bytes], int]:
+        """
+        Reads one object.
+
+        Args:
+            object_name: Blob SHA (or any "<rev>:<path>" name git understands, which
+                may contain spaces but not newlines)
+            max_size: Objects larger than this are skipped without being returned
+
+        Returns:
+            Tuple of (content, size); content is None if the object is missing
+            or larger than max_size, size is -1 if it is missing
+        """
+        if "\n" in object_name:
+            # cat-file reads one name per line; such a name cannot be requested
+            return None, -1
+        with self._lock:
+            if self._process is None or self._process.poll() is not None:
+                self._start()
+            try:
+                self._process.stdin.write(object_name.encode("utf-8") + b"\n")
+                self._process.stdin.flush()
+                header = self._process.stdout.readline().decode("utf-8", "replace").rstrip("\n")
+                if header.endswith((" missing", " ambiguous")):
+                    # "<name> missing" echoes the requested name, which may contain spaces;
+                    # nothing else follows
+                    return None, -1
+                # "<sha> <type> <size>"
+                size = int(header.rsplit(" ", 1)[-1])
+                if max_size is not None and size > max_size:
+                    # Drain oversized objects in small pieces instead of buffering them
+                    remaining = size + 1
+                    while remaining:
+                        chunk = self._process.stdout.read(min(remaining, 65536))
+                        if not chunk:
+                            raise BlobReadError(f"git cat-file returned a truncated object for {object_name}")
+                        remaining -= len(chunk)
+                    return None, size
+                content = self._process.stdout.read(size)
+                self._process.stdout.read(1)  # trailing newline
+            except (OSError, ValueError, BlobReadError) as error:
+                self._stop()
+                raise BlobReadError(f"git cat-file failed on {object_name}: {error}") from error
+            if len(content) != size:
+                self._stop()
+                raise BlobReadError(f"git cat-file returned a truncated object for {object_name}")
+        return content, size
+
+    def _stop(self) -> None:
+        """Kills the cat-file process; the next read starts a fresh one."""
+        if self._process is not None:
+            try:
+                self._process.kill()
+                self._process.wait(timeout=5)
+            except Exception:
+                pass
+            self._process = None
+
+    def close(self) -> None:
+        """Shuts the cat-file process down."""
+        with self._lock:
+            if self._process is None:
+                return
+            try:
+                self._process.stdin.close()
+                self._process.wait(timeout=5)
+            except Exception:
+                self._stop()
+            self._process = None
@@ -0,0 +1,148 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+RECORD = "record"
+REPLAY = "replay"
+
+CASSETTE_VERSION = 1
+
+
+class CassetteMiss(LookupError):
+    """Raised when a replayed run makes a request the cassette has no response for."""
+
+
+class Cassette:
+    """
+    Recorded GitHub API and LLM traffic of one review run.
+
+    In record mode, every interaction is appended with its latency and the
+    cassette is written as gzipped JSON by save(). In replay mode, the
+    interactions are loaded from disk and served by key; a key that was
+    recorded several times (e.g. a 429 followed by the retried success)
+    replays its responses in the recorded order, repeating the last one.
+    Requests are stored only as a hash, so cassettes stay small and hold no
+    prompts or credentials beyond what the responses contain.
+    """
+
+    def __init__(self, path: str, mode: str, replay_latency: bool = True):
+        """
+        Args:
+            path: Cassette file
+            mode: RECORD or REPLAY
+            replay_latency: Wait the recorded latency before serving a replayed response
+
+        Raises:
+            OSError: If a cassette to replay cannot be read
+            ValueError: If the mode is unknown or the cassette is malformed
+        """
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown cassette mode '{mode}'")
+        self.path = os.path.abspath(path)
+        self.mode = mode
+        self.replay_latency = replay_latency
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._interactions: List[Dict[str, Any]] = []
+        self._by_key: Dict[str, List[Dict[str, Any]]] = {}
+        self._positions: Dict[str, int] = {}
+        if mode == REPLAY:
+            self._load()
+
+    @staticmethod
+    def make_key(kind: str, *parts: Any) -> str:
+        """
+        Builds the key of one request.
+
+        Args:
+            kind: Interaction kind, e.g. "github" or "llm"
+            *parts: JSON-serializable request details
+
+        Returns:
+            Hex digest identifying the request
+        """
+        payload = json.dumps([kind, *parts], sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @property
+    def recording(self) -> bool:
+        """Whether interactions are being recorded."""
+        return self.mode == RECORD
+
+    @property
+    def replaying(self) -> bool:
+        """Whether responses are served from the cassette."""
+        return self.mode == REPLAY
+
+    def record(self, kind: str, key: str, response: Any, latency: float) -> None:
+        """
+        Appends one interaction.
+
+        Args:
+            kind: Interaction kind
+            key: Request key from make_key()
+            response: JSON-serializable response
+            latency: Seconds the live request took
+        """
+        with self._lock:
+            self._interactions.append({"kind": kind, "key": key, "latency": round(latency, 6), "response": response})
+
+    def replay(self, kind: str, key: str) -> Any:
+        """
+        Serves the next recorded response for a request.
+
+        Args:
+            kind: Interaction kind
+            key: Request key from make_key()
+
+        Returns:
+            Recorded response
+
+        Raises:
+            CassetteMiss: If the request was never recorded
+        """
+        with self._lock:
+            entries = self._by_key.get(key)
+            if not entries:
+                self.misses += 1
+                raise CassetteMiss(f"No recorded {kind} response for request {key[:12]}")
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            entry = entries[min(position, len(entries) - 1)]
+        if self.replay_latency and entry["latency"] > 0:
+            time.sleep(entry["latency"])
+        return entry["response"]
+
+    def _load(self) -> None:
+        with gzip.open(self.path, "rt", encoding="utf-8") as cassette_file:
+            data = json.load(cassette_file)
+        if not isinstance(data, dict) or data.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"Unsupported cassette format in {self.path}")
+        self._interactions = data["interactions"]
+        for entry in self._interactions:
+            self._by_key.setdefault(entry["key"], []).append(entry)
+        logger.info(f"Replaying {len(self._interactions)} recorded interactions from {self.path}")
+
+    def save(self) -> None:
+        """Writes the recorded interactions (record mode only)."""
+        if not self.recording:
+            return
+        with self._lock:
+            data = {"version": CASSETTE_VERSION, "created": time.time(), "interactions": list(self._interactions)}
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with gzip.open(self.path, "wt", encoding="utf-8") as cassette_file:
+                json.dump(data, cassette_file, separators=(",", ":"))
+            logger.info(f"Cassette written: {self.path} ({len(data['interactions'])} interactions)")
+        except OSError as error:
+            logger.error(f"Could not write cassette: {error}")
+
@@ -0,0 +1,64 @@
+import os
+from typing import NamedTuple, Optional
+
+# Extensions that are always treated as binary, whatever the diff backend reports
+BINARY_EXTENSIONS = frozenset({
+    ".png", ".jpg", ".jpeg", ".gif", ".bmp", ".ico", ".webp", ".avif", ".psd",
+    ".pdf", ".zip", ".gz", ".tgz", ".bz2", ".xz", ".7z", ".rar", ".jar", ".war",
+    ".woff", ".woff2", ".ttf", ".otf", ".eot", ".mp3", ".mp4", ".mov", ".avi",
+    ".webm", ".wav", ".ogg", ".exe", ".dll", ".so", ".dylib", ".bin", ".class",
+    ".pyc", ".wasm", ".sqlite", ".db",
+})
+
+# Git name-status letters mapped to the GitHub API's file status vocabulary
+GIT_STATUS_NAMES = {
+    "A": "added", "M": "modified", "D": "removed", "R": "renamed",
+    "C": "copied", "T": "changed",
+}
+
+
+class ChangedFile(NamedTuple):
+    """One file changed by the reviewed commit or push range."""
+
+    path: str
+    # Unified diff hunks, None when the backend has none (binary, too large, pure rename)
+    patch: Optional[str]
+    # Git blob SHA of the file's final content, None for deleted files
+    blob_sha: Optional[str]
+    # GitHub vocabulary: added, modified, removed, renamed, copied, changed
+    status: str = "modified"
+    additions: int = 0
+    deletions: int = 0
+    is_binary: bool = False
+
+
+def is_binary_path(file_path: str) -> bool:
+    """
+    Checks whether a path has a well-known binary extension.
+
+    Args:
+        file_path: Repository-relative path
+
+    Returns:
+        True for binary asset types
+    """
+    return os.path.splitext(file_path)[1].lower() in BINARY_EXTENSIONS
+
+
+def skip_reason(change: ChangedFile) -> Optional[str]:
+    """
+    Decides whether a change can produce findings at all.
+
+    Args:
+        change: Change record from discovery
+
+    Returns:
+        Report note explaining why the file is skipped, or None to review it
+    """
+    if change.status == "removed":
+        return "File deleted. Skipped."
+    if change.is_binary:
+        return "Binary file. Skipped."
+    if change.status == "renamed" and not change.additions and not change.deletions and not change.patch:
+        return "File renamed without content changes. Skipped."
+    return None
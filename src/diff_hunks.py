@@ -0,0 +1,186 @@
+import re
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+_HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+# Separates the changed regions of an excerpt
+_REGION_SEPARATOR = "\n...\n"
+
+# Line number and "+"/"-"/" " marker in front of each excerpt line
+_LINE_PREFIX = re.compile(r"\s*\d* [-+ ] ?")
+
+
+def parse_patch(patch: str) -> Tuple[Set[int], Dict[int, List[str]], List[Tuple[int, int]]]:
+    """
+    Parses a unified diff patch (as returned by the GitHub API for one file).
+
+    Args:
+        patch: Patch text made of one or more "@@ ... @@" hunks
+
+    Returns:
+        Tuple of (added new-file line numbers, removed lines keyed by the
+        new-file line they precede, (start, end) new-file range of each hunk)
+    """
+    added: Set[int] = set()
+    removed: Dict[int, List[str]] = {}
+    hunk_ranges: List[Tuple[int, int]] = []
+    new_line = 0
+    for line in patch.splitlines():
+        header = _HUNK_HEADER.match(line)
+        if header:
+            new_line = int(header.group(3))
+            new_count = int(header.group(4)) if header.group(4) is not None else 1
+            hunk_ranges.append((new_line, new_line + max(new_count, 1) - 1))
+            continue
+        if not hunk_ranges or line.startswith("\\"):
+            continue  # preamble or "\ No newline at end of file"
+        if line.startswith("+"):
+            added.add(new_line)
+            new_line += 1
+        elif line.startswith("-"):
+            removed.setdefault(new_line, []).append(line[1:])
+        else:
+            new_line += 1
+    return added, removed, hunk_ranges
+
+
+def build_hunk_excerpt(content: str, patch: Optional[str], context_lines: int = 10) -> Optional[str]:
+    """
+    Builds a review excerpt of the changed regions of a file.
+
+    Each hunk is widened by context_lines of the current file content on both
+    sides and overlapping regions are merged. Lines are numbered; added lines
+    are marked "+" and removed lines are shown inline, marked "-".
+
+    Args:
+        content: Current file content
+        patch: Unified diff patch for the file, if known
+        context_lines: Unchanged lines to include around each hunk
+
+    Returns:
+        Excerpt text, or None if the patch is missing or has no hunks
+    """
+    if not patch:
+        return None
+    added, removed, hunk_ranges = parse_patch(patch)
+    if not hunk_ranges:
+        return None
+
+    lines = content.splitlines()
+    last_line = len(lines) + 1  # deletions at end of file sit after the last line
+    regions: List[Tuple[int, int]] = []
+    for start, end in sorted(hunk_ranges):
+        start = max(1, start - context_lines)
+        end = min(last_line, end + context_lines)
+        if regions and start <= regions[-1][1] + 1:
+            regions[-1] = (regions[-1][0], max(regions[-1][1], end))
+        else:
+            regions.append((start, end))
+
+    sections = []
+    for start, end in regions:
+        section = [f"@@ lines {start}-{min(end, len(lines))} @@"]
+        for line_number in range(start, end + 1):
+            for removed_line in removed.get(line_number, []):
+                section.append(f"{'':>5} - {removed_line}")
+            if line_number <= len(lines):
+                marker = "+" if line_number in added else " "
+                section.append(f"{line_number:>5} {marker} {lines[line_number - 1]}")
+        sections.append("\n".join(section))
+    return _REGION_SEPARATOR.join(sections)
+
+
+def is_file_addition(patch: Optional[str]) -> bool:
+    """
+    Tells whether a patch adds the whole file (a single "@@ -0,0 +1,N @@" hunk).
+
+    Args:
+        patch: Unified diff patch for the file, if known
+
+    Returns:
+        True for the patch of a new file
+    """
+    if not patch:
+        return False
+    headers = [_HUNK_HEADER.match(line) for line in patch.splitlines()]
+    headers = [header for header in headers if header]
+    return len(headers) == 1 and headers[0].group(1) == "0" and headers[0].group(2) == "0"
+
+
+def _region_piece(region_header: str, group: List[str]) -> str:
+    """Joins lines of a region under a header naming the line numbers they cover."""
+    # Numbered lines start with their line number; removed lines with "-"
+    numbers = [line.split(maxsplit=1)[0] for line in group if line.strip()]
+    numbers = [number for number in numbers if number.isdigit()]
+    header = f"@@ lines {numbers[0]}-{numbers[-1]} @@" if numbers else region_header
+    return "\n".join([header] + group)
+
+
+def _split_line(region_header: str, line: str, max_tokens: int, count_tokens: Callable[[str], int]) -> List[str]:
+    """Splits an excerpt line too large for a piece, repeating its number and marker on each segment."""
+    if count_tokens(_region_piece(region_header, [line])) <= max_tokens:
+        return [line]
+    match = _LINE_PREFIX.match(line)
+    prefix = match.group(0) if match else ""
+    text = line[len(prefix):]
+    if not text:
+        return [line]
+    segments = []
+    while text:
+        # Longest head of the text that still fits, at least one character
+        low, high = 1, len(text)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if count_tokens(_region_piece(region_header, [prefix + text[:middle]])) <= max_tokens:
+                low = middle
+            else:
+                high = middle - 1
+        segments.append(prefix + text[:low])
+        text = text[low:]
+    return segments
+
+
+def _split_region(region: str, max_tokens: int, count_tokens: Callable[[str], int]) -> List[str]:
+    """Splits one "@@ lines a-b @@" region by lines, giving every piece its own header."""
+    region_header, *body = region.splitlines()
+    pieces = []
+    group: List[str] = []
+    for line in body:
+        for segment in _split_line(region_header, line, max_tokens, count_tokens):
+            if group and count_tokens(_region_piece(region_header, group + [segment])) > max_tokens:
+                pieces.append(_region_piece(region_header, group))
+                group = []
+            group.append(segment)
+    if group:
+        pieces.append(_region_piece(region_header, group))
+    return pieces
+
+
+def split_excerpt(excerpt: str, max_tokens: int, count_tokens: Callable[[str], int]) -> List[str]:
+    """
+    Splits an excerpt from build_hunk_excerpt() into parts that fit a token budget.
+
+    Parts end at region boundaries; a region too large on its own is split by
+    lines, and a line too large on its own into segments. Every part fits the
+    budget unless a single character with its line header does not.
+
+    Args:
+        excerpt: Excerpt text
+        max_tokens: Token budget per part
+        count_tokens: Function estimating the tokens of a text
+
+    Returns:
+        Excerpt parts covering every region in order
+    """
+    parts = []
+    current: List[str] = []
+    for region in excerpt.split(_REGION_SEPARATOR):
+        pieces = [region] if count_tokens(region) <= max_tokens else _split_region(region, max_tokens, count_tokens)
+        for piece in pieces:
+            if current and count_tokens(_REGION_SEPARATOR.join(current + [piece])) > max_tokens:
+                parts.append(_REGION_SEPARATOR.join(current))
+                current = []
+            current.append(piece)
+    if current:
+        parts.append(_REGION_SEPARATOR.join(current))
+    return parts
@@ -0,0 +1,215 @@
+import json
+import os
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+SEVERITIES = ("error", "warning", "info")
+
+# flake8 has no JSON formatter; this layout splits unambiguously on tabs
+FLAKE8_FORMAT = "%(path)s\t%(row)d\t%(col)d\t%(code)s\t%(text)s"
+
+
+class Finding:
+    """One linter finding. Slotted: large runs hold many of these."""
+
+    __slots__ = ("path", "line", "col", "rule", "severity", "message")
+
+    def __init__(self, path: str, line: int, col: int, rule: str, severity: str, message: str):
+        """
+        Args:
+            path: File the finding belongs to
+            line: 1-based line, 0 when the finding is about the whole file
+            col: 1-based column, 0 when unknown
+            rule: Rule or error code, empty when the tool reports none
+            severity: "error", "warning" or "info"
+            message: Finding text
+        """
+        self.path = path
+        self.line = line
+        self.col = col
+        self.rule = rule
+        self.severity = severity
+        self.message = message
+
+    def _key(self) -> tuple:
+        return (self.path, self.line, self.col, self.rule, self.severity, self.message)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Finding) and self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __repr__(self) -> str:
+        return f"Finding({self.path!r}, {self.line}, {self.col}, {self.rule!r}, {self.severity!r}, {self.message!r})"
+
+    def format(self) -> str:
+        """Returns the finding as one report line."""
+        rule = f" [{self.rule}]" if self.rule else ""
+        return f"{self.path}:{self.line}:{self.col}: {self.severity}{rule} {self.message}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the finding as a JSON-ready dict."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Finding":
+        """Builds a finding from to_dict() output."""
+        return cls(**{name: data[name] for name in cls.__slots__})
+
+
+class LintReport(NamedTuple):
+    """Result of one linter on one file."""
+
+    # Display name of the linter, e.g. "Flake8 (Python)"
+    tool: str
+    findings: List[Finding]
+    # Set when the linter could not run; findings are empty then
+    error: Optional[str] = None
+
+    def format(self) -> str:
+        """Renders the report section text."""
+        if self.error is not None:
+            return self.error
+        lines = "\n".join(finding.format() for finding in self.findings)
+        return f"{self.tool} findings:\n{lines or 'No issues found.'}"
+
+    def with_path(self, path: str) -> "LintReport":
+        """Returns the report with every finding moved to another path."""
+        findings = [Finding(path, f.line, f.col, f.rule, f.severity, f.message) for f in self.findings]
+        return self._replace(findings=findings)
+
+    def to_json(self) -> str:
+        """Serializes a successful report (for the lint cache)."""
+        return json.dumps({"tool": self.tool, "findings": [finding.to_dict() for finding in self.findings]})
+
+    @classmethod
+    def from_json(cls, text: str) -> "LintReport":
+        """
+        Restores a report written by to_json().
+
+        Raises:
+            ValueError: If the text is not a serialized report
+        """
+        try:
+            data = json.loads(text)
+            return cls(data["tool"], [Finding.from_dict(item) for item in data["findings"]])
+        except (KeyError, TypeError, AttributeError) as error:
+            raise ValueError(f"Not a serialized lint report: {error}") from error
+
+
+def _severity(value: Any) -> str:
+    """Maps the tools' severity notations (2/1/0, "error", ...) to SEVERITIES."""
+    if value in (2, "error", "fatal"):
+        return "error"
+    if value in (1, "warning", "warn"):
+        return "warning"
+    return "info"
+
+
+def eslint_findings(document: Sequence[Dict[str, Any]]) -> List[Finding]:
+    """
+    Reads ESLint "--format json" output. html-validate's JSON formatter uses the same shape.
+
+    Args:
+        document: Parsed JSON document (a list of per-file results)
+
+    Returns:
+        Findings with the paths as reported by the tool
+    """
+    findings = []
+    for result in document:
+        for message in result.get("messages", []):
+            findings.append(Finding(
+                result.get("filePath", ""),
+                message.get("line") or 0,
+                message.get("column") or 0,
+                message.get("ruleId") or "",
+                "error" if message.get("fatal") else _severity(message.get("severity")),
+                message.get("message", "")
+            ))
+    return findings
+
+
+def stylelint_findings(document: Sequence[Dict[str, Any]]) -> List[Finding]:
+    """
+    Reads Stylelint "--formatter json" output.
+
+    Args:
+        document: Parsed JSON document (a list of per-file results)
+
+    Returns:
+        Findings with the paths as reported by the tool
+    """
+    findings = []
+    for result in document:
+        for warning in result.get("warnings", []):
+            rule = warning.get("rule") or ""
+            message = warning.get("text", "")
+            suffix = f" ({rule})"
+            if rule and message.endswith(suffix):
+                message = message[:-len(suffix)]
+            findings.append(Finding(
+                result.get("source", ""),
+                warning.get("line") or 0,
+                warning.get("column") or 0,
+                rule,
+                _severity(warning.get("severity")),
+                message
+            ))
+    return findings
+
+
+def flake8_findings(output: str) -> List[Finding]:
+    """
+    Reads flake8 output written with FLAKE8_FORMAT.
+
+    Args:
+        output: Raw stdout
+
+    Returns:
+        Findings with the paths as reported by the tool
+    """
+    findings = []
+    for line in output.splitlines():
+        fields = line.rsplit("\t", 4)
+        if len(fields) != 5 or not fields[1].isdigit() or not fields[2].isdigit():
+            continue
+        path, line_number, col, code, message = fields
+        # pyflakes (F) and syntax/IO errors (E9) break code; the rest is style
+        severity = "error" if code.startswith(("F", "E9")) else "warning"
+        findings.append(Finding(path, int(line_number), int(col), code, severity, message))
+    return findings
+
+
+def group_findings(findings: Iterable[Finding], file_paths: Sequence[str]) -> Dict[str, List[Finding]]:
+    """
+    Assigns findings to the linted files, dropping duplicates.
+
+    Tools report paths as given or made absolute; both are mapped back to the
+    path that was passed in.
+
+    Args:
+        findings: Findings from one linter run
+        file_paths: Files that were passed to the linter
+
+    Returns:
+        Mapping of every file path to its findings, ordered by position
+    """
+    index = {}
+    for file_path in file_paths:
+        index[os.path.abspath(file_path)] = file_path
+        index[file_path] = file_path
+    grouped: Dict[str, List[Finding]] = {file_path: [] for file_path in file_paths}
+    seen = set()
+    for finding in findings:
+        file_path = index.get(finding.path) or index.get(os.path.abspath(finding.path))
+        if file_path is None:
+            continue
+        finding.path = file_path
+        if finding in seen:
+            continue
+        seen.add(finding)
+        grouped[file_path].append(finding)
+    for file_findings in grouped.values():
+        file_findings.sort(key=lambda finding: (finding.line, finding.col))
+    return grouped
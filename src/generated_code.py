@@ -0,0 +1,156 @@
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Pattern, Tuple
+
+from path_filter import compile_glob
+
+# Header phrases written by code generators, looked for in the first lines only
+_GENERATED_HEADER = re.compile(
+    r"@generated|do not edit|code generated by|auto-?generated|this file (?:was|is) generated"
+    r"|generated by the protocol buffer compiler|generated by (?:django|swagger|openapi|thrift)",
+    re.IGNORECASE
+)
+HEADER_LINES = 10
+
+# Well-known generator outputs and vendored directories
+_GENERATED_PATH = re.compile(
+    r"\.min\.(?:js|css|mjs)$|\.bundle\.js$|_pb2(?:_grpc)?\.pyi?$|\.pb\.(?:go|cc|h)$|\.pb\.gw\.go$"
+    r"|\.g\.dart$|\.designer\.cs$|\.generated\.\w+$|(?:^|/)__generated__/"
+)
+_VENDORED_PATH = re.compile(r"(?:^|/)(?:vendor|vendors|third_party|thirdparty|bower_components)/")
+
+# Content statistics are taken over a prefix so huge files stay cheap
+SAMPLE_CHARS = 64 * 1024
+MIN_SAMPLE_CHARS = 1000
+# Minified code: long lines (on average, or carrying most of the text) with little whitespace
+LONG_LINE = 500
+MAX_AVERAGE_LINE_LENGTH = 250
+MAX_LONG_LINE_SHARE = 0.5
+MIN_WHITESPACE_RATIO = 0.08
+# Embedded data (base64, packed tables): character entropy in bits
+MAX_ENTROPY = 5.6
+
+
+def parse_gitattributes(text: str) -> List[Tuple[Pattern, Dict[str, bool]]]:
+    """
+    Extracts the linguist-generated/linguist-vendored rules of a .gitattributes file.
+
+    Args:
+        text: Content of the file
+
+    Returns:
+        List of (compiled path pattern, {attribute: set or unset}) in file order
+    """
+    rules = []
+    for line in text.splitlines():
+        fields = line.split()
+        if not fields or fields[0].startswith("#"):
+            continue
+        attributes = {}
+        for field in fields[1:]:
+            value = True
+            if field[0] in "-!":
+                field, value = field[1:], False
+            elif "=" in field:
+                field, setting = field.split("=", 1)
+                value = setting.lower() not in ("false", "0", "no")
+            if field in ("linguist-generated", "linguist-vendored"):
+                attributes[field] = value
+        if attributes:
+            rules.append((compile_glob(fields[0]), attributes))
+    return rules
+
+
+def _entropy(text: str) -> float:
+    """Returns the Shannon entropy of a text's characters, in bits."""
+    counts = Counter(text)
+    total = len(text)
+    return -sum(count / total * math.log2(count / total) for count in counts.values())
+
+
+class GeneratedFileDetector:
+    """
+    Flags generated, minified and vendored files, which are not worth an LLM review.
+
+    Checks, cheapest first: linguist-generated/linguist-vendored from
+    .gitattributes (which also let a repository un-flag a path), well-known
+    generator and vendor paths, generator header markers, then line-length
+    and entropy statistics of the content.
+    """
+
+    def __init__(self, gitattributes: str = ""):
+        """
+        Args:
+            gitattributes: Content of the repository's root .gitattributes
+        """
+        self._rules = parse_gitattributes(gitattributes)
+
+    def _attributes(self, file_path: str) -> Dict[str, bool]:
+        """Returns the linguist attributes in effect for a path (last match wins)."""
+        attributes: Dict[str, bool] = {}
+        for pattern, values in self._rules:
+            if pattern.fullmatch(file_path):
+                attributes.update(values)
+        return attributes
+
+    def classify_path(self, file_path: str) -> Optional[str]:
+        """
+        Classifies a file by its path alone.
+
+        Args:
+            file_path: Repository-relative path
+
+        Returns:
+            Reason the file is generated or vendored, or None
+        """
+        attributes = self._attributes(file_path)
+        if attributes.get("linguist-generated"):
+            return "marked linguist-generated"
+        if attributes.get("linguist-vendored"):
+            return "marked linguist-vendored"
+        if attributes.get("linguist-generated") is False or attributes.get("linguist-vendored") is False:
+            return None
+        if _VENDORED_PATH.search(file_path):
+            return "vendored path"
+        if _GENERATED_PATH.search(file_path):
+            return "generated file name"
+        return None
+
+    def classify(self, file_path: str, content: str) -> Optional[str]:
+        """
+        Classifies a file by its path and content.
+
+        Args:
+            file_path: Repository-relative path
+            content: File content
+
+        Returns:
+            Reason the file is generated, minified or vendored, or None
+        """
+        reason = self.classify_path(file_path)
+        if reason is not None:
+            return reason
+        attributes = self._attributes(file_path)
+        if attributes.get("linguist-generated") is False or attributes.get("linguist-vendored") is False:
+            return None
+
+        header = "\n".join(content[:4096].splitlines()[:HEADER_LINES])
+        if _GENERATED_HEADER.search(header):
+            return "generated-file header"
+
+        sample = content[:SAMPLE_CHARS]
+        if len(sample) < MIN_SAMPLE_CHARS:
+            return None
+        lines = sample.splitlines() or [sample]
+        average_length = len(sample) / len(lines)
+        long_share = sum(len(line) for line in lines if len(line) > LONG_LINE) / len(sample)
+        whitespace_ratio = sum(1 for char in sample if char.isspace()) / len(sample)
+        if average_length <= MAX_AVERAGE_LINE_LENGTH and long_share <= MAX_LONG_LINE_SHARE:
+            return None
+        # Long lines alone also fit hand-written markup (e.g. long class lists)
+        if whitespace_ratio < MIN_WHITESPACE_RATIO:
+            return f"minified (average line length {average_length:.0f})"
+        if _entropy(sample) > MAX_ENTROPY:
+            return "embedded data"
+        return None
@@ -0,0 +1,189 @@
+import codecs
+import logging
+import subprocess
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from changes import GIT_STATUS_NAMES, ChangedFile, is_binary_path
+
+logger = logging.getLogger(__name__)
+
+
+class GitDiscoveryError(Exception):
+    """Raised when the local repository cannot answer a discovery query."""
+
+
+def run_git(args: List[str], repo_dir: str = ".", timeout: int = 60, config: Sequence[str] = ()) -> str:
+    """
+    Runs a git command and returns its stdout.
+
+    Args:
+        args: Arguments after "git"
+        repo_dir: Working tree or bare repository to run in
+        timeout: Timeout in seconds
+        config: Extra "name=value" settings for this command only (not stored in the repository)
+
+    Returns:
+        Command output
+    """
+    options = [option for setting in config for option in ("-c", setting)]
+    try:
+        result = subprocess.run(
+            ["git", "-c", "core.quotepath=off", *options, "-C", repo_dir] + args,
+            capture_output=True,
+            text=True,
+            timeout=timeout
+        )
+    except (OSError, subprocess.TimeoutExpired) as error:
+        raise GitDiscoveryError(f"git {args[0]} failed: {error}") from error
+    if result.returncode != 0:
+        raise GitDiscoveryError(f"git {args[0]} failed: {result.stderr.strip()}")
+    return result.stdout
+
+
+def first_parent(commit_sha: str, repo_dir: str = ".") -> Optional[str]:
+    """
+    Returns the first parent of a commit, or None for a root commit.
+
+    Args:
+        commit_sha: Commit to inspect
+        repo_dir: Working tree or bare repository
+
+    Returns:
+        Parent SHA or None
+    """
+    shas = run_git(["rev-list", "--parents", "-n", "1", commit_sha], repo_dir).split()
+    return shas[1] if len(shas) > 1 else None
+
+
+def _diff_range(commit_sha: str, base_sha: Optional[str]) -> List[str]:
+    """Returns diff-tree revision arguments comparing base (or the empty tree) to commit."""
+    return [base_sha, commit_sha] if base_sha else ["--root", commit_sha]
+
+
+def parse_raw_diff(output: str) -> Tuple[List[Tuple[str, str, Optional[str], Optional[str]]],
+                                         Dict[str, Tuple[Optional[int], Optional[int]]]]:
+    """
+    Parses "git diff-tree --raw --numstat -z" output.
+
+    Args:
+        output: NUL-separated diff-tree output
+
+    Returns:
+        Tuple of (list of (status letter, path, previous path for
+        renames/copies, new blob SHA or None for deletions), mapping of path
+        to (additions, deletions) where None/None marks a binary file)
+    """
+    fields = output.split("\0")
+    changes = []
+    index = 0
+    while index < len(fields) and fields[index].startswith(":"):
+        _, _, _, new_sha, status = fields[index][1:].split()
+        blob_sha = None if new_sha.strip("0") == "" else new_sha
+        if status[0] in "RC":
+            changes.append((status[0], fields[index + 2], fields[index + 1], blob_sha))
+            index += 3
+        else:
+            changes.append((status[0], fields[index + 1], None, blob_sha))
+            index += 2
+
+    line_counts: Dict[str, Tuple[Optional[int], Optional[int]]] = {}
+    while index < len(fields) and fields[index]:
+        additions, deletions, path = fields[index].split("\t", 2)
+        if path:
+            index += 1
+        else:  # renames and copies: empty path, then old and new path fields
+            path = fields[index + 2]
+            index += 3
+        line_counts[path] = (
+            None if additions == "-" else int(additions),
+            None if deletions == "-" else int(deletions),
+        )
+    return changes, line_counts
+
+
+def _unquote_path(text: str) -> str:
+    """Decodes a path git wrapped in double quotes with C-style escapes (newlines, non-ASCII)."""
+    if len(text) < 2 or not (text.startswith('"') and text.endswith('"')):
+        return text
+    return codecs.escape_decode(text[1:-1].encode("utf-8"))[0].decode("utf-8", "surrogateescape")
+
+
+def split_patches(diff_output: str) -> Dict[str, str]:
+    """
+    Splits a multi-file unified diff into GitHub-style per-file patches.
+
+    Only the hunks ("@@ ..." onward) are kept, matching the "patch" field
+    returned by the GitHub API; files without hunks (binary, mode-only,
+    pure renames) are left out.
+
+    Args:
+        diff_output: Output of "git diff-tree -p"
+
+    Returns:
+        Mapping of new path to its hunks
+    """
+    patches: Dict[str, str] = {}
+    path = None
+    old_path = None
+    hunk_lines: List[str] = []
+
+    def flush() -> None:
+        if path is not None and hunk_lines:
+            patches[path] = "\n".join(hunk_lines)
+
+    for line in diff_output.split("\n"):
+        if line.startswith("diff --git "):
+            flush()
+            path, old_path, hunk_lines = None, None, []
+        elif line.startswith("--- ") and not hunk_lines:
+            source = _unquote_path(line[4:].rstrip("\t"))  # git appends a tab to paths with spaces
+            old_path = source[2:] if source.startswith("a/") else None
+        elif line.startswith("+++ ") and not hunk_lines:
+            target = _unquote_path(line[4:].rstrip("\t"))
+            # Deleted files diff against /dev/null; keep them under their old path
+            path = target[2:] if target.startswith("b/") else old_path
+        elif line.startswith("rename to ") and not hunk_lines:
+            path = _unquote_path(line[len("rename to "):])
+        elif line.startswith("@@") or (hunk_lines and line[:1] in (" ", "+", "-", "\\")):
+            hunk_lines.append(line)
+    flush()
+    return patches
+
+
+def git_changed_files(commit_sha: str, repo_dir: str = ".",
+                      base_sha: Optional[str] = None) -> List[ChangedFile]:
+    """
+    Lists the files changed by a commit using the local repository.
+
+    Args:
+        commit_sha: Commit to inspect
+        repo_dir: Working tree or (bare) mirror containing the commit
+        base_sha: Commit to compare against; defaults to the first parent
+
+    Returns:
+        Changed files in diff order
+    """
+    if base_sha is None:
+        base_sha = first_parent(commit_sha, repo_dir)
+    revisions = _diff_range(commit_sha, base_sha)
+    raw_diff = run_git(
+        ["diff-tree", "--no-commit-id", "-r", "-M", "--raw", "--numstat", "--abbrev=40", "-z"] + revisions,
+        repo_dir
+    )
+    patches = split_patches(run_git(
+        ["diff-tree", "--no-commit-id", "-r", "-M", "-p", "--no-color", "--no-ext-diff"] + revisions,
+        repo_dir
+    ))
+    raw_changes, line_counts = parse_raw_diff(raw_diff)
+    changed_files = []
+    for status, path, _, blob_sha in raw_changes:
+        additions, deletions = line_counts.get(path, (0, 0))
+        is_binary = additions is None or is_binary_path(path)
+        changed_files.append(ChangedFile(
+            path, patches.get(path), blob_sha,
+            status=GIT_STATUS_NAMES.get(status, "modified"),
+            additions=additions or 0,
+            deletions=deletions or 0,
+            is_binary=is_binary,
+        ))
+    return changed_files
@@ -0,0 +1,206 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class QueuedJob(NamedTuple):
+    """A job claimed from the queue."""
+
+    id: int
+    spec: Dict[str, Any]
+    # Number of times the job has been started, including this one
+    attempts: int
+
+
+class JobQueue:
+    """
+    Persistent FIFO queue of review jobs in SQLite.
+
+    Jobs survive restarts: a job that was running when the process died is
+    queued again by recover(). Jobs carry a deduplication key, so a webhook
+    that GitHub delivers twice is only reviewed once. Failed jobs are retried
+    until max_attempts is reached.
+    """
+
+    def __init__(self, db_path: str, max_attempts: int = 3):
+        """
+        Args:
+            db_path: SQLite database file, created if missing
+            max_attempts: Starts allowed per job before it is marked failed
+        """
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                dedupe_key TEXT NOT NULL,
+                spec TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                result TEXT,
+                error TEXT,
+                created REAL NOT NULL,
+                updated REAL NOT NULL
+            )"""
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id)")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS jobs_dedupe_key ON jobs (dedupe_key)")
+        self._connection.commit()
+
+    def enqueue(self, spec: Dict[str, Any], dedupe_key: str) -> Tuple[int, bool]:
+        """
+        Adds a job unless an equal one is queued, running or done.
+
+        Args:
+            spec: JSON-serializable job description
+            dedupe_key: Identity of the job, e.g. repository and commit range
+
+        Returns:
+            Tuple of (job id, whether a new job was created)
+        """
+        now = time.time()
+        with self._lock:
+            existing = self._connection.execute(
+                "SELECT id FROM jobs WHERE dedupe_key = ? AND status != ? ORDER BY id DESC LIMIT 1",
+                (dedupe_key, FAILED)
+            ).fetchone()
+            if existing is not None:
+                return existing[0], False
+            cursor = self._connection.execute(
+                "INSERT INTO jobs (dedupe_key, spec, status, created, updated) VALUES (?, ?, ?, ?, ?)",
+                (dedupe_key, json.dumps(spec), QUEUED, now, now)
+            )
+            self._connection.commit()
+            return cursor.lastrowid, True
+
+    def claim(self) -> Optional[QueuedJob]:
+        """
+        Takes the oldest queued job and marks it running.
+
+        Returns:
+            Claimed job, or None if the queue is empty
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT id, spec, attempts FROM jobs WHERE status = ? ORDER BY id LIMIT 1", (QUEUED,)
+            ).fetchone()
+            if row is None:
+                return None
+            job_id, spec, attempts = row
+            self._connection.execute(
+                "UPDATE jobs SET status = ?, attempts = ?, updated = ? WHERE id = ?",
+                (RUNNING, attempts + 1, time.time(), job_id)
+            )
+            self._connection.commit()
+        return QueuedJob(job_id, json.loads(spec), attempts + 1)
+
+    def complete(self, job_id: int, result: Dict[str, Any]) -> None:
+        """
+        Marks a job done.
+
+        Args:
+            job_id: Job id
+            result: JSON-serializable outcome, e.g. the report files
+        """
+        with self._lock:
+            self._connection.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = NULL, updated = ? WHERE id = ?",
+                (DONE, json.dumps(result), time.time(), job_id)
+            )
+            self._connection.commit()
+
+    def fail(self, job_id: int, error: str) -> bool:
+        """
+        Records a failed attempt and queues the job again if attempts are left.
+
+        Args:
+            job_id: Job id
+            error: Failure description
+
+        Returns:
+            True if the job will be retried
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            retry = row is not None and row[0] < self.max_attempts
+            self._connection.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated = ? WHERE id = ?",
+                (QUEUED if retry else FAILED, error, time.time(), job_id)
+            )
+            self._connection.commit()
+        return retry
+
+    def recover(self) -> int:
+        """
+        Queues the jobs left running by a previous process again.
+
+        Returns:
+            Number of recovered jobs
+        """
+        with self._lock:
+            cursor = self._connection.execute(
+                "UPDATE jobs SET status = ?, updated = ? WHERE status = ?", (QUEUED, time.time(), RUNNING)
+            )
+            self._connection.commit()
+        if cursor.rowcount:
+            logger.info(f"Re-queued {cursor.rowcount} interrupted job(s)")
+        return cursor.rowcount
+
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Looks a job up.
+
+        Args:
+            job_id: Job id
+
+        Returns:
+            Job status record, or None if unknown
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT id, spec, status, attempts, result, error, created, updated FROM jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job_id, spec, status, attempts, result, error, created, updated = row
+        return {
+            "id": job_id,
+            "spec": json.loads(spec),
+            "status": status,
+            "attempts": attempts,
+            "result": json.loads(result) if result else None,
+            "error": error,
+            "created": created,
+            "updated": updated,
+        }
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Counts the jobs per status.
+
+        Returns:
+            Mapping of status to number of jobs
+        """
+        with self._lock:
+            rows = self._connection.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = {status: 0 for status in (QUEUED, RUNNING, DONE, FAILED)}
+        counts.update(dict(rows))
+        return counts
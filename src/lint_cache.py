@@ -0,0 +1,222 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import subprocess
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# node_modules of the reviewer's own install, which the Node lint worker loads from
+NODE_MODULES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "node_modules")
+
+
+def tool_version(package: str) -> str:
+    """
+    Returns the installed version of a linter without launching it.
+
+    Node packages are read from the reviewer's node_modules/<package>/package.json
+    on every call, so an upgrade is noticed by a running service; anything else
+    is looked up as a Python distribution, then via "<package> --version".
+    The result includes where the linter was found.
+
+    Args:
+        package: npm package or Python distribution name
+
+    Returns:
+        Version string with the resolved location, or "unknown"
+    """
+    manifest = os.path.join(NODE_MODULES_DIR, package, "package.json")
+    try:
+        with open(manifest, "r", encoding="utf-8") as manifest_file:
+            return f"{json.load(manifest_file).get('version', 'unknown')} ({manifest})"
+    except (OSError, ValueError, AttributeError):
+        pass
+    return _installed_version(package)
+
+
+@lru_cache(maxsize=None)
+def _installed_version(package: str) -> str:
+    """Looks a linter up as a Python distribution, then via "<package> --version"."""
+    try:
+        from importlib.metadata import PackageNotFoundError, distribution
+        try:
+            installed = distribution(package)
+            return f"{installed.version} ({installed.locate_file('')})"
+        except PackageNotFoundError:
+            pass
+    except ImportError:
+        pass
+    try:
+        result = subprocess.run([package, "--version"], capture_output=True, text=True, timeout=10)
+        return f"{result.stdout.strip() or 'unknown'} ({shutil.which(package)})"
+    except Exception:
+        return "unknown"
+
+
+def config_fingerprint(config_files: Iterable[str], extra: str = "") -> str:
+    """
+    Hashes the linter config files that exist, plus any extra settings.
+
+    Args:
+        config_files: Config file paths; missing files are hashed as absent
+        extra: Additional settings such as command-line flags
+
+    Returns:
+        Hex digest of the configuration
+    """
+    digest = hashlib.sha256(extra.encode("utf-8"))
+    for config_file in config_files:
+        digest.update(config_file.encode("utf-8") + b"\0")
+        try:
+            with open(config_file, "rb") as config:
+                digest.update(config.read())
+        except OSError:
+            digest.update(b"<absent>")
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class LintCache:
+    """
+    Content-addressed on-disk cache of linter results with LRU eviction.
+
+    Each entry is a small file named after the hash of (file path, content
+    hash, linter name, linter version, config fingerprint). Reads bump the
+    file's mtime, which doubles as the LRU timestamp, so the directory can be
+    saved and restored between CI runs as-is.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 100 * 1024 * 1024):
+        """
+        Args:
+            directory: Cache directory, created if missing
+            max_bytes: Size limit; least recently used entries are evicted past it
+        """
+        # Absolute, so a long-running process keeps one cache across working directories
+        self.directory = os.path.abspath(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Tuple[float, int]]] = None
+        self._total_bytes = 0
+
+    @staticmethod
+    def make_key(file_path: str, content: bytes, linter: str, version: str, config_hash: str) -> str:
+        """
+        Builds the cache key for one file's linter result.
+
+        Args:
+            file_path: Path of the linted file (findings refer to it)
+            content: Raw file content
+            linter: Linter name
+            version: Linter version
+            config_hash: Fingerprint from config_fingerprint()
+
+        Returns:
+            Hex digest key
+        """
+        content_hash = hashlib.sha256(content).hexdigest()
+        parts = [file_path, content_hash, linter, version, config_hash]
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        """Returns the entry path for a key, fanned out over 256 subdirectories."""
+        return os.path.join(self.directory, key[:2], key)
+
+    def _load_index(self) -> None:
+        """Scans the cache directory once to learn entry sizes and ages."""
+        if self._entries is not None:
+            return
+        self._entries = {}
+        self._total_bytes = 0
+        if not os.path.isdir(self.directory):
+            return
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                entry_path = os.path.join(root, name)
+                try:
+                    stat = os.stat(entry_path)
+                except OSError:
+                    continue
+                self._entries[entry_path] = (stat.st_mtime, stat.st_size)
+                self._total_bytes += stat.st_size
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Looks up a cached linter result.
+
+        Args:
+            key: Key from make_key()
+
+        Returns:
+            Cached result, or None on a miss
+        """
+        entry_path = self._path(key)
+        try:
+            with open(entry_path, "r", encoding="utf-8") as entry:
+                result = entry.read()
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+            try:
+                os.utime(entry_path)
+                if self._entries is not None and entry_path in self._entries:
+                    self._entries[entry_path] = (os.path.getmtime(entry_path), self._entries[entry_path][1])
+            except OSError:
+                pass
+        return result
+
+    def reset_counters(self) -> None:
+        """Starts a new run's hit and miss counts (the entries are kept)."""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def put(self, key: str, result: str) -> None:
+        """
+        Stores a linter result and evicts old entries past the size limit.
+
+        Args:
+            key: Key from make_key()
+            result: Linter result text
+        """
+        entry_path = self._path(key)
+        data = result.encode("utf-8")
+        with self._lock:
+            self._load_index()
+            try:
+                os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+                temp_path = f"{entry_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(temp_path, "wb") as entry:
+                    entry.write(data)
+                os.replace(temp_path, entry_path)
+            except OSError as error:
+                logger.warning(f"Could not write lint cache entry: {error}")
+                return
+            _, old_size = self._entries.get(entry_path, (0.0, 0))
+            self._entries[entry_path] = (os.path.getmtime(entry_path), len(data))
+            self._total_bytes += len(data) - old_size
+            self._evict()
+
+    def _evict(self) -> None:
+        """Deletes least recently used entries until the cache fits max_bytes."""
+        if self._total_bytes <= self.max_bytes:
+            return
+        for entry_path, (_, size) in sorted(self._entries.items(), key=lambda item: item[1][0]):
+            if self._total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(entry_path)
+            except OSError:
+                pass
+            del self._entries[entry_path]
+            self._total_bytes -= size
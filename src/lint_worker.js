@@ -0,0 +1,135 @@
+/**
+ * Long-lived lint worker for ESLint, Stylelint and html-validate.
+ *
+ * Loads each linter module once and then answers lint requests read from
+ * stdin, one JSON object per line:
+ *
+ *   {"id": 1, "tool": "eslint", "files": ["src/app.js"], "cwd": "/repo"}
+ *
+ * Each request gets exactly one JSON line back on stdout:
+ *
+ *   {"id": 1, "results": [{"filePath": "/abs/src/app.js", "messages": [...]}]}
+ *   {"id": 1, "error": "message"}
+ *
+ * "results" is the document the tool's JSON formatter would print, so the
+ * Python side parses worker and CLI output with the same code. Files and
+ * configs are resolved from "cwd" (default: the worker's own directory), so
+ * one worker can serve several repositories. Configs are resolved again for
+ * every request: the linters cache them per instance, and a repository may
+ * change its configs between requests.
+ */
+const path = require("path");
+const readline = require("readline");
+
+const linters = {};
+
+/**
+ * Creates an ESLint instance for one request.
+ * @param {string} cwd Directory configs and relative paths are resolved from
+ * @returns {import("eslint").ESLint} ESLint instance with freshly loaded configs
+ */
+function createEslint(cwd) {
+  const { ESLint } = require("eslint");
+  return new ESLint({ cwd, errorOnUnmatchedPattern: false });
+}
+
+/**
+ * Returns the Stylelint module, importing it on first use.
+ * @returns {Promise<object>} Stylelint API
+ */
+async function getStylelint() {
+  if (!linters.stylelint) {
+    const module = await import("stylelint");
+    linters.stylelint = module.default || module;
+  }
+  return linters.stylelint;
+}
+
+/**
+ * Returns the html-validate instance with its config caches emptied.
+ * @returns {object} Shared HtmlValidate instance
+ */
+function getHtmlValidate() {
+  if (!linters.htmlValidate) {
+    const { HtmlValidate, FileSystemConfigLoader } = require("html-validate");
+    linters.htmlValidateLoader = new FileSystemConfigLoader();
+    linters.htmlValidate = new HtmlValidate(linters.htmlValidateLoader);
+  }
+  linters.htmlValidateLoader.flushCache();
+  linters.htmlValidate.flushConfigCache();
+  return linters.htmlValidate;
+}
+
+/**
+ * Lints JS/TS files with ESLint (shape of "--format json").
+ * @param {string[]} files Files to lint
+ * @param {string} cwd Directory the files are relative to
+ * @returns {Promise<object[]>} Per-file results with their messages
+ */
+async function lintEslint(files, cwd) {
+  const results = await createEslint(cwd).lintFiles(files);
+  return results.map((result) => ({ filePath: result.filePath, messages: result.messages }));
+}
+
+/**
+ * Lints CSS/SCSS files with Stylelint (shape of "--formatter json").
+ * @param {string[]} files Files to lint
+ * @param {string} cwd Directory the files are relative to
+ * @returns {Promise<object[]>} Per-file results with their warnings
+ */
+async function lintStylelint(files, cwd) {
+  const stylelint = await getStylelint();
+  const { results } = await stylelint.lint({ files, cwd, allowEmptyInput: true });
+  return results.map((result) => ({ source: result.source, warnings: result.warnings }));
+}
+
+/**
+ * Validates HTML files with html-validate (shape of "--formatter json").
+ * @param {string[]} files Files to validate
+ * @param {string} cwd Directory the files are relative to
+ * @returns {Promise<object[]>} Per-file results with their messages
+ */
+async function lintHtmlValidate(files, cwd) {
+  const htmlvalidate = getHtmlValidate();
+  const results = [];
+  for (const file of files) {
+    const report = await htmlvalidate.validateFile(path.resolve(cwd, file));
+    results.push(...report.results.map((result) => ({ filePath: result.filePath, messages: result.messages })));
+  }
+  return results;
+}
+
+const handlers = {
+  "eslint": lintEslint,
+  "stylelint": lintStylelint,
+  "html-validate": lintHtmlValidate,
+};
+
+/**
+ * Handles one request line and writes exactly one response line.
+ * @param {string} line Raw JSON request
+ * @returns {Promise<void>}
+ */
+async function handleLine(line) {
+  if (!line.trim()) {
+    return;
+  }
+  let request = {};
+  try {
+    request = JSON.parse(line);
+    const handler = handlers[request.tool];
+    if (!handler) {
+      throw new Error(`Unknown tool: ${request.tool}`);
+    }
+    const results = await handler(request.files || [], request.cwd || process.cwd());
+    process.stdout.write(JSON.stringify({ id: request.id, results }) + "\n");
+  } catch (error) {
+    process.stdout.write(JSON.stringify({ id: request.id, error: String(error && error.message || error) }) + "\n");
+  }
+}
+
+// Requests are processed strictly in order so responses never interleave.
+let queue = Promise.resolve();
+readline.createInterface({ input: process.stdin }).on("line", (line) => {
+  queue = queue.then(() => handleLine(line));
+});
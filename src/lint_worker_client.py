@@ -0,0 +1,139 @@
+import json
+import logging
+import os
+import queue
+import subprocess
+import threading
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lint_worker.js")
+
+
+class LintWorkerError(Exception):
+    """Raised when the Node lint worker cannot serve a request."""
+
+
+class NodeLintWorker:
+    """
+    Client for the long-lived Node lint worker (lint_worker.js).
+
+    The worker loads ESLint, Stylelint and html-validate once; requests and
+    responses are exchanged as JSON lines over its stdin/stdout. The process is
+    started lazily and restarted after a crash or timeout.
+    """
+
+    def __init__(self, node_binary: str = "node", script_path: str = WORKER_SCRIPT):
+        """
+        Args:
+            node_binary: Node.js executable to launch
+            script_path: Path to the worker script
+        """
+        self.node_binary = node_binary
+        self.script_path = script_path
+        self._process: Optional[subprocess.Popen] = None
+        self._responses: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+    def _start(self) -> None:
+        """Starts the worker process and its stdout reader thread."""
+        logger.info("Starting Node lint worker")
+        try:
+            self._process = subprocess.Popen(
+                [self.node_binary, self.script_path],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                bufsize=1
+            )
+        except OSError as error:
+            raise LintWorkerError(f"Could not start Node lint worker: {error}") from error
+        self._responses = queue.Queue()
+        threading.Thread(
+            target=self._read_responses,
+            args=(self._process, self._responses),
+            daemon=True
+        ).start()
+
+    @staticmethod
+    def _read_responses(process: subprocess.Popen, responses: "queue.Queue[Optional[str]]") -> None:
+        """Forwards worker stdout lines to the response queue; None marks EOF."""
+        for line in process.stdout:
+            responses.put(line)
+        responses.put(None)
+
+    def lint(self, tool: str, file_paths: List[str], timeout: float = 60,
+             cwd: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Lints a group of files with one of the worker's tools.
+
+        Args:
+            tool: "eslint", "stylelint" or "html-validate"
+            file_paths: Files to lint
+            timeout: Seconds to wait for the response
+            cwd: Directory relative paths and linter configs are resolved
+                from, defaults to the current directory
+
+        Returns:
+            The document the tool's JSON formatter would print: a list of
+            per-file results
+        """
+        with self._lock:
+            if self._process is None or self._process.poll() is not None:
+                self._start()
+            self._next_id += 1
+            request_id = self._next_id
+            try:
+                self._process.stdin.write(
+                    json.dumps({"id": request_id, "tool": tool, "files": file_paths,
+                                "cwd": cwd or os.getcwd()}) + "\n"
+                )
+                self._process.stdin.flush()
+            except OSError as error:
+                self._stop()
+                raise LintWorkerError(f"Node lint worker is not accepting requests: {error}") from error
+
+            while True:
+                try:
+                    line = self._responses.get(timeout=timeout)
+                except queue.Empty:
+                    self._stop()
+                    raise LintWorkerError(f"Node lint worker timed out running {tool}")
+                if line is None:
+                    self._stop()
+                    raise LintWorkerError("Node lint worker exited unexpectedly")
+                try:
+                    response = json.loads(line)
+                except ValueError:
+                    continue  # stray output from a linter plugin
+                if response.get("id") == request_id:
+                    break
+
+        if "error" in response:
+            raise LintWorkerError(f"{tool} failed in Node lint worker: {response['error']}")
+        return response.get("results", [])
+
+    def _stop(self) -> None:
+        """Kills the worker process; the next request starts a fresh one."""
+        if self._process is not None:
+            try:
+                self._process.kill()
+                self._process.wait(timeout=5)
+            except Exception:
+                pass
+            self._process = None
+
+    def close(self) -> None:
+        """Shuts the worker down by closing its stdin."""
+        with self._lock:
+            if self._process is None:
+                return
+            try:
+                self._process.stdin.close()
+                self._process.wait(timeout=5)
+            except Exception:
+                self._stop()
+            self._process = None
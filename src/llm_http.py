@@ -0,0 +1,65 @@
+import hashlib
+import time
+from typing import Optional
+
+import httpx
+
+from cassette import Cassette
+
+# Headers describing the wire encoding; recorded bodies are stored decoded
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "set-cookie"}
+
+
+class SharedHTTPClient(httpx.Client):
+    """HTTP client that survives the deepcopy AutoGen makes of every llm_config."""
+
+    def __deepcopy__(self, memo):
+        # Copies would lose the connection pool; the event hooks are thread-safe
+        return self
+
+
+class CassetteTransport(httpx.BaseTransport):
+    """
+    httpx transport that records LLM API traffic to a cassette or replays it.
+
+    Requests are keyed by method, URL path and body, so a replay matches
+    regardless of the base URL host or the API key used. Replayed responses
+    pass through the client's event hooks like live ones, which keeps the
+    rate limiter fed with the recorded rate-limit headers.
+    """
+
+    def __init__(self, cassette: Cassette, transport: Optional[httpx.BaseTransport] = None):
+        """
+        Args:
+            cassette: Cassette to record to or replay from
+            transport: Transport for live requests when recording
+        """
+        self.cassette = cassette
+        self._transport = transport or httpx.HTTPTransport()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        key = Cassette.make_key("llm", request.method, request.url.path, hashlib.sha256(request.read()).hexdigest())
+        if self.cassette.replaying:
+            recorded = self.cassette.replay("llm", key)
+            return httpx.Response(
+                recorded["status"], headers=recorded["headers"],
+                content=recorded["body"].encode("utf-8"), request=request
+            )
+        start = time.perf_counter()
+        response = self._transport.handle_request(request)
+        try:
+            body = response.read()
+        finally:
+            response.close()
+        latency = time.perf_counter() - start
+        headers = [(name, value) for name, value in response.headers.items() if name.lower() not in _DROPPED_HEADERS]
+        if self.cassette.recording:
+            self.cassette.record("llm", key, {
+                "status": response.status_code,
+                "headers": headers,
+                "body": body.decode("utf-8", "replace"),
+            }, latency)
+        return httpx.Response(response.status_code, headers=headers, content=body, request=request)
+
+    def close(self) -> None:
+        self._transport.close()
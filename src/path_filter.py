@@ -0,0 +1,152 @@
+import re
+from typing import Iterable, List, Optional, Pattern, Sequence, Tuple
+
+
+def glob_to_regex(pattern: str) -> Optional[str]:
+    """
+    Translates one gitignore-style glob into a regular expression.
+
+    Patterns without an inner slash match at any depth, others are anchored
+    at the repository root; a trailing slash matches directories only, "**"
+    spans directories and "[...]" classes are supported.
+
+    Args:
+        pattern: Glob without the "!" negation prefix
+
+    Returns:
+        Regex matching repository-relative file paths, or None for an empty pattern
+    """
+    directory_only = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+    if not pattern:
+        return None
+    regex = ""
+    index = 0
+    while index < len(pattern):
+        if pattern.startswith("**/", index):
+            regex += "(?:.*/)?"
+            index += 3
+        elif pattern.startswith("**", index):
+            regex += ".*"
+            index += 2
+        elif pattern[index] == "*":
+            regex += "[^/]*"
+            index += 1
+        elif pattern[index] == "?":
+            regex += "[^/]"
+            index += 1
+        elif pattern[index] == "[" and "]" in pattern[index + 2:]:
+            end = pattern.index("]", index + 2)
+            members = pattern[index + 1:end]
+            if members[0] == "!":
+                members = "^" + members[1:]
+            regex += "[" + members.replace("\\", "\\\\") + "]"
+            index = end + 1
+        elif pattern[index] == "\\" and index + 1 < len(pattern):
+            regex += re.escape(pattern[index + 1])
+            index += 2
+        else:
+            regex += re.escape(pattern[index])
+            index += 1
+    prefix = "" if anchored else "(?:.*/)?"
+    # A directory matches everything below it; a file pattern may also name a directory
+    suffix = "/.*" if directory_only else "(?:/.*)?"
+    return f"{prefix}{regex}{suffix}"
+
+
+def compile_glob(pattern: str) -> Pattern:
+    """
+    Compiles one gitignore-style glob.
+
+    Args:
+        pattern: Glob without the "!" negation prefix
+
+    Returns:
+        Compiled pattern; use fullmatch() on repository-relative paths
+    """
+    return re.compile(glob_to_regex(pattern) or "(?!)")
+
+
+def parse_ignore_file(text: str) -> List[str]:
+    """
+    Reads the patterns of a gitignore-style file.
+
+    Args:
+        text: File content
+
+    Returns:
+        Patterns in file order, "!" negations included; comments and blank lines dropped
+    """
+    patterns = []
+    for line in text.splitlines():
+        line = line.rstrip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("\\#") or line.startswith("\\!"):
+            line = line[1:]
+        patterns.append(line)
+    return patterns
+
+
+class PathFilter:
+    """
+    Decides which changed paths are reviewed, using gitignore-style rules.
+
+    Exclude rules follow gitignore semantics: the last matching rule wins and
+    "!pattern" re-includes. Include rules, when given, restrict review to
+    paths matching at least one of them. All rules are compiled once into a
+    single alternation, so the common case of a path matching no rule costs
+    one regex scan however many rules are configured.
+    """
+
+    def __init__(self, exclude: Sequence[str] = (), include: Sequence[str] = ()):
+        """
+        Args:
+            exclude: Exclude rules in priority order (later rules win)
+            include: Include rules; empty means every path not excluded
+        """
+        self._rules: List[Tuple[Pattern, bool]] = []
+        alternatives = []
+        for rule in exclude:
+            negated = rule.startswith("!")
+            regex = glob_to_regex(rule[1:] if negated else rule)
+            if regex is None:
+                continue
+            self._rules.append((re.compile(regex), not negated))
+            alternatives.append(regex)
+        self._any_exclude = re.compile("|".join(f"(?:{regex})" for regex in alternatives) or "(?!)")
+        include_regexes = [regex for regex in map(glob_to_regex, include) if regex is not None]
+        self._include = re.compile("|".join(f"(?:{regex})" for regex in include_regexes)) if include_regexes else None
+
+    def is_excluded(self, file_path: str) -> bool:
+        """
+        Checks whether a path is left out of the review.
+
+        Args:
+            file_path: Repository-relative path
+
+        Returns:
+            True if the file must be skipped
+        """
+        if self._include is not None and not self._include.fullmatch(file_path):
+            return True
+        if not self._any_exclude.fullmatch(file_path):
+            return False
+        for pattern, excludes in reversed(self._rules):
+            if pattern.fullmatch(file_path):
+                return excludes
+        return False
+
+    def filter(self, file_paths: Iterable[str]) -> List[str]:
+        """
+        Keeps the paths that are reviewed.
+
+        Args:
+            file_paths: Repository-relative paths
+
+        Returns:
+            Paths that are not excluded, in input order
+        """
+        return [file_path for file_path in file_paths if not self.is_excluded(file_path)]
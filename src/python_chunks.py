@@ -0,0 +1,116 @@
+import ast
+from typing import Callable, List, NamedTuple, Sequence
+
+
+class SourceChunk(NamedTuple):
+    """A contiguous slice of a source file, aligned to statement boundaries."""
+
+    start_line: int
+    end_line: int
+    names: List[str]
+    text: str
+
+
+def _node_name(node: ast.stmt) -> str:
+    """Returns a short label for a top-level statement."""
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+        return f"{node.name}()"
+    if isinstance(node, ast.ClassDef):
+        return f"class {node.name}"
+    return ""
+
+
+def _node_start(node: ast.stmt) -> int:
+    """Returns the first line of a statement, including its decorators."""
+    decorators = getattr(node, "decorator_list", [])
+    return min([node.lineno] + [decorator.lineno for decorator in decorators])
+
+
+def _split_lines(lines: Sequence[str], start: int, end: int, max_tokens: int,
+                 count_tokens: Callable[[str], int]) -> List[SourceChunk]:
+    """Splits lines start..end (1-based, inclusive) into chunks by line count alone."""
+    chunks = []
+    current: List[str] = []
+    chunk_start = start
+    for line_number in range(start, end + 1):
+        line = lines[line_number - 1]
+        if current and count_tokens("".join(current) + line) > max_tokens:
+            chunks.append(SourceChunk(chunk_start, line_number - 1, [], "".join(current)))
+            current, chunk_start = [], line_number
+        current.append(line)
+    if current:
+        chunks.append(SourceChunk(chunk_start, end, [], "".join(current)))
+    return chunks
+
+
+def _split_body(body: Sequence[ast.stmt], lines: Sequence[str], start: int, end: int,
+                max_tokens: int, count_tokens: Callable[[str], int], prefix: str = "") -> List[SourceChunk]:
+    """
+    Groups consecutive statements into chunks that fit the token budget.
+
+    Statements too large on their own are split at their nested function and
+    class boundaries, or by lines as a last resort.
+    """
+    # Each statement owns the lines up to the next statement, so comments and
+    # blank lines between definitions stay with the code that follows them.
+    spans = []
+    for index, node in enumerate(body):
+        node_start = start if index == 0 else _node_start(node)
+        node_end = _node_start(body[index + 1]) - 1 if index + 1 < len(body) else end
+        spans.append((node, node_start, node_end))
+
+    chunks: List[SourceChunk] = []
+    group: List[tuple] = []
+
+    def flush() -> None:
+        if group:
+            group_start, group_end = group[0][1], group[-1][2]
+            names = [f"{prefix}{_node_name(node)}" for node, _, _ in group if _node_name(node)]
+            text = "".join(lines[group_start - 1:group_end])
+            chunks.append(SourceChunk(group_start, group_end, names, text))
+            group.clear()
+
+    for node, node_start, node_end in spans:
+        node_text = "".join(lines[node_start - 1:node_end])
+        if count_tokens(node_text) > max_tokens:
+            flush()
+            nested = getattr(node, "body", None)
+            if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)) and nested:
+                # Keep the signature/decorators with the first nested chunk
+                nested_prefix = f"{prefix}{node.name}."
+                chunks.extend(_split_body(nested, lines, node_start, node_end,
+                                          max_tokens, count_tokens, nested_prefix))
+            else:
+                chunks.extend(_split_lines(lines, node_start, node_end, max_tokens, count_tokens))
+            continue
+        group_text = "".join(lines[group[0][1] - 1:node_end]) if group else node_text
+        if group and count_tokens(group_text) > max_tokens:
+            flush()
+        group.append((node, node_start, node_end))
+    flush()
+    return chunks
+
+
+def split_python_source(source: str, max_tokens: int, count_tokens: Callable[[str], int]) -> List[SourceChunk]:
+    """
+    Splits Python source into chunks at function and class boundaries.
+
+    Args:
+        source: Python source code
+        max_tokens: Token budget per chunk
+        count_tokens: Function estimating the tokens of a text
+
+    Returns:
+        Chunks covering the whole file in order; a file that does not parse
+        is split by lines
+    """
+    lines = source.splitlines(keepends=True)
+    if not lines:
+        return []
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return _split_lines(lines, 1, len(lines), max_tokens, count_tokens)
+    if not tree.body:
+        return _split_lines(lines, 1, len(lines), max_tokens, count_tokens)
+    return _split_body(tree.body, lines, 1, len(lines), max_tokens, count_tokens)
@@ -0,0 +1,226 @@
+import logging
+import re
+import threading
+import time
+from typing import Dict, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+
+def parse_reset_seconds(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """
+    Parses a rate-limit reset header into seconds from now.
+
+    Understands OpenAI-style durations ("1s", "6m0s", "20ms"), plain seconds
+    ("12", "0.5") and OpenRouter-style epoch timestamps in milliseconds.
+
+    Args:
+        value: Raw header value
+        now: Current wall-clock time, defaults to time.time()
+
+    Returns:
+        Seconds until the limit resets, or None if the value is not understood
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        number = float(value)
+    except ValueError:
+        parts = _DURATION_PART.findall(value)
+        if not parts:
+            return None
+        return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+    if number > 1e12:  # epoch milliseconds
+        return max(0.0, number / 1000 - (now if now is not None else time.time()))
+    return max(0.0, number)
+
+
+def _parse_count(value: Optional[str]) -> Optional[float]:
+    """Parses a numeric rate-limit header, None if absent or malformed."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+class RateLimiter:
+    """
+    Token-bucket limiter for requests and tokens per minute of one model.
+
+    Both buckets start full and refill continuously. Callers reserve an
+    estimate before each LLM call and settle the difference once the real
+    usage is known. Provider rate-limit headers, when present, can only make
+    the limiter more conservative: they clamp the buckets to the remaining
+    quota and block until the reported reset time. A quota left at 0 is not
+    enforced until the provider reports its limit in x-ratelimit-limit-*
+    headers; an explicitly configured quota is never raised by them.
+    """
+
+    def __init__(self, requests_per_minute: int = 0, tokens_per_minute: int = 0):
+        """
+        Args:
+            requests_per_minute: Request quota, 0 for unlimited
+            tokens_per_minute: Prompt + completion token quota, 0 for unlimited
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._configured_requests = requests_per_minute
+        self._configured_tokens = tokens_per_minute
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._blocked_until = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        """Adds the quota accrued since the last update to both buckets."""
+        elapsed = now - self._updated
+        self._updated = now
+        if self.requests_per_minute:
+            self._requests = min(
+                float(self.requests_per_minute),
+                self._requests + elapsed * self.requests_per_minute / 60
+            )
+        if self.tokens_per_minute:
+            self._tokens = min(
+                float(self.tokens_per_minute),
+                self._tokens + elapsed * self.tokens_per_minute / 60
+            )
+
+    def _wait_time(self, now: float, tokens: int, requests: int) -> float:
+        """Returns how long to wait before the reservation fits, 0 if it fits now."""
+        wait = max(0.0, self._blocked_until - now)
+        if self.requests_per_minute:
+            needed = min(requests, self.requests_per_minute)
+            if self._requests < needed:
+                wait = max(wait, (needed - self._requests) * 60 / self.requests_per_minute)
+        if self.tokens_per_minute:
+            needed = min(tokens, self.tokens_per_minute)
+            if self._tokens < needed:
+                wait = max(wait, (needed - self._tokens) * 60 / self.tokens_per_minute)
+        return wait
+
+    def acquire(self, tokens: int = 0, requests: int = 1) -> float:
+        """
+        Blocks until the quota allows the call, then reserves it.
+
+        Args:
+            tokens: Estimated prompt + completion tokens of the call
+            requests: Number of API requests the call will make
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._wait_time(now, tokens, requests)
+                if wait <= 0:
+                    if self.requests_per_minute:
+                        self._requests -= requests
+                    if self.tokens_per_minute:
+                        self._tokens -= tokens
+                    if waited:
+                        logger.info(f"Rate limiter delayed LLM call by {waited:.1f}s")
+                    return waited
+            time.sleep(wait)
+            waited += wait
+
+    def record_usage(self, reserved_tokens: int, actual_tokens: int) -> None:
+        """
+        Settles a reservation against the tokens the call really used.
+
+        Args:
+            reserved_tokens: Estimate passed to acquire()
+            actual_tokens: Prompt + completion tokens reported by the provider
+        """
+        if not self.tokens_per_minute:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= actual_tokens - reserved_tokens
+
+    def observe_headers(self, headers: Mapping[str, str], status_code: int = 200) -> None:
+        """
+        Tightens the buckets from provider rate-limit response headers.
+
+        Args:
+            headers: Response headers (case-insensitive mapping)
+            status_code: HTTP status of the response
+        """
+        lowered = {key.lower(): value for key, value in headers.items()}
+        limit_requests = _parse_count(lowered.get("x-ratelimit-limit-requests", lowered.get("x-ratelimit-limit")))
+        limit_tokens = _parse_count(lowered.get("x-ratelimit-limit-tokens"))
+        remaining_requests = lowered.get("x-ratelimit-remaining-requests", lowered.get("x-ratelimit-remaining"))
+        remaining_tokens = lowered.get("x-ratelimit-remaining-tokens")
+        reset_requests = parse_reset_seconds(
+            lowered.get("x-ratelimit-reset-requests", lowered.get("x-ratelimit-reset"))
+        )
+        reset_tokens = parse_reset_seconds(lowered.get("x-ratelimit-reset-tokens"))
+        retry_after = parse_reset_seconds(lowered.get("retry-after"))
+
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if limit_requests and not self._configured_requests and limit_requests != self.requests_per_minute:
+                self.requests_per_minute = int(limit_requests)
+                self._requests = float(self.requests_per_minute)
+                logger.info(f"Provider request quota is {self.requests_per_minute}/min")
+            if limit_tokens and not self._configured_tokens and limit_tokens != self.tokens_per_minute:
+                self.tokens_per_minute = int(limit_tokens)
+                self._tokens = float(self.tokens_per_minute)
+                logger.info(f"Provider token quota is {self.tokens_per_minute}/min")
+            remaining = _parse_count(remaining_requests)
+            if remaining is not None:
+                if self.requests_per_minute:
+                    self._requests = min(self._requests, remaining)
+                if remaining <= 0 and reset_requests is not None:
+                    self._blocked_until = max(self._blocked_until, now + reset_requests)
+            remaining = _parse_count(remaining_tokens)
+            if remaining is not None:
+                if self.tokens_per_minute:
+                    self._tokens = min(self._tokens, remaining)
+                if remaining <= 0 and reset_tokens is not None:
+                    self._blocked_until = max(self._blocked_until, now + reset_tokens)
+            if status_code == 429:
+                backoff = retry_after if retry_after is not None else (reset_requests or 1.0)
+                self._blocked_until = max(self._blocked_until, now + backoff)
+                logger.warning(f"Provider returned 429; pausing LLM calls for {backoff:.1f}s")
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(config_entry: Mapping) -> RateLimiter:
+    """
+    Returns the process-wide limiter for a config_list entry's model.
+
+    The first call for a model creates the limiter from the entry's
+    "rate_limit" settings; later calls share it.
+
+    Args:
+        config_entry: One entry of the AutoGen config_list
+
+    Returns:
+        Shared RateLimiter for the entry's model
+    """
+    model = config_entry.get("model", "")
+    with _limiters_lock:
+        limiter = _limiters.get(model)
+        if limiter is None:
+            settings = config_entry.get("rate_limit") or {}
+            limiter = RateLimiter(
+                requests_per_minute=int(settings.get("requests_per_minute", 0)),
+                tokens_per_minute=int(settings.get("tokens_per_minute", 0)),
+            )
+            _limiters[model] = limiter
+        return limiter
@@ -0,0 +1,340 @@
+import json
+import logging
+from typing import IO, Dict, List, NamedTuple, Optional, Sequence
+from urllib.parse import quote
+
+from findings import Finding
+
+logger = logging.getLogger(__name__)
+
+
+class ReviewResult(NamedTuple):
+    """Outcome of the LLM review of one file."""
+
+    # Review text, None if the review failed
+    text: Optional[str]
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    # Served from the review cache without an LLM call
+    cached: bool = False
+    # Number of files sharing the request (and its token usage)
+    shared_by: int = 1
+
+
+class FileReport(NamedTuple):
+    """Everything the report says about one changed file."""
+
+    path: str
+    language: str
+    # Reason the file was not analyzed; the other fields are unset then
+    skip_note: Optional[str] = None
+    # Linter output text, None if the linter check failed
+    linter: Optional[str] = None
+    # Parsed findings behind the linter text, when a registered linter produced it
+    findings: Optional[List[Finding]] = None
+    # Display name of the linter that produced the findings
+    lint_tool: Optional[str] = None
+    review: Optional[ReviewResult] = None
+    # Shown instead of a review when the file was not sent to the LLM on purpose
+    review_note: Optional[str] = None
+
+
+def token_note(review: ReviewResult) -> str:
+    """
+    Describes the token usage of a review.
+
+    Args:
+        review: Review outcome
+
+    Returns:
+        One-line usage note
+    """
+    if review.cached:
+        return "Tokens: 0 (served from review cache)"
+    note = f"Tokens: {review.prompt_tokens} prompt / {review.completion_tokens} completion"
+    if review.shared_by > 1:
+        note += f" (shared by {review.shared_by} files)"
+    return note
+
+
+def render_text(record: FileReport) -> str:
+    """
+    Renders one file section as plain text.
+
+    Args:
+        record: File record
+
+    Returns:
+        Section text
+    """
+    parts = [f"--- Report for {record.path} ---\n\n"]
+    if record.skip_note is not None:
+        parts.append(f"{record.skip_note}\n\n")
+        return "".join(parts)
+    if record.linter is None:
+        parts.append("**Linter Check:** Error occurred\n\n")
+    else:
+        parts.append(f"**Linter Check ({record.language}):**\n{record.linter}\n\n")
+    if record.review is not None:
+        if record.review.text is None:
+            parts.append("**Review:** Error occurred\n\n")
+        else:
+            parts.append(f"**Review:**\n{record.review.text}\n\n{token_note(record.review)}\n\n")
+    elif record.review_note is not None:
+        parts.append(f"**Review:** {record.review_note}\n\n")
+    parts.append(f"--- End of Report for {record.path} ---\n\n")
+    return "".join(parts)
+
+
+class ReportRenderer:
+    """Receives the report piece by piece; subclasses write one output format."""
+
+    def begin(self, title: str, triggered_by: str) -> None:
+        """Starts the report."""
+
+    def add(self, record: FileReport) -> None:
+        """Writes one file section."""
+
+    def finish(self, summary: Sequence[str]) -> None:
+        """Writes the run summary and closes the output."""
+
+
+class PdfRenderer(ReportRenderer):
+    """Writes the plain-text report into a PDF, one section at a time."""
+
+    def __init__(self, filename: str):
+        """
+        Args:
+            filename: Output PDF filename
+        """
+        # fpdf is slow to import and only needed when a PDF is written
+        from fpdf import FPDF
+
+        self.filename = filename
+        self._pdf = FPDF()
+
+    def _write(self, text: str) -> None:
+        # The core fonts only cover latin-1
+        self._pdf.multi_cell(0, 5, text.encode("latin-1", "replace").decode("latin-1"))
+
+    def begin(self, title: str, triggered_by: str) -> None:
+        self._pdf.add_page()
+        self._pdf.set_font("Arial", size=10)
+        self._write(f"{title}\nTriggered by: {triggered_by}\n\n")
+
+    def add(self, record: FileReport) -> None:
+        self._write(render_text(record))
+
+    def finish(self, summary: Sequence[str]) -> None:
+        if summary:
+            self._write("--- Run Summary ---\n\n" + "".join(f"{line}\n\n" for line in summary))
+        self._pdf.output(self.filename)
+
+
+class MarkdownRenderer(ReportRenderer):
+    """Streams the report to a Markdown file."""
+
+    def __init__(self, filename: str):
+        """
+        Args:
+            filename: Output Markdown filename
+        """
+        self.filename = filename
+        self._file: IO[str] = open(filename, "w", encoding="utf-8")
+
+    def begin(self, title: str, triggered_by: str) -> None:
+        self._file.write(f"# {title}\n\nTriggered by: {triggered_by}\n\n")
+
+    def add(self, record: FileReport) -> None:
+        write = self._file.write
+        write(f"## `{record.path}`\n\n")
+        if record.skip_note is not None:
+            write(f"_{record.skip_note}_\n\n")
+            return
+        write(f"### Linter Check ({record.language})\n\n")
+        write("Error occurred\n\n" if record.linter is None else f"```\n{record.linter}\n```\n\n")
+        if record.review is not None:
+            write("### Review\n\n")
+            if record.review.text is None:
+                write("Error occurred\n\n")
+            else:
+                write(f"{record.review.text}\n\n_{token_note(record.review)}_\n\n")
+        elif record.review_note is not None:
+            write(f"### Review\n\n_{record.review_note}_\n\n")
+
+    def finish(self, summary: Sequence[str]) -> None:
+        if summary:
+            self._file.write("## Run Summary\n\n" + "".join(f"- {line}\n" for line in summary))
+        self._file.close()
+
+
+class JsonRenderer(ReportRenderer):
+    """Streams the report to a JSON document, writing each file record as it arrives."""
+
+    def __init__(self, filename: str):
+        """
+        Args:
+            filename: Output JSON filename
+        """
+        self.filename = filename
+        self._file: IO[str] = open(filename, "w", encoding="utf-8")
+        self._first = True
+
+    def begin(self, title: str, triggered_by: str) -> None:
+        self._file.write(
+            f'{{"title": {json.dumps(title)}, "triggered_by": {json.dumps(triggered_by)}, "files": ['
+        )
+
+    def add(self, record: FileReport) -> None:
+        entry = record._asdict()
+        if record.findings is not None:
+            entry["findings"] = [finding.to_dict() for finding in record.findings]
+        if record.review is not None:
+            entry["review"] = record.review._asdict()
+        self._file.write(("\n" if self._first else ",\n") + json.dumps(entry))
+        self._first = False
+
+    def finish(self, summary: Sequence[str]) -> None:
+        self._file.write(f'\n], "summary": {json.dumps(list(summary))}}}\n')
+        self._file.close()
+
+
+SARIF_LEVELS = {"error": "error", "warning": "warning", "info": "note"}
+# Rule of the results carrying the LLM review of a file
+REVIEW_RULE_ID = "llm-review"
+
+
+class SarifRenderer(ReportRenderer):
+    """
+    Streams linter findings and LLM reviews as a SARIF 2.1.0 log for code scanning.
+
+    Results are written as they arrive; only the set of rule ids is kept, and
+    the tool description (which lists them) is written after the results.
+    """
+
+    def __init__(self, filename: str):
+        """
+        Args:
+            filename: Output SARIF filename
+        """
+        self.filename = filename
+        self._file: IO[str] = open(filename, "w", encoding="utf-8")
+        self._first = True
+        self._rules: Dict[str, str] = {}
+
+    def begin(self, title: str, triggered_by: str) -> None:
+        self._file.write(
+            '{"$schema": "https://json.schemastore.org/sarif-2.1.0.json", "version": "2.1.0", '
+            '"runs": [{"results": ['
+        )
+
+    def _result(self, rule_id: str, level: str, message: str, path: str, line: int, col: int) -> None:
+        region = {"startLine": max(line, 1)}
+        if col > 0:
+            region["startColumn"] = col
+        result = {
+            "ruleId": rule_id,
+            "level": level,
+            "message": {"text": message},
+            "locations": [{"physicalLocation": {
+                "artifactLocation": {"uri": quote(path), "uriBaseId": "%SRCROOT%"},
+                "region": region,
+            }}],
+        }
+        self._file.write(("\n" if self._first else ",\n") + json.dumps(result))
+        self._first = False
+
+    def add(self, record: FileReport) -> None:
+        for finding in record.findings or []:
+            rule_id = finding.rule or "lint-error"
+            self._rules.setdefault(rule_id, record.lint_tool or "Linter")
+            self._result(rule_id, SARIF_LEVELS.get(finding.severity, "note"), finding.message,
+                         record.path, finding.line, finding.col)
+        if record.review is not None and record.review.text:
+            self._rules.setdefault(REVIEW_RULE_ID, "LLM code review")
+            self._result(REVIEW_RULE_ID, "note", record.review.text, record.path, 1, 0)
+
+    def finish(self, summary: Sequence[str]) -> None:
+        rules = [
+            {"id": rule_id, "shortDescription": {"text": f"{source}: {rule_id}"}}
+            for rule_id, source in self._rules.items()
+        ]
+        tool = {"driver": {"name": "AutoGen Code Review", "rules": rules}}
+        self._file.write(f'\n], "tool": {json.dumps(tool)}}}]}}\n')
+        self._file.close()
+
+
+RENDERERS = {
+    "pdf": PdfRenderer,
+    "md": MarkdownRenderer,
+    "json": JsonRenderer,
+    "sarif": SarifRenderer,
+}
+
+
+class ReportWriter:
+    """
+    Fans the report out to all requested output formats.
+
+    File records are rendered as soon as they are added and not kept, so
+    memory stays proportional to one file section. A renderer that fails is
+    logged and dropped without affecting the others.
+    """
+
+    def __init__(self, basename: str, formats: Sequence[str]):
+        """
+        Args:
+            basename: Output path without extension
+            formats: Output formats (keys of RENDERERS)
+        """
+        self.renderers: List[ReportRenderer] = []
+        for output_format in formats:
+            try:
+                self.renderers.append(RENDERERS[output_format](f"{basename}.{output_format}"))
+            except KeyError:
+                logger.warning(f"Unknown report format '{output_format}'. Ignoring.")
+            except Exception as error:
+                logger.error(f"Error creating {output_format} report: {error}")
+
+    @property
+    def filenames(self) -> List[str]:
+        """Output files of the renderers still running."""
+        return [renderer.filename for renderer in self.renderers]
+
+    def _dispatch(self, method: str, *args) -> None:
+        for renderer in list(self.renderers):
+            try:
+                getattr(renderer, method)(*args)
+            except Exception as error:
+                logger.error(f"Error writing {renderer.filename}: {error}")
+                self.renderers.remove(renderer)
+
+    def begin(self, title: str, triggered_by: str) -> None:
+        """
+        Starts the report.
+
+        Args:
+            title: Report title
+            triggered_by: User who triggered the review
+        """
+        self._dispatch("begin", title, triggered_by)
+
+    def add(self, record: FileReport) -> None:
+        """
+        Renders one file section to every output.
+
+        Args:
+            record: File record
+        """
+        self._dispatch("add", record)
+
+    def finish(self, summary: Sequence[str]) -> None:
+        """
+        Writes the run summary and closes every output.
+
+        Args:
+            summary: Summary lines
+        """
+        self._dispatch("finish", summary)
+        for filename in self.filenames:
+            logger.info(f"Report written: {filename}")
@@ -0,0 +1,91 @@
+import re
+from typing import Dict, List, NamedTuple, Sequence
+
+FILE_MARKER = "### FILE:"
+_FILE_HEADER = re.compile(r"^\s*#{1,6}\s*FILE:\s*`?(?P<path>[^`\n]+?)`?\s*(?:\(.*\))?\s*$", re.MULTILINE)
+
+
+class PackedFile(NamedTuple):
+    """One small file queued for a shared review request."""
+
+    path: str
+    language: str
+    body: str
+    tokens: int
+    is_excerpt: bool
+
+
+def plan_batches(files: Sequence[PackedFile], max_tokens: int, max_files: int) -> List[List[PackedFile]]:
+    """
+    Bin-packs small files into review requests (first-fit decreasing).
+
+    Args:
+        files: Candidate files with their token counts
+        max_tokens: Token budget for the code of one request
+        max_files: Maximum files per request
+
+    Returns:
+        Batches of files; every file appears in exactly one batch
+    """
+    batches: List[List[PackedFile]] = []
+    loads: List[int] = []
+    for packed_file in sorted(files, key=lambda item: item.tokens, reverse=True):
+        for index, batch in enumerate(batches):
+            if len(batch) < max_files and loads[index] + packed_file.tokens <= max_tokens:
+                batch.append(packed_file)
+                loads[index] += packed_file.tokens
+                break
+        else:
+            batches.append([packed_file])
+            loads.append(packed_file.tokens)
+    return batches
+
+
+def build_batch_task(batch: Sequence[PackedFile]) -> str:
+    """
+    Builds one review message covering several small files.
+
+    Args:
+        batch: Files packed into this request
+
+    Returns:
+        Review task message asking for one marked section per file
+    """
+    parts = [
+        f"Review each of the following {len(batch)} files for optimizations and standards. "
+        f"Answer with one section per file, in the same order, each starting with a line "
+        f"'{FILE_MARKER} <path>' exactly as given below. Diff excerpts number their lines; "
+        f"'+' marks added lines and '-' removed ones, focus on those."
+    ]
+    for packed_file in batch:
+        kind = "changes" if packed_file.is_excerpt else "full file"
+        parts.append(
+            f"{FILE_MARKER} {packed_file.path} ({packed_file.language}, {kind})\n"
+            f"```{packed_file.language}\n{packed_file.body}\n```"
+        )
+    return "\n\n".join(parts)
+
+
+def split_batch_review(response: str, paths: Sequence[str]) -> Dict[str, str]:
+    """
+    Splits a multi-file review answer back into per-file sections.
+
+    Args:
+        response: Model answer to build_batch_task()
+        paths: Paths of the files in the request
+
+    Returns:
+        Mapping of path to its review text; files the model skipped are missing
+    """
+    wanted = set(paths)
+    sections: Dict[str, str] = {}
+    headers = list(_FILE_HEADER.finditer(response))
+    for index, header in enumerate(headers):
+        path = header.group("path").strip()
+        if path not in wanted:
+            continue
+        end = headers[index + 1].start() if index + 1 < len(headers) else len(response)
+        text = response[header.end():end].strip()
+        if text:
+            sections[path] = text
+    return sections
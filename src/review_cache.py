@@ -0,0 +1,146 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ReviewCache:
+    """
+    SQLite-backed cache of LLM review responses.
+
+    Entries are keyed by the hash of the review message (which embeds the
+    reviewed code), the agent's system prompt and the model name. Entries
+    expire after a TTL, and the least recently used ones are evicted past a
+    maximum entry count. Hit/miss counters and the tokens saved by hits feed
+    the run summary.
+    """
+
+    def __init__(self, db_path: str, ttl_seconds: float = 30 * 24 * 3600, max_entries: int = 5000):
+        """
+        Args:
+            db_path: SQLite database file, created if missing
+            ttl_seconds: Age after which an entry is ignored and purged
+            max_entries: Maximum number of entries kept
+        """
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.tokens_saved = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._connection.execute(
+            """CREATE TABLE IF NOT EXISTS reviews (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                tokens INTEGER NOT NULL DEFAULT 0,
+                created REAL NOT NULL,
+                accessed REAL NOT NULL
+            )"""
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS reviews_accessed ON reviews (accessed)")
+        self._connection.commit()
+
+    @staticmethod
+    def make_key(message: str, system_prompt: str, model: str) -> str:
+        """
+        Builds the cache key for one review request.
+
+        Args:
+            message: Review task message, including the code under review
+            system_prompt: Reviewer system prompt (includes the coding standards)
+            model: Model name
+
+        Returns:
+            Hex digest key
+        """
+        digest = hashlib.sha256()
+        for part in (model, system_prompt, message):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Looks up a cached review.
+
+        Args:
+            key: Key from make_key()
+
+        Returns:
+            Cached response, or None on a miss or expired entry
+        """
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT response, tokens FROM reviews WHERE key = ? AND created >= ?",
+                (key, now - self.ttl_seconds)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._connection.execute("UPDATE reviews SET accessed = ? WHERE key = ?", (now, key))
+            self._connection.commit()
+            self.hits += 1
+            self.tokens_saved += row[1]
+            return row[0]
+
+    def put(self, key: str, response: str, tokens: int = 0) -> None:
+        """
+        Stores a review and applies TTL and size eviction.
+
+        Args:
+            key: Key from make_key()
+            response: Review text returned by the model
+            tokens: Prompt + completion tokens the request cost
+        """
+        now = time.time()
+        with self._lock:
+            try:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO reviews (key, response, tokens, created, accessed) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, response, tokens, now, now)
+                )
+                self._connection.execute("DELETE FROM reviews WHERE created < ?", (now - self.ttl_seconds,))
+                self._connection.execute(
+                    "DELETE FROM reviews WHERE key IN ("
+                    "SELECT key FROM reviews ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+                self._connection.commit()
+            except sqlite3.Error as error:
+                logger.warning(f"Could not write review cache entry: {error}")
+
+    def reset_counters(self) -> None:
+        """Starts a new run's hit, miss and savings counts (the entries are kept)."""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.tokens_saved = 0
+
+    def summary(self) -> str:
+        """
+        Describes the cache savings of this run.
+
+        Returns:
+            One-line summary for the report
+        """
+        return (
+            f"Review cache: {self.hits} hit(s), {self.misses} miss(es), "
+            f"~{self.tokens_saved} tokens saved"
+        )
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        with self._lock:
+            self._connection.close()
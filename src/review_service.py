@@ -0,0 +1,498 @@
+"""
+Long-running review service fed by GitHub webhooks.
+
+Receives push and pull_request webhooks over HTTP, stores a job per commit
+range in a SQLite queue and reviews the jobs one after another in the same
+process. The thread pools, AutoGen agents, HTTP clients, rate limiters, the
+review and lint caches and the Node lint worker therefore stay warm between
+jobs, and each review skips the checkout, dependency install and interpreter
+start of a fresh CI job.
+
+Each repository is cloned once below REVIEW_SERVICE_DATA_DIR and then only
+fetched. Reports and run profiles go to REVIEW_SERVICE_DATA_DIR/reports/<job>.
+All other settings (model, linters, caches, report formats, email) are the
+reviewer's environment variables.
+
+Endpoints:
+    POST /webhook     GitHub webhook (push, pull_request, ping)
+    GET  /jobs/<id>   Job status and report files
+    GET  /health      Queue counts
+
+Example (local test with a fake push of a repository below /tmp):
+    WEBHOOK_SECRET=s3cret REVIEW_SERVICE_LOCAL_CLONE_ROOT=/tmp OPENAI_API_KEY=... python src/review_service.py
+"""
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import run_autogen_review as review
+from git_discovery import GitDiscoveryError, run_git
+from job_queue import JobQueue, QueuedJob
+
+logger = logging.getLogger(__name__)
+
+# Interface and port of the webhook endpoint
+SERVICE_HOST = os.getenv("REVIEW_SERVICE_HOST", "127.0.0.1")
+SERVICE_PORT = int(os.getenv("REVIEW_SERVICE_PORT", "8080"))
+# Queue database, repository clones and reports
+SERVICE_DATA_DIR = os.path.abspath(os.getenv("REVIEW_SERVICE_DATA_DIR", ".review-service"))
+# Secret configured on the GitHub webhook; the service refuses to start without it
+# unless REVIEW_SERVICE_ALLOW_UNSIGNED explicitly accepts unsigned deliveries
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET", "")
+ALLOW_UNSIGNED = os.getenv("REVIEW_SERVICE_ALLOW_UNSIGNED", "false").lower() in ("1", "true", "yes")
+# Starts allowed per job before it is marked failed
+SERVICE_MAX_ATTEMPTS = int(os.getenv("REVIEW_SERVICE_MAX_ATTEMPTS", "3"))
+# Timeout for clone and fetch, in seconds
+GIT_FETCH_TIMEOUT = int(os.getenv("REVIEW_SERVICE_FETCH_TIMEOUT", "600"))
+# Clone URLs must be HTTPS URLs on the configured GitHub host. For local testing,
+# absolute paths of repositories below this directory are accepted as well.
+LOCAL_CLONE_ROOT = os.getenv("REVIEW_SERVICE_LOCAL_CLONE_ROOT", "")
+
+# GitHub caps webhook payloads at 25 MB
+MAX_PAYLOAD_BYTES = 25 * 1024 * 1024
+
+PULL_REQUEST_ACTIONS = ("opened", "synchronize", "reopened", "ready_for_review")
+
+_JOB_PATH = re.compile(r"^/jobs/(\d+)$")
+_ZERO_SHA = re.compile(r"^0+$")
+_SHA = re.compile(r"^[0-9a-f]{40}$")
+_REPO_NAME = re.compile(r"^[\w.-]+/[\w.-]+$")
+
+
+class InvalidWebhook(ValueError):
+    """Raised when a webhook payload carries values that are unsafe to pass to git."""
+
+
+def verify_signature(secret: str, body: bytes, signature: Optional[str]) -> bool:
+    """
+    Checks the X-Hub-Signature-256 header of a webhook delivery.
+
+    Args:
+        secret: Webhook secret
+        body: Raw request body
+        signature: Header value ("sha256=<hex>")
+
+    Returns:
+        True if the signature matches
+    """
+    if not signature or not signature.startswith("sha256="):
+        return False
+    expected = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature[len("sha256="):])
+
+
+def _check_sha(value: Any, field: str) -> None:
+    """Raises InvalidWebhook unless a payload field is a full lowercase commit SHA."""
+    if not isinstance(value, str) or not _SHA.match(value):
+        raise InvalidWebhook(f"invalid commit SHA in '{field}'")
+
+
+def parse_webhook(event: str, payload: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], str]:
+    """
+    Turns a webhook payload into a job description.
+
+    Args:
+        event: X-GitHub-Event header
+        payload: Decoded webhook body
+
+    Returns:
+        Tuple of (job spec with dedupe_key, or None if nothing is to be reviewed; reason)
+
+    Raises:
+        InvalidWebhook: If the repository, clone URL or a commit SHA is malformed
+    """
+    repository = payload.get("repository") or {}
+    repo_name = repository.get("full_name")
+    clone_url = repository.get("clone_url")
+    actor = (payload.get("sender") or {}).get("login")
+    if event == "ping":
+        return None, "pong"
+    if not repo_name or not clone_url:
+        return None, "payload has no repository"
+    # Everything below ends up in git's argument list and the clone path
+    if (not isinstance(repo_name, str) or not _REPO_NAME.match(repo_name)
+            or any(segment in (".", "..") for segment in repo_name.split("/"))):
+        raise InvalidWebhook("invalid repository name")
+    if not isinstance(clone_url, str) or not is_allowed_clone_url(clone_url):
+        raise InvalidWebhook("clone URL is not on the configured GitHub host")
+
+    if event == "push":
+        head_sha = payload.get("after") or ""
+        if payload.get("deleted") or _ZERO_SHA.match(head_sha):
+            return None, "branch deleted"
+        before_sha = payload.get("before")
+        _check_sha(head_sha, "after")
+        if before_sha is not None:
+            _check_sha(before_sha, "before")
+        return {
+            "repo_name": repo_name,
+            "clone_url": clone_url,
+            "actor": actor,
+            "commit_sha": head_sha,
+            "before_sha": before_sha,
+            "fetch": [head_sha] + ([before_sha] if review.push_range_base(before_sha) else []),
+            "dedupe_key": f"{repo_name}:{before_sha}..{head_sha}",
+        }, "push"
+
+    if event == "pull_request":
+        action = payload.get("action")
+        pull_request = payload.get("pull_request") or {}
+        if action not in PULL_REQUEST_ACTIONS:
+            return None, f"pull_request action '{action}' is not reviewed"
+        number = pull_request.get("number")
+        head_sha = (pull_request.get("head") or {}).get("sha")
+        base_sha = (pull_request.get("base") or {}).get("sha")
+        if not head_sha or not base_sha:
+            return None, "pull request has no head or base"
+        _check_sha(head_sha, "head.sha")
+        _check_sha(base_sha, "base.sha")
+        if not isinstance(number, int) or isinstance(number, bool) or number <= 0:
+            raise InvalidWebhook("invalid pull request number")
+        return {
+            "repo_name": repo_name,
+            "clone_url": clone_url,
+            "actor": actor,
+            "commit_sha": head_sha,
+            "merge_base_of": base_sha,
+            # Heads of forks are only reachable through the pull ref
+            "fetch": [f"+refs/pull/{number}/head:refs/review/pull/{number}", base_sha],
+            "dedupe_key": f"{repo_name}#{number}:{head_sha}",
+        }, "pull_request"
+
+    return None, f"event '{event}' is not reviewed"
+
+
+def github_git_host() -> Tuple[str, Optional[int]]:
+    """
+    Returns the host serving git for the configured GitHub instance.
+
+    GitHub.com serves its API from api.github.com, GitHub Enterprise Server
+    from <host>/api/v3; either way the clones come from the bare host.
+
+    Returns:
+        Tuple of (host name, port or None for the HTTPS default)
+    """
+    api_url = urlparse(review.GITHUB_API_URL)
+    host = (api_url.hostname or "").lower()
+    if host == "api.github.com":
+        host = "github.com"
+    return host, None if api_url.port == 443 else api_url.port
+
+
+def is_github_url(url: str) -> bool:
+    """
+    Tells whether a URL is an HTTPS URL on the configured GitHub host.
+
+    Args:
+        url: URL to check
+
+    Returns:
+        True for https://<GitHub host>/... without user info
+    """
+    parsed = urlparse(url)
+    try:
+        port = None if parsed.port == 443 else parsed.port
+    except ValueError:
+        return False
+    return (parsed.scheme == "https" and not parsed.username
+            and ((parsed.hostname or "").lower(), port) == github_git_host())
+
+
+def is_allowed_clone_url(clone_url: str) -> bool:
+    """
+    Tells whether the service may clone from a URL taken from a webhook payload.
+
+    Args:
+        clone_url: repository.clone_url of the payload
+
+    Returns:
+        True for the configured GitHub host, or a repository below
+        REVIEW_SERVICE_LOCAL_CLONE_ROOT when that is set
+    """
+    if is_github_url(clone_url):
+        return True
+    if not LOCAL_CLONE_ROOT or not os.path.isabs(clone_url):
+        return False
+    root = os.path.realpath(LOCAL_CLONE_ROOT)
+    return os.path.commonpath([root, os.path.realpath(clone_url)]) == root
+
+
+def _git_auth_config(clone_url: str) -> List[str]:
+    """
+    Returns the per-command git setting that authenticates HTTPS fetches with GITHUB_TOKEN.
+
+    The token is only sent to the configured GitHub host; the clone URL comes
+    from the webhook payload and must not be able to send it anywhere else.
+    """
+    if not review.GITHUB_TOKEN or not is_github_url(clone_url):
+        return []
+    credentials = base64.b64encode(f"x-access-token:{review.GITHUB_TOKEN}".encode("utf-8")).decode("ascii")
+    return [f"http.extraheader=AUTHORIZATION: basic {credentials}"]
+
+
+def prepare_checkout(spec: Dict[str, Any], repos_dir: str) -> Tuple[str, Optional[str]]:
+    """
+    Brings the service's clone of a repository to the job's head commit.
+
+    The clone is created on first use and only fetched afterwards. The head is
+    checked out, so linters find the repository's own configs.
+
+    Args:
+        spec: Job spec from parse_webhook()
+        repos_dir: Directory holding the clones
+
+    Returns:
+        Tuple of (clone directory, start of the range to review)
+
+    Raises:
+        GitDiscoveryError: If cloning, fetching or checking out fails
+    """
+    repo_dir = os.path.join(repos_dir, *spec["repo_name"].split("/"))
+    if os.path.commonpath([os.path.realpath(repos_dir), os.path.realpath(repo_dir)]) != os.path.realpath(repos_dir):
+        raise GitDiscoveryError(f"Clone path for {spec['repo_name']} is outside {repos_dir}")
+    auth = _git_auth_config(spec["clone_url"])
+    if not os.path.isdir(os.path.join(repo_dir, ".git")):
+        os.makedirs(os.path.dirname(repo_dir), exist_ok=True)
+        logger.info(f"Cloning {spec['repo_name']}")
+        run_git(["clone", "--quiet", "--no-checkout", "--", spec["clone_url"], repo_dir],
+                repos_dir, timeout=GIT_FETCH_TIMEOUT, config=auth)
+
+    try:
+        run_git(["fetch", "--quiet", "origin", "--end-of-options", *spec["fetch"]], repo_dir,
+                timeout=GIT_FETCH_TIMEOUT, config=auth)
+    except GitDiscoveryError as error:
+        # Servers that refuse fetching by SHA still serve the branches
+        logger.warning(f"{error}. Fetching all branches.")
+        run_git(["fetch", "--quiet", "origin"], repo_dir, timeout=GIT_FETCH_TIMEOUT, config=auth)
+    # The trailing "--" keeps the commit from being read as a path
+    run_git(["checkout", "--quiet", "--force", "--detach", spec["commit_sha"], "--"], repo_dir,
+            config=["advice.detachedHead=false"])
+
+    before_sha = spec.get("before_sha")
+    if spec.get("merge_base_of"):
+        before_sha = run_git(["merge-base", "--end-of-options", spec["merge_base_of"], spec["commit_sha"]], repo_dir).strip()
+    return repo_dir, before_sha
+
+
+class ReviewService:
+    """
+    Webhook endpoint plus the worker that reviews queued jobs.
+
+    Jobs run one at a time: a review changes into the repository's clone
+    (linters and staging work on relative paths), and each job is already
+    parallel inside through the shared lint and review pools.
+    """
+
+    def __init__(self, data_dir: str = SERVICE_DATA_DIR, host: str = SERVICE_HOST, port: int = SERVICE_PORT,
+                 secret: str = WEBHOOK_SECRET):
+        """
+        Args:
+            data_dir: Directory for the queue, the clones and the reports
+            host: Interface to listen on
+            port: Port to listen on, 0 picks a free one
+            secret: Webhook secret, empty to accept unsigned deliveries
+        """
+        self.data_dir = data_dir
+        self.secret = secret
+        self.queue = JobQueue(os.path.join(data_dir, "jobs.sqlite3"), max_attempts=SERVICE_MAX_ATTEMPTS)
+        self.lint_pool = ThreadPoolExecutor(max_workers=review.LINT_WORKERS, thread_name_prefix="lint")
+        self.review_pool = ThreadPoolExecutor(max_workers=review.REVIEW_WORKERS, thread_name_prefix="review")
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        """Base URL of the webhook endpoint."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def submit(self, event: str, payload: Dict[str, Any]) -> Tuple[Optional[int], str]:
+        """
+        Queues the review requested by a webhook.
+
+        Args:
+            event: X-GitHub-Event header
+            payload: Decoded webhook body
+
+        Returns:
+            Tuple of (job id or None if ignored, status message)
+
+        Raises:
+            InvalidWebhook: If the payload carries malformed values
+        """
+        spec, reason = parse_webhook(event, payload)
+        if spec is None:
+            return None, reason
+        job_id, created = self.queue.enqueue(spec, spec.pop("dedupe_key"))
+        if created:
+            logger.info(f"Queued job {job_id}: {reason} {spec['repo_name']} {spec['commit_sha'][:7]}")
+            self._wake.set()
+            return job_id, "queued"
+        return job_id, "duplicate"
+
+    def warm_up(self) -> None:
+        """Loads the LLM client stack and builds the agents of every review thread before the first job."""
+        config_list = review.get_llm_config_list()
+        futures = [self.review_pool.submit(review.get_thread_agents, config_list)
+                   for _ in range(review.REVIEW_WORKERS)]
+        for future in futures:
+            try:
+                future.result()
+            except Exception as error:
+                logger.warning(f"Warm-up failed: {error}")
+
+    def process(self, job: QueuedJob) -> None:
+        """
+        Reviews one job and records its outcome in the queue.
+
+        Args:
+            job: Claimed job
+        """
+        spec = job.spec
+        service_cwd = os.getcwd()
+        try:
+            repo_dir, before_sha = prepare_checkout(spec, os.path.join(self.data_dir, "repos"))
+            report_dir = os.path.join(self.data_dir, "reports", str(job.id))
+            os.makedirs(report_dir, exist_ok=True)
+            review_job = review.ReviewJob(
+                spec["repo_name"], spec["commit_sha"], spec.get("actor"), before_sha,
+                github_token=review.GITHUB_TOKEN,
+                repo_dir=repo_dir,
+                report_basename=os.path.join(report_dir, "report"),
+                profile_path=os.path.join(report_dir, "run-profile.json") if review.RUN_PROFILE_PATH else "",
+            )
+            os.chdir(repo_dir)
+            report_files = review.run_review(review_job, self.lint_pool, self.review_pool)
+        except Exception as error:
+            retry = self.queue.fail(job.id, f"{type(error).__name__}: {error}")
+            logger.error(f"Job {job.id} failed (attempt {job.attempts}): {error}"
+                         + (". Retrying." if retry else ". Giving up."))
+            return
+        finally:
+            os.chdir(service_cwd)
+        self.queue.complete(job.id, {"reports": report_files or [], "changed_files": report_files is not None})
+        logger.info(f"Job {job.id} done")
+
+    def _work(self) -> None:
+        """Worker loop: reviews queued jobs until stop() is called."""
+        while not self._stopping.is_set():
+            job = self.queue.claim()
+            if job is None:
+                self._wake.wait(timeout=5)
+                self._wake.clear()
+                continue
+            self.process(job)
+
+    def start(self) -> "ReviewService":
+        """Re-queues interrupted jobs and starts the worker thread."""
+        self.queue.recover()
+        self._worker = threading.Thread(target=self._work, name="review-worker", daemon=True)
+        self._worker.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serves webhooks until interrupted."""
+        logger.info(f"Review service listening on {self.url}")
+        try:
+            self._server.serve_forever()
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        """Stops accepting webhooks and lets the running job finish."""
+        self._stopping.set()
+        self._wake.set()
+        self._server.shutdown()
+        self._server.server_close()
+        if self._worker is not None:
+            self._worker.join()
+        self.lint_pool.shutdown()
+        self.review_pool.shutdown()
+
+    def _handler(self):
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+            def _send(self, status: int, body: Dict[str, Any]) -> None:
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path == "/health":
+                    self._send(200, {"status": "ok", "jobs": service.queue.counts()})
+                    return
+                match = _JOB_PATH.match(self.path)
+                job = service.queue.get(int(match.group(1))) if match else None
+                if job is None:
+                    self._send(404, {"error": "not found"})
+                    return
+                self._send(200, job)
+
+            def do_POST(self):
+                if self.path != "/webhook":
+                    self._send(404, {"error": "not found"})
+                    return
+                length = int(self.headers.get("Content-Length") or 0)
+                if length > MAX_PAYLOAD_BYTES:
+                    self._send(413, {"error": "payload too large"})
+                    return
+                body = self.rfile.read(length)
+                if service.secret and not verify_signature(
+                        service.secret, body, self.headers.get("X-Hub-Signature-256")):
+                    self._send(401, {"error": "bad signature"})
+                    return
+                try:
+                    payload = json.loads(body or b"{}")
+                except ValueError:
+                    self._send(400, {"error": "body is not JSON"})
+                    return
+                try:
+                    job_id, status = service.submit(self.headers.get("X-GitHub-Event", ""), payload)
+                except InvalidWebhook as error:
+                    self._send(400, {"error": str(error)})
+                    return
+                if job_id is None:
+                    self._send(200, {"status": "ignored", "reason": status})
+                    return
+                self._send(202, {"status": status, "job": job_id, "url": f"/jobs/{job_id}"})
+
+        return Handler
+
+
+def main():
+    """Runs the review service."""
+    if not review.OPENAI_API_KEY:
+        logger.error("Missing environment variables: OPENAI_API_KEY")
+        raise SystemExit(1)
+    if not WEBHOOK_SECRET:
+        if not ALLOW_UNSIGNED:
+            logger.error("WEBHOOK_SECRET is not set. Set REVIEW_SERVICE_ALLOW_UNSIGNED=true "
+                         "to accept unsigned webhooks anyway.")
+            raise SystemExit(1)
+        logger.warning("WEBHOOK_SECRET is not set; accepting unsigned webhooks")
+    service = ReviewService()
+    service.warm_up()
+    service.start().serve_forever()
+
+
+if __name__ == "__main__":
+    main()
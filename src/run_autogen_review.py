@@ -1,18 +1,41 @@
+import atexit
+import json
 import logging
 import os
-import smtplib
+import shutil
 import subprocess
 import sys
-import time 
-from email import encoders
-from email.mime.base import MIMEBase
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from typing import List, Optional
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, NamedTuple, Optional, Tuple
 
-from autogen import AssistantAgent, UserProxyAgent
-from fpdf import FPDF
-from github import Github
+from blob_reader import BlobReadError, GitBlobReader
+from cassette import RECORD as CASSETTE_RECORD, REPLAY as CASSETTE_REPLAY, Cassette
+from changes import ChangedFile, is_binary_path, skip_reason
+from diff_hunks import build_hunk_excerpt, is_file_addition, split_excerpt
+from findings import (FLAKE8_FORMAT, Finding, LintReport, eslint_findings, flake8_findings,
+                      group_findings, stylelint_findings)
+from generated_code import GeneratedFileDetector
+from git_discovery import GitDiscoveryError, git_changed_files, run_git
+from lint_cache import LintCache, config_fingerprint, tool_version
+from lint_worker_client import LintWorkerError, NodeLintWorker
+from path_filter import PathFilter, parse_ignore_file
+from python_chunks import split_python_source
+from rate_limiter import get_rate_limiter
+from review_batching import PackedFile, build_batch_task, plan_batches, split_batch_review
+from report import FileReport, ReportWriter, ReviewResult
+from review_cache import ReviewCache
+from run_profile import SUBPROCESS, RunProfiler
+from token_budget import count_tokens, prompt_token_budget, truncate_to_tokens
+
+# autogen (with openai and pydantic), github, httpx, fpdf and smtplib take most
+# of the startup time; they are imported by the stage that needs them, so runs
+# that exit early or never call the LLM do not pay for them
+if TYPE_CHECKING:
+    import httpx
+    from autogen import AssistantAgent, UserProxyAgent
 
 # === LOGGING SETUP ===
 logging.basicConfig(
@@ -23,16 +46,109 @@ logger = logging.getLogger(__name__)
 
 # === 1. CONFIGURATION ===
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+# OpenAI-compatible endpoint and model (a local stub in benchmarks)
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://openrouter.ai/api/v1")
+LLM_MODEL = os.getenv("LLM_MODEL", "x-ai/grok-code-fast-1")
 GMAIL_USER = os.getenv("GMAIL_USER")
 GMAIL_APP_PASSWORD = os.getenv("GMAIL_APP_PASSWORD")
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 REPO_NAME = os.getenv("GITHUB_REPOSITORY")
 COMMIT_SHA = os.getenv("GITHUB_SHA")
 GITHUB_ACTOR = os.getenv("GITHUB_ACTOR")
+# Head of the branch before the push; when set, the whole push range is reviewed
+PUSH_BEFORE_SHA = os.getenv("PUSH_BEFORE_SHA")
+# Set by GitHub Actions; also points the API backend at GitHub Enterprise or a local fake
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")
+
+# Changed-file discovery: "auto" (local git, GitHub API as fallback), "git" or "api".
+# GIT_REPO_DIR may point at the working tree or a local (bare) mirror.
+CHANGED_FILES_SOURCE = os.getenv("CHANGED_FILES_SOURCE", "auto").lower()
+GIT_REPO_DIR = os.getenv("GIT_REPO_DIR", ".")
+
+# File contents: "auto" reads blobs from the git object database when the diff
+# gives a blob SHA (no checkout needed), "worktree" always reads checked-out files.
+# Files that are not checked out at the reviewed commit are staged for the linters,
+# in a per-run directory named LINT_STAGING_DIR-<random> that is removed after linting.
+CONTENT_SOURCE = os.getenv("CONTENT_SOURCE", "auto").lower()
+LINT_STAGING_DIR = os.getenv("LINT_STAGING_DIR", "review-staging")
+
+# Paths that are never reviewed (gitignore-style). REVIEW_EXCLUDE adds rules and
+# REVIEW_INCLUDE, if set, restricts review to matching paths (comma-separated);
+# the repository's REVIEW_IGNORE_FILE is applied last and may re-include with "!"
+DEFAULT_EXCLUDED_PATTERNS = ["node_modules/", ".github/", "package-lock.json", "yarn.lock"]
+REVIEW_EXCLUDE = [pattern.strip() for pattern in os.getenv("REVIEW_EXCLUDE", "").split(",") if pattern.strip()]
+REVIEW_INCLUDE = [pattern.strip() for pattern in os.getenv("REVIEW_INCLUDE", "").split(",") if pattern.strip()]
+REVIEW_IGNORE_FILE = os.getenv("REVIEW_IGNORE_FILE", ".reviewignore")
+
+# Generated, minified and vendored files: "lint" lints them without an LLM review,
+# "skip" leaves them out entirely, "review" treats them like any other file
+GENERATED_CODE_POLICY = os.getenv("GENERATED_CODE_POLICY", "lint").lower()
+
+# Report outputs written next to each other: REPORT_BASENAME.<format> for each
+# of REPORT_FORMATS ("pdf", "md", "json", "sarif"); the PDF is the one that gets emailed
+REPORT_BASENAME = os.getenv("REPORT_BASENAME", "report")
+REPORT_FORMATS = [
+    fmt.strip().lower() for fmt in os.getenv("REPORT_FORMATS", "pdf,md,json,sarif").split(",") if fmt.strip()
+]
+
+# JSON run profile with per-stage/per-file timings and LLM calls (empty disables it)
+RUN_PROFILE_PATH = os.getenv("RUN_PROFILE_PATH", "run-profile.json")
+
+# Record/replay of GitHub API and LLM traffic: "off", "record" or "replay".
+# Replay serves the responses from the cassette, after the recorded latency
+# or ("none") immediately, so pipeline changes run against real captured traffic offline.
+CASSETTE_MODE = os.getenv("REVIEW_CASSETTE_MODE", "off").lower()
+CASSETTE_PATH = os.path.abspath(os.getenv("REVIEW_CASSETTE_PATH", "review-cassette.json.gz"))
+CASSETTE_LATENCY = os.getenv("REVIEW_CASSETTE_LATENCY", "recorded").lower()
 
 # File size limit (1MB)
 MAX_FILE_SIZE = 1024 * 1024
 
+# Maximum number of files passed to one linter process
+LINT_BATCH_SIZE = int(os.getenv("LINT_BATCH_SIZE", "200"))
+
+# Concurrency limits: linter processes / file reads, and simultaneous LLM reviews
+LINT_WORKERS = int(os.getenv("LINT_WORKERS", "4"))
+REVIEW_WORKERS = int(os.getenv("REVIEW_WORKERS", "4"))
+
+# Static per-model LLM quota (0 = follow the provider's rate-limit headers) and
+# expected completion size per call
+LLM_REQUESTS_PER_MINUTE = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "0"))
+LLM_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "0"))
+COMPLETION_TOKEN_ESTIMATE = 600
+
+# Persistent linter result cache (empty LINT_CACHE_DIR disables it). Cache paths are
+# resolved at startup, so the webhook service keeps them when it changes into a clone.
+LINT_CACHE_DIR = os.getenv("LINT_CACHE_DIR", ".review-cache/lint")
+LINT_CACHE_DIR = os.path.abspath(LINT_CACHE_DIR) if LINT_CACHE_DIR else ""
+LINT_CACHE_MAX_MB = int(os.getenv("LINT_CACHE_MAX_MB", "100"))
+
+# LLM review response cache (empty REVIEW_CACHE_PATH disables it)
+REVIEW_CACHE_PATH = os.getenv("REVIEW_CACHE_PATH", ".review-cache/reviews.sqlite3")
+REVIEW_CACHE_PATH = os.path.abspath(REVIEW_CACHE_PATH) if REVIEW_CACHE_PATH else ""
+REVIEW_CACHE_TTL_DAYS = float(os.getenv("REVIEW_CACHE_TTL_DAYS", "30"))
+REVIEW_CACHE_MAX_ENTRIES = int(os.getenv("REVIEW_CACHE_MAX_ENTRIES", "5000"))
+
+# Review mode: "diff" reviews the commit's patch hunks plus context, "full" the whole file
+REVIEW_MODE = os.getenv("REVIEW_MODE", "diff").lower()
+REVIEW_CONTEXT_LINES = int(os.getenv("REVIEW_CONTEXT_LINES", "10"))
+
+# Default tokens of code per review prompt (config entries may set "prompt_token_budget"),
+# and the token budget per chunk when a large file or diff is reviewed in pieces instead
+REVIEW_TOKEN_BUDGET = int(os.getenv("REVIEW_TOKEN_BUDGET", "1500"))
+REVIEW_CHUNK_TOKENS = int(os.getenv("REVIEW_CHUNK_TOKENS", "1500"))
+
+# Files whose review prompt is at most SMALL_FILE_TOKENS are packed, up to
+# REVIEW_BATCH_MAX_FILES per request, into shared review requests
+SMALL_FILE_TOKENS = int(os.getenv("SMALL_FILE_TOKENS", "400"))
+REVIEW_BATCH_MAX_FILES = int(os.getenv("REVIEW_BATCH_MAX_FILES", "8"))
+
+# Serve ESLint/Stylelint/html-validate from a warm Node worker instead of npx launches
+NODE_LINT_WORKER = os.getenv("NODE_LINT_WORKER", "true").lower() in ("1", "true", "yes")
+
+# Ask the Code_Checker LLM to pick a linter for extensions missing from the registry
+LLM_LINT_FALLBACK = os.getenv("LLM_LINT_FALLBACK", "false").lower() in ("1", "true", "yes")
+
 YOUR_CODE_STANDARD_PROMPT = """
 Check the code against our company's general coding standards:
 1. All functions/methods MUST have clear documentation (docstrings, JSDoc, etc.).
@@ -43,7 +159,151 @@ Check the code against our company's general coding standards:
 
 # === 2. HELPER FUNCTIONS ===
 
-def get_changed_files(repo_name: str, commit_sha: str, github_token: str) -> List[str]:
+_profiler = RunProfiler(enabled=False)
+
+def get_profiler() -> RunProfiler:
+    """
+    Returns the profiler of the current run.
+    
+    Returns:
+        RunProfiler started by start_run_profile(), or a disabled one
+    """
+    return _profiler
+
+def start_run_profile() -> RunProfiler:
+    """
+    Starts a fresh run profile.
+    
+    Returns:
+        New RunProfiler, enabled when RUN_PROFILE_PATH is set
+    """
+    global _profiler
+    _profiler = RunProfiler(enabled=bool(RUN_PROFILE_PATH))
+    return _profiler
+
+class ReviewJob(NamedTuple):
+    """One commit or push range to review."""
+
+    repo_name: Optional[str]
+    commit_sha: str
+    actor: Optional[str]
+    # Branch head before the push; when set, the whole push range is reviewed
+    before_sha: Optional[str] = None
+    github_token: Optional[str] = None
+    # Working tree or local mirror containing the commits
+    repo_dir: str = GIT_REPO_DIR
+    report_basename: str = REPORT_BASENAME
+    profile_path: str = RUN_PROFILE_PATH
+
+def job_from_environment() -> ReviewJob:
+    """
+    Describes the review requested through the GitHub Actions environment.
+    
+    Returns:
+        ReviewJob built from GITHUB_* and PUSH_BEFORE_SHA
+    """
+    return ReviewJob(REPO_NAME, COMMIT_SHA, GITHUB_ACTOR, PUSH_BEFORE_SHA, GITHUB_TOKEN)
+
+_job: Optional[ReviewJob] = None
+
+def get_current_job() -> ReviewJob:
+    """
+    Returns the job being reviewed.
+    
+    Returns:
+        Job passed to run_review(), or the one described by the environment
+    """
+    return _job if _job is not None else job_from_environment()
+
+def start_job(job: ReviewJob) -> None:
+    """
+    Makes a job current and drops the state derived from the previous one.
+    
+    Process-wide resources that do not depend on the reviewed commit (pools,
+    agents, caches, the Node lint worker) are kept, so later jobs start warm;
+    only the cache counters start over, so each report counts its own job.
+    
+    Args:
+        job: Job about to be reviewed
+    """
+    global _job, _path_filter
+    _job = job
+    _path_filter = None
+    for cache in (_review_cache, _lint_cache):
+        if cache is not None:
+            cache.reset_counters()
+
+_cassette: Optional[Cassette] = None
+_cassette_lock = threading.Lock()
+
+def get_cassette() -> Optional[Cassette]:
+    """
+    Returns the process-wide record/replay cassette.
+    
+    A recording cassette is saved when the process exits, so early exits
+    (e.g. a push without changed files) still leave a complete cassette.
+    
+    Returns:
+        Shared Cassette, or None when REVIEW_CASSETTE_MODE is "off"
+    """
+    global _cassette
+    if CASSETTE_MODE not in (CASSETTE_RECORD, CASSETTE_REPLAY):
+        return None
+    with _cassette_lock:
+        if _cassette is None:
+            _cassette = Cassette(CASSETTE_PATH, CASSETTE_MODE, replay_latency=CASSETTE_LATENCY != "none")
+            if _cassette.recording:
+                atexit.register(_cassette.save)
+        return _cassette
+
+def fetch_changed_file_entries(repo_name: str, commit_sha: str, github_token: str,
+                               before_sha: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Fetches the "files" entries of a commit or comparison from the GitHub API.
+    
+    Goes through the cassette: replayed runs never contact GitHub, and
+    recorded runs store the entries.
+    
+    Args:
+        repo_name: Full repository name (owner/repo)
+        commit_sha: Commit SHA to analyze
+        github_token: GitHub authentication token
+        before_sha: Start of a push range
+        
+    Returns:
+        File entries with filename, status, sha, patch, additions and deletions
+    """
+    cassette = get_cassette()
+    key = Cassette.make_key("github", repo_name, before_sha, commit_sha)
+    if cassette is not None and cassette.replaying:
+        return cassette.replay("github", key)
+
+    from github import Github
+
+    start = time.perf_counter()
+    github_client = Github(github_token, base_url=GITHUB_API_URL)
+    repo = github_client.get_repo(repo_name)
+    if before_sha:
+        files = repo.compare(before_sha, commit_sha).files
+    else:
+        files = repo.get_commit(commit_sha).files
+    entries = [
+        {
+            "filename": file.filename,
+            "status": file.status,
+            "sha": file.sha,
+            "patch": file.patch,
+            "additions": file.additions,
+            "deletions": file.deletions,
+        }
+        for file in files
+    ]
+    if cassette is not None and cassette.recording:
+        cassette.record("github", key, entries, time.perf_counter() - start)
+    return entries
+
+def get_changed_files(repo_name: str, commit_sha: str, github_token: str,
+                      before_sha: Optional[str] = None) -> Dict[str, ChangedFile]:
     """
     Uses the GitHub API to find all changed files in the specific commit.
     
@@ -51,27 +311,305 @@ def get_changed_files(repo_name: str, commit_sha: str, github_token: str) -> Lis
         repo_name: Full repository name (owner/repo)
         commit_sha: Commit SHA to analyze
         github_token: GitHub authentication token
+        before_sha: Start of a push range; the net change before_sha..commit_sha is returned
         
     Returns:
-        List of changed file paths
+        Mapping of changed file path to its change record, in commit order
     """
     try:
-        github_client = Github(github_token)
-        repo = github_client.get_repo(repo_name)
-        commit = repo.get_commit(commit_sha)
+        files = fetch_changed_file_entries(repo_name, commit_sha, github_token, before_sha)
 
-        changed_files = []
-        excluded_patterns = ["node_modules/", ".github/", "package-lock.json", "yarn.lock"]
+        changed_files = {}
         
-        for file in commit.files:
-            if any(pattern in file.filename for pattern in excluded_patterns):
+        for file in files:
+            filename = file["filename"]
+            if is_excluded_path(filename):
                 continue
-            logger.info(f"Found changed file: {file.filename}")
-            changed_files.append(file.filename)
+            logger.info(f"Found changed file: {filename}")
+            blob_sha = None if file["status"] == "removed" else file["sha"]
+            # The API omits the patch of binary files (and of very large diffs,
+            # which still report line counts)
+            is_binary = is_binary_path(filename) or (
+                file["patch"] is None and not file["additions"] and not file["deletions"]
+                and file["status"] not in ("renamed", "removed")
+            )
+            changed_files[filename] = ChangedFile(
+                filename, file["patch"], blob_sha,
+                status=file["status"],
+                additions=file["additions"],
+                deletions=file["deletions"],
+                is_binary=is_binary
+            )
         return changed_files
     except Exception as error:
         logger.error(f"Error getting changed files from GitHub: {error}")
-        return []
+        return {}
+
+def is_excluded_path(file_path: str) -> bool:
+    """
+    Checks whether a changed file is excluded from review.
+    
+    Args:
+        file_path: Repository-relative path
+        
+    Returns:
+        True if the file must be skipped
+    """
+    return get_path_filter().is_excluded(file_path)
+
+_path_filter: Optional[PathFilter] = None
+
+def get_path_filter() -> PathFilter:
+    """
+    Returns the review path filter, compiling it on first use.
+    
+    Returns:
+        PathFilter built from the defaults, the environment and the
+        repository's ignore file at the reviewed commit
+    """
+    global _path_filter
+    if _path_filter is None:
+        exclude = DEFAULT_EXCLUDED_PATTERNS + REVIEW_EXCLUDE
+        if REVIEW_IGNORE_FILE:
+            ignore_file = read_repo_file(get_current_job().commit_sha, REVIEW_IGNORE_FILE)
+            if ignore_file is not None:
+                repo_patterns = parse_ignore_file(ignore_file.decode("utf-8", "replace"))
+                logger.info(f"Loaded {len(repo_patterns)} path rule(s) from {REVIEW_IGNORE_FILE}")
+                exclude += repo_patterns
+        _path_filter = PathFilter(exclude, REVIEW_INCLUDE)
+    return _path_filter
+
+def get_changed_files_from_git(commit_sha: str, repo_dir: str = ".",
+                               before_sha: Optional[str] = None) -> Dict[str, ChangedFile]:
+    """
+    Uses the local git repository to find all changed files in the specific commit.
+    
+    Args:
+        commit_sha: Commit SHA to analyze
+        repo_dir: Working tree or local mirror containing the commit
+        before_sha: Start of a push range; the net change before_sha..commit_sha is returned
+        
+    Returns:
+        Mapping of changed file path to its change record, in diff order
+    """
+    changed_files = {}
+    for change in git_changed_files(commit_sha, repo_dir, base_sha=before_sha):
+        if is_excluded_path(change.path):
+            continue
+        logger.info(f"Found changed file: {change.path}")
+        changed_files[change.path] = change
+    return changed_files
+
+def push_range_base(before_sha: Optional[str]) -> Optional[str]:
+    """
+    Returns the usable start of a push range.
+    
+    Args:
+        before_sha: Branch head before the push, as reported by GitHub
+        
+    Returns:
+        before_sha, or None for new branches (all-zero SHA) and missing values
+    """
+    if not before_sha or not before_sha.strip("0"):
+        return None
+    return before_sha
+
+def discover_changed_files(repo_name: str, commit_sha: str, github_token: str,
+                           before_sha: Optional[str] = None) -> Dict[str, ChangedFile]:
+    """
+    Finds the changed files of a commit or push range, preferring the local repository.
+    
+    With before_sha, the net change of the whole push is computed once, so
+    each file appears exactly once with its final content, however many
+    commits of the push touched it.
+    
+    Args:
+        repo_name: Full repository name (owner/repo)
+        commit_sha: Commit SHA to analyze (head of the push)
+        github_token: GitHub authentication token
+        before_sha: Branch head before the push, if known
+        
+    Returns:
+        Mapping of changed file path to its change record, in commit order
+    """
+    before_sha = push_range_base(before_sha)
+    if before_sha:
+        logger.info(f"Reviewing push range {before_sha[:7]}..{commit_sha[:7]}")
+    if CHANGED_FILES_SOURCE in ("auto", "git"):
+        try:
+            return get_changed_files_from_git(commit_sha, get_current_job().repo_dir, before_sha)
+        except GitDiscoveryError as error:
+            if CHANGED_FILES_SOURCE == "git":
+                logger.error(f"Error getting changed files from git: {error}")
+                return {}
+            logger.warning(f"{error}. Falling back to the GitHub API.")
+    return get_changed_files(repo_name, commit_sha, github_token, before_sha)
+
+_node_lint_worker: Optional[NodeLintWorker] = None
+_node_lint_worker_lock = threading.Lock()
+
+def get_node_lint_worker() -> NodeLintWorker:
+    """
+    Returns the process-wide Node lint worker client, creating it on first use.
+    
+    Returns:
+        Shared NodeLintWorker instance
+    """
+    global _node_lint_worker
+    with _node_lint_worker_lock:
+        if _node_lint_worker is None:
+            _node_lint_worker = NodeLintWorker()
+            atexit.register(_node_lint_worker.close)
+        return _node_lint_worker
+
+def _run_linter_batch(
+    tool_name: str,
+    title: str,
+    command: List[str],
+    file_paths: List[str],
+    timeout: int,
+    parse: Callable[[Any], List[Finding]],
+    json_output: bool = True,
+    worker_tool: Optional[str] = None,
+) -> Dict[str, LintReport]:
+    """
+    Runs one linter process over a group of files and parses its findings per file.
+    
+    Args:
+        tool_name: Display name used in log and error messages
+        title: Linter name shown above each file's findings
+        command: Linter command line (machine-readable output) without the file arguments
+        file_paths: Files to lint
+        timeout: Timeout in seconds for each process launch
+        parse: Turns the tool's output, or its parsed JSON document if json_output, into findings
+        json_output: Whether the command writes a JSON document
+        worker_tool: Tool name in the Node lint worker, if it can serve this linter
+        
+    Returns:
+        Mapping of file path to its lint report
+    """
+    results: Dict[str, LintReport] = {}
+
+    def failed(chunk: List[str], message: str) -> None:
+        results.update({file_path: LintReport(title, [], error=message) for file_path in chunk})
+
+    for start in range(0, len(file_paths), LINT_BATCH_SIZE):
+        chunk = file_paths[start:start + LINT_BATCH_SIZE]
+        if worker_tool and NODE_LINT_WORKER:
+            logger.info(f"Running {tool_name} on {len(chunk)} file(s) in Node lint worker")
+            try:
+                with get_profiler().span(f"lint_worker:{worker_tool}", SUBPROCESS, files=len(chunk)):
+                    document = get_node_lint_worker().lint(worker_tool, chunk, timeout=timeout + len(chunk))
+                for file_path, findings in group_findings(parse(document), chunk).items():
+                    results[file_path] = LintReport(title, findings)
+                continue
+            except LintWorkerError as error:
+                logger.warning(f"{error}. Falling back to the {tool_name} CLI.")
+
+        logger.info(f"Running {tool_name} on {len(chunk)} file(s)")
+        try:
+            with get_profiler().span(f"lint:{tool_name}", SUBPROCESS, files=len(chunk)):
+                result = subprocess.run(
+                    command + chunk,
+                    capture_output=True,
+                    text=True,
+                    timeout=timeout + len(chunk)
+                )
+        except subprocess.TimeoutExpired:
+            failed(chunk, f"Error: {tool_name} timed out.")
+            continue
+        except FileNotFoundError:
+            failed(chunk, f"Error: {tool_name} not installed.")
+            continue
+        except Exception as error:
+            failed(chunk, f"Error running {tool_name}: {error}")
+            continue
+
+        output = result.stdout
+        if json_output:
+            # Some formatters write their report to stderr
+            raw_document = result.stdout.strip() or result.stderr.strip()
+            if not raw_document and result.returncode == 0:
+                raw_document = "[]"
+            try:
+                output = json.loads(raw_document)
+            except ValueError:
+                logger.error(f"{tool_name} exited with {result.returncode}: {result.stderr.strip()[:500]}")
+                failed(chunk, f"Error: {tool_name} produced no readable report.")
+                continue
+        for file_path, findings in group_findings(parse(output), chunk).items():
+            results[file_path] = LintReport(title, findings)
+    return results
+
+# Linter command lines, without the file arguments
+FLAKE8_COMMAND = ["flake8", "--max-line-length=100", f"--format={FLAKE8_FORMAT}"]
+ESLINT_COMMAND = ["npx", "eslint", "--no-error-on-unmatched-pattern", "--format=json"]
+STYLELINT_COMMAND = ["npx", "stylelint", "--allow-empty-input", "--formatter=json"]
+HTML_VALIDATE_COMMAND = ["npx", "html-validate", "--formatter=json"]
+
+def run_flake8_batch(file_paths: List[str]) -> Dict[str, LintReport]:
+    """
+    Runs flake8 once over a group of Python files.
+    
+    Args:
+        file_paths: Paths to the Python files
+        
+    Returns:
+        Mapping of file path to its lint report
+    """
+    return _run_linter_batch(
+        "Flake8", "Flake8 (Python)",
+        FLAKE8_COMMAND,
+        file_paths, timeout=30, parse=flake8_findings, json_output=False
+    )
+
+def run_eslint_batch(file_paths: List[str]) -> Dict[str, LintReport]:
+    """
+    Runs ESLint once over a group of JavaScript/TypeScript files.
+    
+    Args:
+        file_paths: Paths to the JS/TS files
+        
+    Returns:
+        Mapping of file path to its lint report
+    """
+    return _run_linter_batch(
+        "ESLint", "ESLint (JS/TS/React)",
+        ESLINT_COMMAND,
+        file_paths, timeout=60, parse=eslint_findings, worker_tool="eslint"
+    )
+
+def run_stylelint_batch(file_paths: List[str]) -> Dict[str, LintReport]:
+    """
+    Runs Stylelint once over a group of CSS/SCSS files.
+    
+    Args:
+        file_paths: Paths to the CSS/SCSS files
+        
+    Returns:
+        Mapping of file path to its lint report
+    """
+    return _run_linter_batch(
+        "Stylelint", "Stylelint (CSS/SCSS)",
+        STYLELINT_COMMAND,
+        file_paths, timeout=60, parse=stylelint_findings, worker_tool="stylelint"
+    )
+
+def run_html_validate_batch(file_paths: List[str]) -> Dict[str, LintReport]:
+    """
+    Runs html-validate once over a group of HTML files.
+    
+    Args:
+        file_paths: Paths to the HTML files
+        
+    Returns:
+        Mapping of file path to its lint report
+    """
+    return _run_linter_batch(
+        "html-validate", "html-validate (HTML)",
+        HTML_VALIDATE_COMMAND,
+        file_paths, timeout=60, parse=eslint_findings, worker_tool="html-validate"
+    )
 
 def run_flake8(file_path: str) -> str:
     """
@@ -85,21 +623,7 @@ def run_flake8(file_path: str) -> str:
     """
     if not file_path.endswith(".py"):
         return "Error: run_flake8 can only be used on .py files."
-    logger.info(f"Running flake8 on {file_path}")
-    try:
-        result = subprocess.run(
-            ["flake8", file_path, "--max-line-length=100"], 
-            capture_output=True, 
-            text=True, 
-            timeout=30
-        )
-        return f"Flake8 (Python) findings:\n{result.stdout or 'No issues found.'}"
-    except subprocess.TimeoutExpired:
-        return "Error: Flake8 timed out."
-    except FileNotFoundError:
-        return "Error: Flake8 not installed."
-    except Exception as error:
-        return f"Error running flake8: {error}"
+    return run_flake8_batch([file_path])[file_path].format()
 
 def run_eslint(file_path: str) -> str:
     """
@@ -113,19 +637,7 @@ def run_eslint(file_path: str) -> str:
     """
     if not file_path.endswith((".js", ".jsx", ".ts", ".tsx")):
         return "Error: run_eslint is for .js, .jsx, .ts, or .tsx files."
-    logger.info(f"Running ESLint on {file_path}")
-    try:
-        result = subprocess.run(
-            ["npx", "eslint", file_path, "--no-error-on-unmatched-pattern", "--format=compact"], 
-            capture_output=True, 
-            text=True, 
-            timeout=60
-        )
-        return f"ESLint (JS/TS/React) findings:\n{result.stdout or 'No issues found.'}"
-    except subprocess.TimeoutExpired:
-        return "Error: ESLint timed out."
-    except Exception as error:
-        return f"Error running eslint: {error}"
+    return run_eslint_batch([file_path])[file_path].format()
 
 def run_stylelint(file_path: str) -> str:
     """
@@ -139,19 +651,7 @@ def run_stylelint(file_path: str) -> str:
     """
     if not file_path.endswith((".css", ".scss")):
         return "Error: run_stylelint is for .css or .scss files."
-    logger.info(f"Running Stylelint on {file_path}")
-    try:
-        result = subprocess.run(
-            ["npx", "stylelint", file_path, "--allow-empty-input"], 
-            capture_output=True, 
-            text=True, 
-            timeout=60
-        )
-        return f"Stylelint (CSS/SCSS) findings:\n{result.stdout or 'No issues found.'}"
-    except subprocess.TimeoutExpired:
-        return "Error: Stylelint timed out."
-    except Exception as error:
-        return f"Error running stylelint: {error}"
+    return run_stylelint_batch([file_path])[file_path].format()
 
 def run_html_validate(file_path: str) -> str:
     """
@@ -165,40 +665,206 @@ def run_html_validate(file_path: str) -> str:
     """
     if not file_path.endswith(".html"):
         return "Error: run_html_validate is for .html files."
-    logger.info(f"Running html-validate on {file_path}")
-    try:
-        result = subprocess.run(
-            ["npx", "html-validate", file_path], 
-            capture_output=True, 
-            text=True, 
-            timeout=60
-        )
-        return f"html-validate (HTML) findings:\n{result.stdout or 'No issues found.'}"
-    except subprocess.TimeoutExpired:
-        return "Error: HTML validation timed out."
-    except Exception as error:
-        return f"Error running html-validate: {error}"
+    return run_html_validate_batch([file_path])[file_path].format()
+
+# Single-file runner -> batch runner, used to group changed files per linter process.
+BATCH_LINTERS: Dict[Callable[[str], str], Callable[[List[str]], Dict[str, LintReport]]] = {
+    run_flake8: run_flake8_batch,
+    run_eslint: run_eslint_batch,
+    run_stylelint: run_stylelint_batch,
+    run_html_validate: run_html_validate_batch,
+}
+
+# Batch runner -> (version package, config files, command) identifying its results in the lint cache
+LINTER_CACHE_IDENTITY: Dict[Callable[[List[str]], Dict[str, LintReport]], Tuple[str, List[str], List[str]]] = {
+    run_flake8_batch: ("flake8", ["setup.cfg", "tox.ini", ".flake8"], FLAKE8_COMMAND),
+    run_eslint_batch: ("eslint", [".eslintrc.json", "package.json"], ESLINT_COMMAND),
+    run_stylelint_batch: ("stylelint", [".stylelintrc.json", "package.json"], STYLELINT_COMMAND),
+    run_html_validate_batch: ("html-validate", [".htmlvalidaterc.json", "package.json"], HTML_VALIDATE_COMMAND),
+}
+
+_lint_cache: Optional[LintCache] = None
+_lint_cache_lock = threading.Lock()
+
+def get_lint_cache() -> Optional[LintCache]:
+    """
+    Returns the process-wide linter result cache.
+    
+    Returns:
+        Shared LintCache, or None when LINT_CACHE_DIR is empty
+    """
+    global _lint_cache
+    if not LINT_CACHE_DIR:
+        return None
+    with _lint_cache_lock:
+        if _lint_cache is None:
+            _lint_cache = LintCache(LINT_CACHE_DIR, LINT_CACHE_MAX_MB * 1024 * 1024)
+        return _lint_cache
 
-def create_pdf(report_content: str, filename: str = "report.pdf") -> None:
+def _lint_cache_keys(
+    batch_linter: Callable[[List[str]], Dict[str, LintReport]],
+    file_paths: List[str],
+    file_contents: Dict[str, str],
+    key_paths: Dict[str, str],
+) -> Dict[str, str]:
     """
-    Creates a PDF report from the generated text.
+    Computes lint cache keys for files handled by one batch runner.
     
     Args:
-        report_content: Report text content
-        filename: Output PDF filename
+        batch_linter: Batch runner the files are grouped under
+        file_paths: Files in the group
+        file_contents: Already-read file contents; other files are read from disk
+        key_paths: Path each file is cached under, where it differs from the file path
+        
+    Returns:
+        Mapping of file path to cache key (files that cannot be read are left out)
     """
-    logger.info(f"Creating PDF report: {filename}")
-    try:
-        pdf = FPDF()
-        pdf.add_page()
-        pdf.set_font("Arial", size=10)
-        # Handle unicode characters better
-        safe_content = report_content.encode('latin-1', 'replace').decode('latin-1')
-        pdf.multi_cell(0, 5, safe_content)
-        pdf.output(filename)
-        logger.info("PDF report created successfully")
-    except Exception as error:
-        logger.error(f"Error creating PDF: {error}")
+    package, config_files, command = LINTER_CACHE_IDENTITY[batch_linter]
+    version = tool_version(package)
+    config_hash = config_fingerprint(config_files, extra=" ".join(command))
+    keys = {}
+    for file_path in file_paths:
+        if file_path in file_contents:
+            content = file_contents[file_path].encode("utf-8")
+        else:
+            try:
+                with open(file_path, "rb") as file:
+                    content = file.read()
+            except OSError:
+                continue
+        key_path = key_paths.get(file_path, file_path)
+        keys[file_path] = LintCache.make_key(key_path, content, package, version, config_hash)
+    return keys
+
+# Extension -> (language, linter). Drives both linter dispatch and the report's language labels.
+LINTER_REGISTRY: Dict[str, Tuple[str, Callable[[str], str]]] = {
+    ".py": ("Python", run_flake8),
+    ".js": ("JavaScript", run_eslint),
+    ".jsx": ("React (JSX)", run_eslint),
+    ".ts": ("TypeScript", run_eslint),
+    ".tsx": ("React (TSX)", run_eslint),
+    ".css": ("CSS", run_stylelint),
+    ".scss": ("SCSS", run_stylelint),
+    ".html": ("HTML", run_html_validate),
+}
+
+LANGUAGE_MAP = {extension: language for extension, (language, _) in LINTER_REGISTRY.items()}
+
+# Unregistered extensions and shebang interpreters one of the registered linters understands,
+# passed to the LLM fallback as a language hint
+LANGUAGE_HINTS = {
+    ".pyi": "Python", ".pyw": "Python", ".mjs": "JavaScript", ".cjs": "JavaScript",
+    ".mts": "TypeScript", ".cts": "TypeScript", ".htm": "HTML", ".xhtml": "HTML",
+}
+SHEBANG_HINTS = {"python": "Python", "python3": "Python", "node": "JavaScript", "deno": "TypeScript"}
+
+def detect_language_hint(file_path: str, content: str) -> Optional[str]:
+    """
+    Guesses which registered language a file without a registered extension is written in.
+    
+    Args:
+        file_path: Path of the file
+        content: File content
+        
+    Returns:
+        Language label from LINTER_REGISTRY, or None if no registered linter applies
+    """
+    hint = LANGUAGE_HINTS.get(os.path.splitext(file_path)[1].lower())
+    if hint is not None:
+        return hint
+    first_line = content.split("\n", 1)[0]
+    if first_line.startswith("#!"):
+        # "#!/usr/bin/python3", "#!/usr/bin/env node" or "#!/usr/bin/env -S deno run"
+        words = [os.path.basename(word) for word in first_line[2:].split() if not word.startswith("-")]
+        if words and words[0] == "env":
+            words = words[1:]
+        return SHEBANG_HINTS.get(words[0]) if words else None
+    if content.lstrip()[:15].lower().startswith(("<!doctype html", "<html")):
+        return "HTML"
+    return None
+
+def run_linter(file_path: str) -> Optional[str]:
+    """
+    Runs the registered linter for a file based on its extension.
+    
+    Args:
+        file_path: Path to the file to lint
+        
+    Returns:
+        Linting results as string, or None if no linter is registered
+    """
+    file_extension = os.path.splitext(file_path)[1]
+    entry = LINTER_REGISTRY.get(file_extension)
+    if entry is None:
+        return None
+    _, linter = entry
+    return linter(file_path)
+
+def run_linters_batched(
+    file_paths: List[str],
+    executor: Optional[ThreadPoolExecutor] = None,
+    file_contents: Optional[Dict[str, str]] = None,
+    key_paths: Optional[Dict[str, str]] = None,
+) -> Dict[str, Optional[LintReport]]:
+    """
+    Groups files by linter and runs each linter once over its whole group.
+    
+    Files whose result is already in the lint cache are not linted again.
+    
+    Args:
+        file_paths: Paths of the files to lint
+        executor: Pool used to run the linter groups concurrently; serial if None
+        file_contents: Already-read file contents, used for the cache keys
+        key_paths: Repository path of each staged file, so its cache key does not depend on the staging directory
+        
+    Returns:
+        Mapping of file path to its lint report, None where no linter is registered
+    """
+    results: Dict[str, Optional[LintReport]] = {}
+    groups: Dict[Callable[[List[str]], Dict[str, LintReport]], List[str]] = {}
+    for file_path in file_paths:
+        entry = LINTER_REGISTRY.get(os.path.splitext(file_path)[1])
+        if entry is None:
+            results[file_path] = None
+            continue
+        groups.setdefault(BATCH_LINTERS[entry[1]], []).append(file_path)
+
+    lint_cache = get_lint_cache()
+    cache_keys: Dict[str, str] = {}
+    if lint_cache is not None:
+        for batch_linter, group in groups.items():
+            cache_keys.update(_lint_cache_keys(batch_linter, group, file_contents or {}, key_paths or {}))
+        for batch_linter, group in groups.items():
+            misses = []
+            for file_path in group:
+                cached = lint_cache.get(cache_keys[file_path]) if file_path in cache_keys else None
+                try:
+                    results[file_path] = LintReport.from_json(cached)
+                except (TypeError, ValueError):  # miss, or an entry from an older format
+                    misses.append(file_path)
+            groups[batch_linter] = misses
+        logger.info(f"Lint cache: {lint_cache.hits} hit(s), {lint_cache.misses} miss(es)")
+
+    batches = [
+        (batch_linter, group[start:start + LINT_BATCH_SIZE])
+        for batch_linter, group in groups.items()
+        for start in range(0, len(group), LINT_BATCH_SIZE)
+    ]
+    if executor is None:
+        batch_results = [batch_linter(batch) for batch_linter, batch in batches]
+    else:
+        futures = [executor.submit(batch_linter, batch) for batch_linter, batch in batches]
+        batch_results = [future.result() for future in futures]
+
+    for batch_result in batch_results:
+        results.update(batch_result)
+        if lint_cache is None:
+            continue
+        for file_path, linter_report in batch_result.items():
+            # Tool failures (timeouts, missing binaries) must not be replayed from cache
+            if file_path in cache_keys and linter_report.error is None:
+                lint_cache.put(cache_keys[file_path], linter_report.to_json())
+    return results
 
 def send_email(to_email: str, subject: str, body: str, attachment_path: str) -> None:
     """
@@ -213,6 +879,11 @@ def send_email(to_email: str, subject: str, body: str, attachment_path: str) ->
     if not GMAIL_USER or not GMAIL_APP_PASSWORD:
         logger.warning("Gmail credentials not found. Skipping email.")
         return
+    import smtplib
+    from email import encoders
+    from email.mime.base import MIMEBase
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
     
     logger.info(f"Preparing to send email to {to_email}")
     msg = MIMEMultipart()
@@ -254,64 +925,351 @@ def validate_environment() -> bool:
     """
     required_vars = {
         "OPENAI_API_KEY": OPENAI_API_KEY,
-        "GITHUB_TOKEN": GITHUB_TOKEN,
-        "GITHUB_REPOSITORY": REPO_NAME,
         "GITHUB_SHA": COMMIT_SHA,
         "GITHUB_ACTOR": GITHUB_ACTOR
     }
+    # Local git discovery works without GitHub credentials
+    if CHANGED_FILES_SOURCE == "api":
+        required_vars["GITHUB_TOKEN"] = GITHUB_TOKEN
+        required_vars["GITHUB_REPOSITORY"] = REPO_NAME
     
     missing_vars = [var for var, value in required_vars.items() if not value]
     
     if missing_vars:
         logger.error(f"Missing environment variables: {', '.join(missing_vars)}")
         return False
+    if CASSETTE_MODE not in ("off", CASSETTE_RECORD, CASSETTE_REPLAY):
+        logger.error(f"Unknown REVIEW_CASSETTE_MODE '{CASSETTE_MODE}'")
+        return False
+    if CASSETTE_MODE == CASSETTE_REPLAY and not os.path.isfile(CASSETTE_PATH):
+        logger.error(f"Cassette to replay not found: {CASSETTE_PATH}")
+        return False
     return True
 
-# === 3. MAIN EXECUTION ===
-def main():
-    """Main execution function."""
-    if not validate_environment():
-        sys.exit(1)
+CODE_CHECKER_SYSTEM_MESSAGE = """You are a code linter dispatcher. Use the detected language (or else the file extension) and call the appropriate tool:
+- Python → run_flake8(file_path)
+- JavaScript, TypeScript, React → run_eslint(file_path)
+- CSS, SCSS → run_stylelint(file_path)
+- HTML → run_html_validate(file_path)
+
+For other languages, respond: "No linter available for this file type."
+Call exactly ONE tool based on the language."""
+
+CODE_REVIEWER_SYSTEM_MESSAGE = f"""You are a code reviewer. Provide concise feedback in two sections:
+1. **Optimization Suggestions**: Performance, memory, and readability improvements.
+2. **Coding Standards**: Check against these standards:
+{YOUR_CODE_STANDARD_PROMPT}
+
+State the language first. Be brief and specific. Skip style issues covered by linters."""
 
+def build_config_list() -> List[Dict]:
+    """
+    Builds the AutoGen model configuration list.
+    
+    Returns:
+        List of model configuration entries
+    """
     # Optimized config for free tier models
-    config_list = [
+    return [
         {
             # Using a reliable free model from OpenRouter
-            "model": "x-ai/grok-code-fast-1",
+            "model": LLM_MODEL,
             "api_key": OPENAI_API_KEY,
-            "base_url": "https://openrouter.ai/api/v1",
+            "base_url": OPENAI_BASE_URL,
             # Rate limiting configuration
             "timeout": 120,
-            "max_retries": 2
+            "max_retries": 2,
+            "rate_limit": {
+                "requests_per_minute": LLM_REQUESTS_PER_MINUTE,
+                "tokens_per_minute": LLM_TOKENS_PER_MINUTE,
+            },
+            # Prompt budgeting configuration
+            "prompt_token_budget": REVIEW_TOKEN_BUDGET,
+            "context_window": 256000,
         }
     ]
 
-    # Define AutoGen Agents with optimized prompts
-    code_checker = AssistantAgent(
-        name="Code_Checker",
-        system_message="""You are a code linter dispatcher. Analyze the file extension and call the appropriate tool:
-- `.py` → run_flake8(file_path)
-- `.js`, `.jsx`, `.ts`, `.tsx` → run_eslint(file_path)
-- `.css`, `.scss` → run_stylelint(file_path)
-- `.html` → run_html_validate(file_path)
-
-For unsupported file types, respond: "No linter available for this file type."
-Call exactly ONE tool based on the file extension.""",
-        llm_config={
-            "config_list": config_list,
-            "cache_seed": None  # Disable caching for free tier
-        },
-    )
+# Config entry keys consumed by the reviewer itself and never passed to AutoGen
+LOCAL_CONFIG_KEYS = ("rate_limit", "prompt_token_budget", "context_window")
 
-    code_reviewer = AssistantAgent(
-        name="Code_Reviewer",
-        system_message=f"""You are a code reviewer. Provide concise feedback in two sections:
-1. **Optimization Suggestions**: Performance, memory, and readability improvements.
-2. **Coding Standards**: Check against these standards:
-{YOUR_CODE_STANDARD_PROMPT}
+_model_configs: Dict[str, Dict] = {}
 
-State the language first. Be brief and specific. Skip style issues covered by linters.""",
-        llm_config={
+def get_model_config(config_list: List[Dict]) -> Dict:
+    """
+    Returns the full config entry (including reviewer-only keys) of the primary model.
+    
+    Args:
+        config_list: AutoGen config list from build_llm_config_list()
+        
+    Returns:
+        Config entry as returned by build_config_list()
+    """
+    return _model_configs.get(config_list[0].get("model", ""), config_list[0])
+
+def get_model_name(config_list: List[Dict]) -> str:
+    """
+    Returns the primary model name of a config list.
+    
+    Args:
+        config_list: AutoGen model configuration list
+        
+    Returns:
+        Model name
+    """
+    return config_list[0].get("model", "")
+
+# API requests and rate-limiter wait of the calling thread, read per chat by run_llm_chat
+_llm_requests = threading.local()
+
+def _request_token_estimate(body: bytes, model: str) -> int:
+    """
+    Estimates the tokens one chat completions request will use.
+    
+    Args:
+        body: JSON request body
+        model: Model name
+        
+    Returns:
+        Prompt tokens of the messages plus the expected completion
+    """
+    try:
+        payload = json.loads(body or b"{}")
+    except ValueError:
+        return COMPLETION_TOKEN_ESTIMATE
+    messages = payload.get("messages") if isinstance(payload, dict) else None
+    prompt = "".join(
+        message["content"] for message in messages or []
+        if isinstance(message, dict) and isinstance(message.get("content"), str)
+    )
+    return count_tokens(prompt, model) + (payload.get("max_tokens") or COMPLETION_TOKEN_ESTIMATE)
+
+def _response_token_usage(response: "httpx.Response") -> int:
+    """
+    Reads the total tokens a chat completions response reports.
+    
+    Args:
+        response: API response, not yet read
+        
+    Returns:
+        Prompt + completion tokens, or 0 if the response has no usage
+    """
+    if response.status_code != 200 or "json" not in response.headers.get("content-type", ""):
+        return 0
+    try:
+        usage = json.loads(response.read()).get("usage") or {}
+        return int(usage.get("total_tokens") or 0)
+    except (ValueError, AttributeError, TypeError):
+        return 0
+
+def build_llm_config_list(config_list: List[Dict]) -> List[Dict]:
+    """
+    Prepares config_list entries for AutoGen and wires up their rate limiters.
+    
+    The LOCAL_CONFIG_KEYS settings are consumed here (AutoGen would forward
+    unknown keys to the API), and each entry gets an HTTP client whose hooks
+    reserve every API request with the model's limiter, settle it against the
+    reported usage and feed provider rate-limit headers back into it. A chat
+    can make several requests (e.g. the reviewer answering the proxy's
+    auto-reply), so reserving per chat would undercount them.
+    
+    Args:
+        config_list: Model configuration list from build_config_list()
+        
+    Returns:
+        Config list safe to pass to AutoGen agents
+    """
+    from llm_http import CassetteTransport, SharedHTTPClient
+
+    llm_config_list = []
+    for config_entry in config_list:
+        limiter = get_rate_limiter(config_entry)
+
+        model = config_entry.get("model", "")
+
+        def reserve_request(request: "httpx.Request", limiter=limiter, model=model) -> None:
+            tokens = _request_token_estimate(request.content, model)
+            waited = limiter.acquire(tokens, requests=1)
+            request.extensions["reserved_tokens"] = tokens
+            _llm_requests.count = getattr(_llm_requests, "count", 0) + 1
+            _llm_requests.waited = getattr(_llm_requests, "waited", 0.0) + waited
+
+        def observe_response(response: "httpx.Response", limiter=limiter) -> None:
+            reserved_tokens = response.request.extensions.get("reserved_tokens")
+            if reserved_tokens is not None and limiter.tokens_per_minute:
+                limiter.record_usage(reserved_tokens, _response_token_usage(response) or reserved_tokens)
+            limiter.observe_headers(response.headers, response.status_code)
+
+        _model_configs[config_entry.get("model", "")] = config_entry
+        llm_entry = {key: value for key, value in config_entry.items() if key not in LOCAL_CONFIG_KEYS}
+        cassette = get_cassette()
+        llm_entry["http_client"] = SharedHTTPClient(
+            event_hooks={"request": [reserve_request], "response": [observe_response]},
+            transport=CassetteTransport(cassette) if cassette is not None else None
+        )
+        llm_config_list.append(llm_entry)
+    return llm_config_list
+
+_llm_config_list: Optional[List[Dict]] = None
+_llm_config_list_lock = threading.Lock()
+
+def get_llm_config_list() -> List[Dict]:
+    """
+    Returns the process-wide AutoGen config list, building it on first use.
+    
+    Returns:
+        Config list from build_llm_config_list(); its HTTP clients and rate
+        limiters are shared by every review of the process
+    """
+    global _llm_config_list
+    with _llm_config_list_lock:
+        if _llm_config_list is None:
+            _llm_config_list = build_llm_config_list(build_config_list())
+        return _llm_config_list
+
+def review_token_budget(config_list: List[Dict]) -> int:
+    """
+    Returns the token budget for the code part of a review prompt.
+    
+    Args:
+        config_list: AutoGen model configuration list
+        
+    Returns:
+        Token budget for the primary model
+    """
+    return prompt_token_budget(
+        get_model_config(config_list), CODE_REVIEWER_SYSTEM_MESSAGE,
+        REVIEW_TOKEN_BUDGET, COMPLETION_TOKEN_ESTIMATE
+    )
+
+def _chat_token_usage(chat_result) -> Tuple[int, int]:
+    """
+    Extracts the tokens used by a chat from AutoGen's cost summary.
+    
+    Args:
+        chat_result: Value returned by initiate_chat
+        
+    Returns:
+        Tuple of (prompt tokens, completion tokens), zeros if AutoGen did not report usage
+    """
+    cost = getattr(chat_result, "cost", None)
+    if not isinstance(cost, dict):
+        return 0, 0
+    usage = cost.get("usage_including_cached_inference") or {}
+    model_usages = [model_usage for model_usage in usage.values() if isinstance(model_usage, dict)]
+    return (
+        sum(model_usage.get("prompt_tokens", 0) for model_usage in model_usages),
+        sum(model_usage.get("completion_tokens", 0) for model_usage in model_usages),
+    )
+
+_review_cache: Optional[ReviewCache] = None
+_review_cache_lock = threading.Lock()
+
+def get_review_cache() -> Optional[ReviewCache]:
+    """
+    Returns the process-wide LLM review cache.
+    
+    Returns:
+        Shared ReviewCache, or None when REVIEW_CACHE_PATH is empty
+    """
+    global _review_cache
+    if not REVIEW_CACHE_PATH:
+        return None
+    with _review_cache_lock:
+        if _review_cache is None:
+            _review_cache = ReviewCache(
+                REVIEW_CACHE_PATH,
+                ttl_seconds=REVIEW_CACHE_TTL_DAYS * 24 * 3600,
+                max_entries=REVIEW_CACHE_MAX_ENTRIES
+            )
+        return _review_cache
+
+def run_llm_chat(user_proxy: "UserProxyAgent", agent: "AssistantAgent", message: str,
+                 config_list: List[Dict], use_cache: bool = False,
+                 usage: Optional[Dict[str, int]] = None) -> str:
+    """
+    Runs one AutoGen chat under the shared per-model rate limiter.
+    
+    Every LLM call in the reviewer goes through here. The limiter itself is
+    applied per API request by the HTTP client hooks of build_llm_config_list().
+    
+    Args:
+        user_proxy: Proxy agent that starts the chat
+        agent: Assistant agent to talk to
+        message: Task message
+        config_list: AutoGen config list the agent was built with
+        use_cache: Serve and store the answer in the review cache
+        usage: Counter dict that receives "prompt_tokens" and "completion_tokens"
+        
+    Returns:
+        Content of the agent's last message
+    """
+    model = get_model_name(config_list)
+    review_cache = get_review_cache() if use_cache else None
+    cache_key = None
+    if review_cache is not None:
+        cache_key = ReviewCache.make_key(message, agent.system_message, model)
+        cached = review_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    _llm_requests.count = 0
+    _llm_requests.waited = 0.0
+    # The agents are reused per worker thread and AutoGen reports their
+    # cumulative usage; start from zero so the cost covers this chat only
+    for chat_agent in (user_proxy, agent):
+        if getattr(chat_agent, "client", None) is not None:
+            chat_agent.client.clear_usage_summary()
+    chat_start = time.perf_counter()
+    chat_result = user_proxy.initiate_chat(agent, message=message, clear_history=True)
+    queued = _llm_requests.waited
+    latency = time.perf_counter() - chat_start - queued
+    content = user_proxy.last_message(agent)["content"]
+
+    prompt_tokens, completion_tokens = _chat_token_usage(chat_result)
+    if not prompt_tokens:
+        # Provider did not report usage; fall back to local counts
+        prompt_tokens = count_tokens(agent.system_message + message, model)
+        completion_tokens = count_tokens(content or "", model)
+    used_tokens = prompt_tokens + completion_tokens
+    get_profiler().record_llm_call(
+        model, latency, prompt_tokens, completion_tokens, queued=queued, requests=_llm_requests.count
+    )
+    if usage is not None:
+        usage["prompt_tokens"] = usage.get("prompt_tokens", 0) + prompt_tokens
+        usage["completion_tokens"] = usage.get("completion_tokens", 0) + completion_tokens
+
+    if review_cache is not None and content:
+        review_cache.put(cache_key, content, used_tokens)
+    return content
+
+def build_agents(config_list: List[Dict]) -> Tuple[Optional["AssistantAgent"], "AssistantAgent", "UserProxyAgent"]:
+    """
+    Creates the AutoGen agents used for one review worker.
+    
+    Args:
+        config_list: AutoGen model configuration list
+        
+    Returns:
+        Tuple of (code_checker or None, code_reviewer, user_proxy)
+    """
+    from autogen import AssistantAgent, UserProxyAgent
+
+    # The Code_Checker is only an opt-in fallback for file types missing from LINTER_REGISTRY.
+    code_checker = None
+    if LLM_LINT_FALLBACK:
+        code_checker = AssistantAgent(
+            name="Code_Checker",
+            system_message=CODE_CHECKER_SYSTEM_MESSAGE,
+            llm_config={
+                "config_list": config_list,
+                "cache_seed": None  # Disable caching for free tier
+            },
+        )
+
+    code_reviewer = AssistantAgent(
+        name="Code_Reviewer",
+        system_message=CODE_REVIEWER_SYSTEM_MESSAGE,
+        llm_config={
             "config_list": config_list,
             "cache_seed": None
         },
@@ -333,95 +1291,765 @@ State the language first. Be brief and specific. Skip style issues covered by li
             "run_html_validate": run_html_validate,
         }
     )
+    return code_checker, code_reviewer, user_proxy
 
-    # Run the Review
-    logger.info("Starting Multi-Language AutoGen Code Review...")
-    changed_files = get_changed_files(REPO_NAME, COMMIT_SHA, GITHUB_TOKEN)
+_thread_state = threading.local()
 
-    if not changed_files:
-        logger.info("No files changed in this push. Exiting.")
-        sys.exit(0)
+def get_thread_agents(config_list: List[Dict]) -> Tuple[Optional["AssistantAgent"], "AssistantAgent", "UserProxyAgent"]:
+    """
+    Returns the agents owned by the calling worker thread.
+    
+    AutoGen agents keep chat history, so they cannot be shared between threads.
+    
+    Args:
+        config_list: AutoGen model configuration list
+        
+    Returns:
+        Tuple of (code_checker or None, code_reviewer, user_proxy)
+    """
+    agents = getattr(_thread_state, "agents", None)
+    if agents is None:
+        agents = build_agents(config_list)
+        _thread_state.agents = agents
+    return agents
 
-    full_report_text = f"AutoGen Code Review for commit {COMMIT_SHA[:7]}\nTriggered by: {GITHUB_ACTOR}\n\n"
-    language_map = {
-        ".py": "Python", ".js": "JavaScript", ".jsx": "React (JSX)",
-        ".ts": "TypeScript", ".tsx": "React (TSX)", ".css": "CSS",
-        ".scss": "SCSS", ".html": "HTML",
-    }
+_blob_reader: Optional[GitBlobReader] = None
+_blob_reader_lock = threading.Lock()
 
-    # Process files with rate limiting awareness
-    processed_count = 0
-    for file_path in changed_files:
-        logger.info(f"Analyzing file: {file_path}")
-        full_report_text += f"--- Report for {file_path} ---\n\n"
+def get_blob_reader() -> GitBlobReader:
+    """
+    Returns the process-wide git blob reader, creating it on first use.
+    
+    Returns:
+        Shared GitBlobReader for the current job's repository
+    """
+    global _blob_reader
+    repo_dir = get_current_job().repo_dir
+    with _blob_reader_lock:
+        if _blob_reader is not None and _blob_reader.repo_dir != repo_dir:
+            _blob_reader.close()
+            _blob_reader = None
+        if _blob_reader is None:
+            _blob_reader = GitBlobReader(repo_dir)
+            atexit.register(_blob_reader.close)
+        return _blob_reader
 
-        file_extension = os.path.splitext(file_path)[1]
-        language = language_map.get(file_extension, f"Unknown ({file_extension})")
+def read_repo_file(commit_sha: str, file_path: str) -> Optional[bytes]:
+    """
+    Reads a repository configuration file as of the reviewed commit.
+    
+    Args:
+        commit_sha: Reviewed commit
+        file_path: Repository-relative path
+        
+    Returns:
+        File content, or None if the file does not exist
+    """
+    if commit_sha and CONTENT_SOURCE != "worktree":
+        try:
+            data, size = get_blob_reader().read(f"{commit_sha}:{file_path}", max_size=MAX_FILE_SIZE)
+            if size >= 0:
+                return data
+        except BlobReadError as error:
+            logger.warning(f"{error}. Reading {file_path} from the working tree.")
+    try:
+        with open(os.path.join(get_current_job().repo_dir, file_path), "rb") as file:
+            return file.read(MAX_FILE_SIZE)
+    except OSError:
+        return None
+
+def load_generated_detector(commit_sha: str) -> GeneratedFileDetector:
+    """
+    Builds the generated-code detector from the commit's root .gitattributes.
+    
+    Args:
+        commit_sha: Reviewed commit
+        
+    Returns:
+        Detector honouring linguist-generated/linguist-vendored attributes
+    """
+    gitattributes = read_repo_file(commit_sha, ".gitattributes") or b""
+    return GeneratedFileDetector(gitattributes.decode("utf-8", "replace"))
+
+def _decode_file_content(file_path: str, data: bytes) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Decodes file bytes and applies the binary and empty-file rules.
+    
+    Args:
+        file_path: Path of the changed file
+        data: Raw content
+        
+    Returns:
+        Tuple of (content, skip note); exactly one of them is None
+    """
+    if b"\0" in data[:8192]:
+        logger.info(f"File {file_path} looks binary. Skipping analysis.")
+        return None, "Binary file. Skipped."
+    try:
+        code_content = data.decode("utf-8")
+    except UnicodeDecodeError as error:
+        logger.error(f"Could not read file {file_path}: {error}")
+        return None, "Error: Could not read file."
+    if not code_content.strip():
+        logger.info(f"File {file_path} is empty. Skipping analysis.")
+        return None, "File is empty. Skipped."
+    return code_content, None
+
+def read_changed_file(file_path: str, blob_sha: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Reads a changed file from the git object database or the working tree.
+    
+    Args:
+        file_path: Path of the changed file
+        blob_sha: Blob SHA of the file's final content, if known
+        
+    Returns:
+        Tuple of (content, skip note); exactly one of them is None
+    """
+    with get_profiler().span("read_file", "file", path=file_path):
+        if blob_sha and CONTENT_SOURCE != "worktree":
+            try:
+                data, size = get_blob_reader().read(blob_sha, max_size=MAX_FILE_SIZE)
+                if size > MAX_FILE_SIZE:
+                    logger.warning(f"File {file_path} exceeds size limit. Skipping.")
+                    return None, "File too large. Skipped."
+                if data is not None:
+                    return _decode_file_content(file_path, data)
+                logger.warning(f"Blob {blob_sha[:7]} for {file_path} not found. Reading the working tree.")
+            except BlobReadError as error:
+                logger.warning(f"{error}. Reading {file_path} from the working tree.")
 
         # Check file size
         try:
             if os.path.getsize(file_path) > MAX_FILE_SIZE:
                 logger.warning(f"File {file_path} exceeds size limit. Skipping.")
-                full_report_text += "File too large. Skipped.\n\n"
-                continue
+                return None, "File too large. Skipped."
         except OSError:
             pass
 
         # Read file content
         try:
-            with open(file_path, "r", encoding="utf-8") as file:
-                code_content = file.read()
-            if not code_content.strip():
-                logger.info("File is empty. Skipping analysis.")
-                full_report_text += "File is empty. Skipped.\n\n"
-                continue
+            with open(file_path, "rb") as file:
+                data = file.read()
         except Exception as error:
             logger.error(f"Could not read file {file_path}: {error}")
-            full_report_text += f"Error: Could not read file.\n\n"
+            return None, "Error: Could not read file."
+        return _decode_file_content(file_path, data)
+
+def worktree_matches_commit(commit_sha: str) -> bool:
+    """
+    Checks whether the current directory is a checkout of the reviewed commit.
+    
+    Args:
+        commit_sha: Reviewed commit
+        
+    Returns:
+        True if checked-out files can be linted in place
+    """
+    try:
+        head = run_git(["rev-parse", "HEAD"]).strip()
+        return head == run_git(["rev-parse", f"{commit_sha}^{{commit}}"]).strip()
+    except GitDiscoveryError:
+        # Not a git checkout (API-only runs): the files on disk are all there is
+        return True
+
+def stage_files_for_linting(file_contents: Dict[str, str],
+                            worktree_is_current: bool) -> Tuple[Dict[str, str], Optional[str]]:
+    """
+    Writes files that are not checked out at the reviewed commit to a staging directory.
+    
+    The linters work on paths, so content read from the object database must
+    exist on disk for them. The staging directory is created per run inside
+    the repository, so the linters still pick up its root configs; the
+    caller removes it once linting is done.
+    
+    Args:
+        file_contents: Reviewed contents by path
+        worktree_is_current: Result of worktree_matches_commit()
+        
+    Returns:
+        Tuple of (mapping of file path to the path the linters should read,
+        staging directory or None if nothing was staged)
+    """
+    lint_paths = {}
+    staging_dir = None
+    for file_path, code_content in file_contents.items():
+        has_linter = os.path.splitext(file_path)[1] in LINTER_REGISTRY
+        if not has_linter or (worktree_is_current and os.path.exists(file_path)):
+            lint_paths[file_path] = file_path
+            continue
+        try:
+            if staging_dir is None:
+                staging_parent = os.path.dirname(LINT_STAGING_DIR) or "."
+                staging_dir = os.path.relpath(tempfile.mkdtemp(
+                    prefix=f"{os.path.basename(LINT_STAGING_DIR)}-", dir=staging_parent
+                ))
+            staged_path = os.path.join(staging_dir, file_path)
+            os.makedirs(os.path.dirname(staged_path), exist_ok=True)
+            with open(staged_path, "w", encoding="utf-8") as staged_file:
+                staged_file.write(code_content)
+            lint_paths[file_path] = staged_path
+        except OSError as error:
+            logger.error(f"Could not stage {file_path} for linting: {error}")
+    return lint_paths, staging_dir
+
+def lint_changed_files(file_contents: Dict[str, str], worktree_is_current: bool,
+                       executor: Optional[ThreadPoolExecutor] = None) -> Dict[str, Optional[LintReport]]:
+    """
+    Lints the changed files, staging the ones that are not checked out.
+    
+    Args:
+        file_contents: Reviewed contents by path
+        worktree_is_current: Result of worktree_matches_commit()
+        executor: Pool used to run the linter groups concurrently
+        
+    Returns:
+        Mapping of file path to its lint report, None where no linter is registered
+    """
+    lint_paths, staging_dir = stage_files_for_linting(file_contents, worktree_is_current)
+    try:
+        staged_contents = {
+            lint_paths[path]: content for path, content in file_contents.items() if path in lint_paths
+        }
+        key_paths = {lint_path: path for path, lint_path in lint_paths.items() if lint_path != path}
+        staged_reports = run_linters_batched(list(staged_contents), executor, staged_contents, key_paths)
+    finally:
+        if staging_dir is not None:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+    linter_reports: Dict[str, Optional[LintReport]] = {}
+    for file_path, lint_path in lint_paths.items():
+        linter_report = staged_reports.get(lint_path)
+        # Cached reports may carry the path of an earlier run's staging directory
+        if linter_report is not None:
+            linter_report = linter_report.with_path(file_path)
+        linter_reports[file_path] = linter_report
+    return linter_reports
+
+def lint_with_llm(file_path: str, language: str, config_list: List[Dict]) -> str:
+    """
+    Asks the Code_Checker agent to lint a file type missing from LINTER_REGISTRY.
+    
+    Args:
+        file_path: Path of the file to lint
+        language: Language hint from detect_language_hint()
+        config_list: AutoGen model configuration list
+        
+    Returns:
+        Linting results as string
+    """
+    code_checker, _, user_proxy = get_thread_agents(config_list)
+    if code_checker is None:
+        return "No linter available for this file type."
+    extension = os.path.splitext(file_path)[1] or "none"
+    lint_task = (f"Run the correct linter for: '{file_path}'\n"
+                 f"File extension: {extension}\nDetected language: {language}")
+    return run_llm_chat(user_proxy, code_checker, lint_task, config_list)
+
+def build_review_excerpt(code_content: str, patch: Optional[str]) -> Optional[str]:
+    """
+    Builds the diff excerpt reviewed in "diff" mode.
+    
+    Args:
+        code_content: File content
+        patch: Unified diff patch of the file in this commit, if known
+        
+    Returns:
+        Changed hunks plus REVIEW_CONTEXT_LINES of context, or None to review the whole file
+    """
+    if REVIEW_MODE != "diff":
+        return None
+    return build_hunk_excerpt(code_content, patch, REVIEW_CONTEXT_LINES)
+
+def build_review_task(language: str, code_content: str, excerpt: Optional[str],
+                      token_budget: int, model: str) -> str:
+    """
+    Builds the review message for one file.
+    
+    Args:
+        language: Language label from LANGUAGE_MAP
+        code_content: File content
+        excerpt: Diff excerpt from build_review_excerpt(); None reviews the start of the file
+        token_budget: Maximum tokens of code in the prompt
+        model: Model name used to count tokens
+        
+    Returns:
+        Review task message
+    """
+    if excerpt is not None:
+        truncated_excerpt = truncate_to_tokens(excerpt, token_budget, model)
+        return (
+            f"Review the changes in this {language} file for optimizations and standards. "
+            f"Lines are numbered; '+' marks added lines and '-' removed ones, the rest is context. "
+            f"Focus on the changed lines.\n\n```{language}\n{truncated_excerpt}\n```"
+        )
+    # Truncate large files for review
+    truncated_content = truncate_to_tokens(code_content, token_budget, model)
+    return f"Review this {language} code for optimizations and standards:\n\n```{language}\n{truncated_content}\n```"
+
+_chunk_pool: Optional[ThreadPoolExecutor] = None
+_chunk_pool_lock = threading.Lock()
+
+def get_chunk_pool() -> ThreadPoolExecutor:
+    """
+    Returns the pool that runs chunk reviews.
+    
+    It is separate from the per-file review pool so a file review waiting on
+    its chunks never starves the chunks of worker threads.
+    
+    Returns:
+        Shared ThreadPoolExecutor
+    """
+    global _chunk_pool
+    with _chunk_pool_lock:
+        if _chunk_pool is None:
+            _chunk_pool = ThreadPoolExecutor(max_workers=REVIEW_WORKERS, thread_name_prefix="chunk-review")
+        return _chunk_pool
+
+def review_chunk(file_path: str, lines: str, review_task: str, config_list: List[Dict],
+                 usage: Dict[str, int]) -> str:
+    """
+    Reviews one chunk of a large file.
+    
+    Args:
+        file_path: Path of the reviewed file
+        lines: Line range of the chunk, for the profile
+        review_task: Review message for the chunk
+        config_list: AutoGen model configuration list
+        usage: Counter dict for this chunk's token usage
+        
+    Returns:
+        Review text for the chunk
+    """
+    with get_profiler().span("review_chunk", "file", path=file_path, lines=lines):
+        _, code_reviewer, user_proxy = get_thread_agents(config_list)
+        return run_llm_chat(user_proxy, code_reviewer, review_task, config_list, use_cache=True, usage=usage)
+
+def review_chunks(file_path: str, chunks: List[Tuple[str, str, str]], config_list: List[Dict],
+                  usage: Dict[str, int]) -> str:
+    """
+    Reviews the chunks of a large file concurrently and merges the findings.
+    
+    Args:
+        file_path: Path of the reviewed file
+        chunks: (line range, section title, review task) of each chunk, in file order
+        config_list: AutoGen model configuration list
+        usage: Counter dict that receives the summed token usage of all chunks
+        
+    Returns:
+        Merged review text, one section per chunk in file order
+    """
+    logger.info(f"Reviewing {file_path} in {len(chunks)} chunk(s)")
+    chunk_usages: List[Dict[str, int]] = [{} for _ in chunks]
+    futures = [
+        get_chunk_pool().submit(review_chunk, file_path, lines, review_task, config_list, chunk_usage)
+        for (lines, _, review_task), chunk_usage in zip(chunks, chunk_usages)
+    ]
+    sections = []
+    for (lines, title, _), future in zip(chunks, futures):
+        try:
+            chunk_review = future.result()
+        except Exception as error:
+            logger.error(f"Chunk review failed for {file_path}:{lines}: {error}")
+            chunk_review = "Error occurred"
+        sections.append(f"{title}:\n{chunk_review}")
+    for chunk_usage in chunk_usages:
+        for counter, tokens in chunk_usage.items():
+            usage[counter] = usage.get(counter, 0) + tokens
+    return "\n\n".join(sections)
+
+def review_python_chunks(file_path: str, language: str, code_content: str, config_list: List[Dict],
+                         token_budget: int, usage: Dict[str, int]) -> str:
+    """
+    Reviews a large Python file chunk by chunk and merges the findings.
+    
+    The file is split at function and class boundaries, chunks are reviewed
+    concurrently, and the answers are combined in source order.
+    
+    Args:
+        file_path: Path of the reviewed file
+        language: Language label from LANGUAGE_MAP
+        code_content: File content
+        config_list: AutoGen model configuration list
+        token_budget: Token budget of a single review prompt
+        usage: Counter dict that receives the summed token usage of all chunks
+        
+    Returns:
+        Merged review text
+    """
+    model = get_model_name(config_list)
+    chunks = []
+    for chunk in split_python_source(
+        code_content, min(REVIEW_CHUNK_TOKENS, token_budget), lambda text: count_tokens(text, model)
+    ):
+        lines = f"{chunk.start_line}-{chunk.end_line}"
+        scope = f" ({', '.join(chunk.names)})" if chunk.names else ""
+        review_task = (
+            f"Review lines {lines}{scope} of the {language} file {file_path} "
+            f"for optimizations and standards. Only this part of the file is shown:"
+            f"\n\n```{language}\n{chunk.text}\n```"
+        )
+        chunks.append((lines, f"Lines {lines}{scope}", review_task))
+    return review_chunks(file_path, chunks, config_list, usage)
+
+def review_excerpt_chunks(file_path: str, language: str, code_content: str, excerpt: str,
+                          config_list: List[Dict], token_budget: int, usage: Dict[str, int]) -> str:
+    """
+    Reviews a diff excerpt too large for one prompt in parts split at region boundaries.
+    
+    Args:
+        file_path: Path of the reviewed file
+        language: Language label from LANGUAGE_MAP
+        code_content: File content
+        excerpt: Diff excerpt from build_review_excerpt()
+        config_list: AutoGen model configuration list
+        token_budget: Token budget of a single review prompt
+        usage: Counter dict that receives the summed token usage of all parts
+        
+    Returns:
+        Merged review text
+    """
+    model = get_model_name(config_list)
+    chunks = []
+    parts = split_excerpt(excerpt, min(REVIEW_CHUNK_TOKENS, token_budget), lambda text: count_tokens(text, model))
+    for part in parts:
+        # Parts start with their first "@@ lines a-b @@" header
+        lines = part.split(" @@", 1)[0].replace("@@ lines ", "")
+        review_task = build_review_task(language, code_content, part, token_budget, model)
+        chunks.append((lines, f"Lines {lines}", review_task))
+    return review_chunks(file_path, chunks, config_list, usage)
+
+def review_file(file_path: str, language: str, code_content: str, config_list: List[Dict],
+                patch: Optional[str] = None) -> ReviewResult:
+    """
+    Runs the LLM code review for one file.
+    
+    Args:
+        file_path: Path of the reviewed file
+        language: Language label from LANGUAGE_MAP
+        code_content: File content
+        config_list: AutoGen model configuration list
+        patch: Unified diff patch of the file in this commit, if known
+        
+    Returns:
+        Review outcome for the report
+    """
+    with get_profiler().span("review_file", "file", path=file_path):
+        logger.info(f"Reviewing file: {file_path}")
+        try:
+            model = get_model_name(config_list)
+            token_budget = review_token_budget(config_list)
+            usage: Dict[str, int] = {}
+            excerpt = build_review_excerpt(code_content, patch)
+            # Reviews that would be truncated are chunked instead: whole Python
+            # files (or new ones) at function and class boundaries, diff
+            # excerpts at their region boundaries
+            oversized = count_tokens(code_content if excerpt is None else excerpt, model) > token_budget
+            if oversized and file_path.endswith(".py") and (excerpt is None or is_file_addition(patch)):
+                review_report = review_python_chunks(
+                    file_path, language, code_content, config_list, token_budget, usage
+                )
+            elif oversized and excerpt is not None:
+                review_report = review_excerpt_chunks(
+                    file_path, language, code_content, excerpt, config_list, token_budget, usage
+                )
+            else:
+                _, code_reviewer, user_proxy = get_thread_agents(config_list)
+                review_task = build_review_task(language, code_content, excerpt, token_budget, model)
+                review_report = run_llm_chat(
+                    user_proxy, code_reviewer, review_task, config_list, use_cache=True, usage=usage
+                )
+
+            prompt_tokens = usage.get("prompt_tokens", 0)
+            completion_tokens = usage.get("completion_tokens", 0)
+            logger.info(f"Review tokens for {file_path}: {prompt_tokens} prompt, {completion_tokens} completion")
+            return ReviewResult(review_report, prompt_tokens, completion_tokens, cached=not usage)
+        except Exception as error:
+            logger.error(f"Code review failed for {file_path}: {error}")
+            return ReviewResult(None)
+
+def review_file_batch(batch: List[PackedFile], file_contents: Dict[str, str],
+                      changed_patches: Dict[str, Optional[str]], config_list: List[Dict]) -> Dict[str, ReviewResult]:
+    """
+    Reviews several small files in one LLM request.
+    
+    Files the model leaves out of its answer are reviewed on their own.
+    
+    Args:
+        batch: Files packed by plan_batches()
+        file_contents: File contents by path
+        changed_patches: Patches by path
+        config_list: AutoGen model configuration list
+        
+    Returns:
+        Mapping of file path to its review outcome
+    """
+    paths = [packed_file.path for packed_file in batch]
+    with get_profiler().span("review_batch", "file", paths=paths):
+        logger.info(f"Reviewing {len(batch)} small files in one request: {', '.join(paths)}")
+        usage: Dict[str, int] = {}
+        try:
+            _, code_reviewer, user_proxy = get_thread_agents(config_list)
+            response = run_llm_chat(
+                user_proxy, code_reviewer, build_batch_task(batch), config_list, use_cache=True, usage=usage
+            )
+            sections = split_batch_review(response, paths)
+        except Exception as error:
+            logger.error(f"Batched code review failed for {', '.join(paths)}: {error}")
+            sections = {}
+
+        reviews = {}
+        for packed_file in batch:
+            if packed_file.path in sections:
+                reviews[packed_file.path] = ReviewResult(
+                    sections[packed_file.path],
+                    usage.get("prompt_tokens", 0),
+                    usage.get("completion_tokens", 0),
+                    cached=not usage,
+                    shared_by=len(batch)
+                )
+                continue
+            logger.warning(f"Batched review did not cover {packed_file.path}; reviewing it on its own")
+            reviews[packed_file.path] = review_file(
+                packed_file.path, packed_file.language, file_contents[packed_file.path],
+                config_list, changed_patches.get(packed_file.path)
+            )
+        return reviews
+
+def submit_reviews(file_contents: Dict[str, str], changed_patches: Dict[str, Optional[str]],
+                   config_list: List[Dict], review_pool: ThreadPoolExecutor) -> Dict[str, Future]:
+    """
+    Schedules the LLM reviews of all reviewable files.
+    
+    Small files are bin-packed into shared requests; everything else gets its
+    own request.
+    
+    Args:
+        file_contents: File contents by path
+        changed_patches: Patches by path
+        config_list: AutoGen model configuration list
+        review_pool: Pool running the reviews
+        
+    Returns:
+        Mapping of file path to a future; batched files share one future whose
+        result is a dict of review outcomes, the others resolve to their ReviewResult
+    """
+    model = get_model_name(config_list)
+    review_futures: Dict[str, Future] = {}
+    small_files: List[PackedFile] = []
+    for file_path, code_content in file_contents.items():
+        language = LANGUAGE_MAP.get(os.path.splitext(file_path)[1])
+        if language is None:
+            continue
+        patch = changed_patches.get(file_path)
+        excerpt = build_review_excerpt(code_content, patch)
+        body = excerpt if excerpt is not None else code_content
+        tokens = count_tokens(body, model)
+        if tokens <= SMALL_FILE_TOKENS:
+            small_files.append(PackedFile(file_path, language, body, tokens, excerpt is not None))
             continue
+        review_futures[file_path] = review_pool.submit(
+            review_file, file_path, language, code_content, config_list, patch
+        )
+
+    token_budget = review_token_budget(config_list) if small_files else 0
+    for batch in plan_batches(small_files, token_budget, REVIEW_BATCH_MAX_FILES):
+        if len(batch) == 1:
+            packed_file = batch[0]
+            review_futures[packed_file.path] = review_pool.submit(
+                review_file, packed_file.path, packed_file.language, file_contents[packed_file.path],
+                config_list, changed_patches.get(packed_file.path)
+            )
+            continue
+        batch_future = review_pool.submit(review_file_batch, batch, file_contents, changed_patches, config_list)
+        for packed_file in batch:
+            review_futures[packed_file.path] = batch_future
+    return review_futures
+
+# === 3. MAIN EXECUTION ===
+def run_review(job: ReviewJob, lint_pool: ThreadPoolExecutor,
+               review_pool: ThreadPoolExecutor) -> Optional[List[str]]:
+    """
+    Reviews one commit or push range and writes (and mails) its report.
+    
+    The CLI runs a single job; the webhook service calls this for every
+    queued job with long-lived pools, so agents, caches and linters stay warm.
+    
+    Args:
+        job: Commit or push range to review
+        lint_pool: Pool for file reads and linter processes
+        review_pool: Pool for LLM reviews
+        
+    Returns:
+        Report files written, or None if the job changed no files
+    """
+    start_job(job)
+    profiler = start_run_profile()
+
+    # Run the Review
+    logger.info("Starting Multi-Language AutoGen Code Review...")
+    with profiler.span("discover"):
+        changes = discover_changed_files(job.repo_name, job.commit_sha, job.github_token, job.before_sha)
+    changed_files = list(changes)
+    changed_patches = {file_path: change.patch for file_path, change in changes.items()}
+
+    if not changed_files:
+        logger.info("No files changed in this push.")
+        return None
+
+    config_list = get_llm_config_list()
 
-        # Task 1: Linter Check
+    before_sha = push_range_base(job.before_sha)
+    commit_sha = job.commit_sha
+    reviewed_revision = f"commits {before_sha[:7]}..{commit_sha[:7]}" if before_sha else f"commit {commit_sha[:7]}"
+    report = ReportWriter(job.report_basename, REPORT_FORMATS)
+    report.begin(f"AutoGen Code Review for {reviewed_revision}", job.actor)
+    language_map = LANGUAGE_MAP
+
+    # Deleted, binary and rename-only changes cannot produce findings; settle
+    # them from the change records before reading anything
+    with profiler.span("filter"):
+        read_results: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        for file_path, change in changes.items():
+            skip_note = skip_reason(change)
+            if skip_note is not None:
+                logger.info(f"{file_path}: {skip_note}")
+                read_results[file_path] = (None, skip_note)
+        # Generated and vendored files never reach the reviewer; path and
+        # .gitattributes matches are known before reading, the rest after
+        generated_files: Dict[str, str] = {}
+        detector = load_generated_detector(commit_sha) if GENERATED_CODE_POLICY != "review" else None
+        if detector is not None:
+            for file_path in changed_files:
+                reason = detector.classify_path(file_path) if file_path not in read_results else None
+                if reason is None:
+                    continue
+                generated_files[file_path] = reason
+                if GENERATED_CODE_POLICY == "skip":
+                    read_results[file_path] = (None, f"Generated or vendored code ({reason}). Skipped.")
+        files_to_read = [file_path for file_path in changed_files if file_path not in read_results]
+
+    with profiler.span("read_files"):
+        read_results.update(zip(files_to_read, lint_pool.map(
+            read_changed_file, files_to_read, [changes[path].blob_sha for path in files_to_read]
+        )))
+    file_contents = {path: content for path, (content, _) in read_results.items() if content is not None}
+    with profiler.span("detect_generated"):
+        if detector is not None:
+            for file_path, content in list(file_contents.items()):
+                reason = generated_files.get(file_path) or detector.classify(file_path, content)
+                if reason is None:
+                    continue
+                logger.info(f"{file_path} looks generated or vendored ({reason})")
+                generated_files[file_path] = reason
+                if GENERATED_CODE_POLICY == "skip":
+                    read_results[file_path] = (None, f"Generated or vendored code ({reason}). Skipped.")
+                    del file_contents[file_path]
+
+    # Task 2: Code Review (only for code files), started before linting so both overlap
+    with profiler.span("plan_reviews"):
+        review_futures = submit_reviews(
+            {path: content for path, content in file_contents.items() if path not in generated_files},
+            changed_patches, config_list, review_pool
+        )
+
+    # Task 1: Linter Check, one process per linter and chunk, run in parallel
+    with profiler.span("lint"):
         try:
-            lint_task = f"Run the correct linter for: '{file_path}'"
-            user_proxy.initiate_chat(code_checker, message=lint_task, clear_history=True)
-            linter_report = user_proxy.last_message(code_checker)["content"]
-            full_report_text += f"**Linter Check ({language}):**\n{linter_report}\n\n"
+            linter_reports = lint_changed_files(file_contents, worktree_matches_commit(commit_sha), lint_pool)
         except Exception as error:
-            logger.error(f"Linter check failed: {error}")
-            full_report_text += f"**Linter Check:** Error occurred\n\n"
+            logger.error(f"Batched linter run failed: {error}")
+            linter_reports = {}
 
-        # Task 2: Code Review (only for code files, limit content size)
-        if file_extension in language_map:
+    # Unregistered types fall back to the LLM dispatcher when enabled and a
+    # registered linter understands their language
+    fallback_futures: Dict[str, Future] = {}
+    unlinted_notes: Dict[str, str] = {}
+    for file_path, linter_report in linter_reports.items():
+        if linter_report is not None or not LLM_LINT_FALLBACK:
+            continue
+        language_hint = detect_language_hint(file_path, file_contents.get(file_path, ""))
+        if language_hint is None:
+            unlinted_notes[file_path] = "No linter or reviewer for this file type. Not sent to the LLM."
+            continue
+        fallback_futures[file_path] = review_pool.submit(lint_with_llm, file_path, language_hint, config_list)
+
+    # Stream the report in changed-file order regardless of completion order
+    with profiler.span("collect_results"):
+        for file_path in changed_files:
+            file_extension = os.path.splitext(file_path)[1]
+            language = language_map.get(file_extension, f"Unknown ({file_extension})")
+
+            _, skip_note = read_results[file_path]
+            if skip_note is not None:
+                report.add(FileReport(file_path, language, skip_note=skip_note))
+                continue
+
+            findings = None
+            lint_tool = None
             try:
-                # Truncate large files for review
-                truncated_content = code_content[:5000] if len(code_content) > 5000 else code_content
-                review_task = f"Review this {language} code for optimizations and standards:\n\n```{language}\n{truncated_content}\n```"
-                
-                user_proxy.initiate_chat(code_reviewer, message=review_task, clear_history=True)
-                review_report = user_proxy.last_message(code_reviewer)["content"]
-                full_report_text += f"**Review:**\n{review_report}\n\n"
+                if file_path in fallback_futures:
+                    linter_report = fallback_futures[file_path].result()
+                elif linter_reports.get(file_path) is not None:
+                    linter_report = linter_reports[file_path].format()
+                    findings = linter_reports[file_path].findings
+                    lint_tool = linter_reports[file_path].tool
+                elif file_path in linter_reports:
+                    linter_report = "No linter available for this file type."
+                else:
+                    raise RuntimeError("no linter result")
             except Exception as error:
-                logger.error(f"Code review failed: {error}")
-                full_report_text += f"**Review:** Error occurred\n\n"
+                logger.error(f"Linter check failed for {file_path}: {error}")
+                linter_report = None
+
+            review = None
+            review_note = None
+            if file_path in review_futures:
+                review = review_futures[file_path].result()
+                if isinstance(review, dict):  # shared small-file request
+                    review = review[file_path]
+            elif file_path in generated_files:
+                review_note = f"Generated or vendored code ({generated_files[file_path]}). Linted only."
+            elif file_path in unlinted_notes:
+                review_note = unlinted_notes[file_path]
+
+            report.add(FileReport(file_path, language, linter=linter_report, findings=findings,
+                                  lint_tool=lint_tool, review=review, review_note=review_note))
 
-        full_report_text += f"--- End of Report for {file_path} ---\n\n"
+    summary = []
+    review_cache = get_review_cache()
+    if review_cache is not None:
+        logger.info(review_cache.summary())
+        summary.append(review_cache.summary())
 
-        processed_count += 1
-        # Rate limiting: only sleep after every 2 files
-        if processed_count % 2 == 0 and processed_count < len(changed_files):
-            logger.info("Rate limit delay...")
-            time.sleep(5)
+    # Finish the report outputs and send the PDF
+    logger.info("All files analyzed. Finishing the report.")
+    with profiler.span("finish_report"):
+        report.finish(summary)
+    report_files = report.filenames
+    pdf_file = f"{job.report_basename}.pdf"
+    attachment = pdf_file if pdf_file in report_files else next(iter(report_files), "")
 
-    # Generate PDF and Send Email
-    logger.info("All files analyzed. Generating final report.")
-    create_pdf(full_report_text, "report.pdf")
+    developer_email = f"{job.actor}@users.noreply.github.com"
+    email_subject = f"Code Review Report for {job.repo_name}"
+    email_body = f"Hi {job.actor},\n\nAutomated code review for {reviewed_revision}.\n\nFull report attached."
 
-    developer_email = f"{GITHUB_ACTOR}@users.noreply.github.com"
-    email_subject = f"Code Review Report for {REPO_NAME}"
-    email_body = f"Hi {GITHUB_ACTOR},\n\nAutomated code review for commit {COMMIT_SHA[:7]}.\n\nFull report attached."
+    with profiler.span("email"):
+        send_email(developer_email, email_subject, email_body, attachment)
 
-    send_email(developer_email, email_subject, email_body, "report.pdf")
+    profiler.write(job.profile_path)
+    return report_files
 
+def main():
+    """Main execution function."""
+    if not validate_environment():
+        sys.exit(1)
+
+    with ThreadPoolExecutor(max_workers=LINT_WORKERS) as lint_pool, \
+            ThreadPoolExecutor(max_workers=REVIEW_WORKERS) as review_pool:
+        report_files = run_review(job_from_environment(), lint_pool, review_pool)
+    if report_files is None:
+        logger.info("Nothing to review. Exiting.")
+        sys.exit(0)
     logger.info("AutoGen Code Review process finished.")
 
 if __name__ == "__main__":
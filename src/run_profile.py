@@ -0,0 +1,196 @@
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Span kind whose time is spent waiting on a child process (linters, git)
+SUBPROCESS = "subprocess"
+
+
+def _children_cpu_seconds() -> float:
+    """Returns the CPU time used by finished child processes."""
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Returns the peak resident set size of this process in MB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if os.uname().sysname == "Darwin" else 1024), 1)
+
+
+class RunProfiler:
+    """
+    Collects timing spans and LLM call records for one review run.
+
+    A span costs two clock reads per side and one list append, so stages and
+    individual files can be instrumented without measurable overhead. Spans
+    nest per thread; each one records wall and thread CPU time. When disabled,
+    spans record nothing.
+    """
+
+    def __init__(self, enabled: bool = True):
+        """
+        Args:
+            enabled: Whether to record anything
+        """
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._spans: List[Dict[str, Any]] = []
+        self._llm_calls: List[Dict[str, Any]] = []
+        self._start_wall = time.perf_counter()
+        self._start_cpu = time.process_time()
+        self._start_children_cpu = _children_cpu_seconds()
+        self._started_at = time.time()
+
+    @contextmanager
+    def span(self, name: str, kind: str = "stage", **attributes: Any) -> Iterator[None]:
+        """
+        Times a block of code.
+
+        Args:
+            name: Span name, e.g. "discover" or "review_file"
+            kind: "stage", "file", SUBPROCESS or another grouping label
+            **attributes: Extra JSON-serializable details (path, tool, ...)
+        """
+        if not self.enabled:
+            yield
+            return
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        parent = stack[-1] if stack else None
+        with self._lock:
+            span_id = len(self._spans)
+            self._spans.append({})  # reserve the id so children can point at it
+        stack.append(span_id)
+        start_wall = time.perf_counter()
+        start_cpu = time.thread_time()
+        error = None
+        try:
+            yield
+        except BaseException as raised:
+            error = type(raised).__name__
+            raise
+        finally:
+            wall = time.perf_counter() - start_wall
+            cpu = time.thread_time() - start_cpu
+            stack.pop()
+            record = {
+                "id": span_id,
+                "parent": parent,
+                "name": name,
+                "kind": kind,
+                "thread": threading.current_thread().name,
+                "start": round(start_wall - self._start_wall, 6),
+                "wall": round(wall, 6),
+                "cpu": round(cpu, 6),
+            }
+            if attributes:
+                record["attributes"] = attributes
+            if error is not None:
+                record["error"] = error
+            self._spans[span_id] = record
+
+    def record_llm_call(self, model: str, latency: float, prompt_tokens: int, completion_tokens: int,
+                        queued: float = 0.0, requests: int = 1) -> None:
+        """
+        Records one LLM chat.
+
+        Args:
+            model: Model name
+            latency: Seconds spent in the chat itself
+            prompt_tokens: Prompt tokens used
+            completion_tokens: Completion tokens used
+            queued: Seconds spent waiting for the rate limiter first
+            requests: API requests the chat made
+        """
+        if not self.enabled:
+            return
+        stack = getattr(self._local, "stack", None)
+        with self._lock:
+            self._llm_calls.append({
+                "model": model,
+                "span": stack[-1] if stack else None,
+                "start": round(time.perf_counter() - self._start_wall - latency, 6),
+                "latency": round(latency, 6),
+                "queued": round(queued, 6),
+                "requests": requests,
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+            })
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Builds the run profile.
+
+        Returns:
+            JSON-ready profile: totals, per-name span aggregates, spans and LLM calls
+        """
+        with self._lock:
+            spans = [span for span in self._spans if span]
+            llm_calls = list(self._llm_calls)
+        by_name: Dict[str, Dict[str, Any]] = {}
+        for span in spans:
+            aggregate = by_name.setdefault(span["name"], {"kind": span["kind"], "count": 0, "wall": 0.0, "cpu": 0.0})
+            aggregate["count"] += 1
+            aggregate["wall"] += span["wall"]
+            aggregate["cpu"] += span["cpu"]
+        for aggregate in by_name.values():
+            aggregate["wall"] = round(aggregate["wall"], 6)
+            aggregate["cpu"] = round(aggregate["cpu"], 6)
+        latencies = sorted(call["latency"] for call in llm_calls)
+        return {
+            "started_at": self._started_at,
+            "totals": {
+                "wall_seconds": round(time.perf_counter() - self._start_wall, 6),
+                "cpu_seconds": round(time.process_time() - self._start_cpu, 6),
+                "subprocess_cpu_seconds": round(_children_cpu_seconds() - self._start_children_cpu, 6),
+                "subprocess_wall_seconds": round(
+                    sum(span["wall"] for span in spans if span["kind"] == SUBPROCESS), 6
+                ),
+                "peak_rss_mb": _peak_rss_mb(),
+                "llm_calls": len(llm_calls),
+                "llm_latency_seconds": round(sum(latencies), 6),
+                "llm_latency_p50": latencies[len(latencies) // 2] if latencies else None,
+                "llm_latency_max": latencies[-1] if latencies else None,
+                "llm_queued_seconds": round(sum(call["queued"] for call in llm_calls), 6),
+                "prompt_tokens": sum(call["prompt_tokens"] for call in llm_calls),
+                "completion_tokens": sum(call["completion_tokens"] for call in llm_calls),
+            },
+            "stages": by_name,
+            "spans": spans,
+            "llm_calls": llm_calls,
+        }
+
+    def write(self, path: str) -> None:
+        """
+        Writes the run profile as JSON.
+
+        Args:
+            path: Output file
+        """
+        if not self.enabled:
+            return
+        try:
+            with open(path, "w", encoding="utf-8") as profile_file:
+                json.dump(self.summary(), profile_file, indent=1)
+            logger.info(f"Run profile written: {path}")
+        except OSError as error:
+            logger.error(f"Could not write run profile: {error}")
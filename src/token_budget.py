@@ -0,0 +1,119 @@
+import logging
+import re
+from functools import lru_cache
+from typing import Any, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+# Rough pieces a BPE tokenizer rarely merges across: words, numbers, single symbols
+_TOKEN_PIECE = re.compile(r"[A-Za-z]+|\d{1,3}|[^\sA-Za-z\d]")
+
+# Encoding used when tiktoken does not know the model (e.g. OpenRouter model ids)
+FALLBACK_ENCODING = "o200k_base"
+
+
+@lru_cache(maxsize=None)
+def _get_encoding(model: str) -> Optional[Any]:
+    """
+    Returns the tiktoken encoding for a model, or None without tiktoken.
+
+    Args:
+        model: Model name from the config list
+
+    Returns:
+        tiktoken Encoding, or None if tiktoken is not installed or its
+        encoding cannot be loaded
+    """
+    try:
+        import tiktoken
+    except ImportError:
+        logger.info("tiktoken not installed; using heuristic token counts")
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model.split("/")[-1])
+        except KeyError:
+            return tiktoken.get_encoding(FALLBACK_ENCODING)
+    except Exception as error:
+        # tiktoken downloads its BPE files on first use, which fails offline
+        logger.warning(f"Could not load the tiktoken encoding for '{model}' ({error}); "
+                       f"using heuristic token counts")
+        return None
+
+
+def count_tokens(text: str, model: str = "") -> int:
+    """
+    Counts the tokens of a text for a model.
+
+    Uses tiktoken when it is installed. Otherwise, counts word, number and
+    symbol pieces, which tracks BPE tokenizers far better than a fixed
+    characters-per-token ratio on minified code.
+
+    Args:
+        text: Text to measure
+        model: Model name from the config list
+
+    Returns:
+        Number of tokens
+    """
+    encoding = _get_encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return max(len(_TOKEN_PIECE.findall(text)), len(text) // 4)
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str = "") -> str:
+    """
+    Cuts a text to at most max_tokens, preferring to end at a line break.
+
+    Args:
+        text: Text to truncate
+        max_tokens: Token budget
+        model: Model name from the config list
+
+    Returns:
+        The text itself if it fits, otherwise its longest fitting prefix
+    """
+    if count_tokens(text, model) <= max_tokens:
+        return text
+    encoding = _get_encoding(model)
+    if encoding is not None:
+        prefix = encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens])
+    else:
+        low, high = 0, len(text)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if count_tokens(text[:middle], model) <= max_tokens:
+                low = middle
+            else:
+                high = middle - 1
+        prefix = text[:low]
+    last_newline = prefix.rfind("\n")
+    return prefix[:last_newline + 1] if last_newline > 0 else prefix
+
+
+def prompt_token_budget(config_entry: Mapping, system_prompt: str, default_budget: int,
+                        completion_reserve: int) -> int:
+    """
+    Returns how many tokens of code a review prompt may carry for a model.
+
+    The configured budget ("prompt_token_budget" on the config entry, else the
+    default) is capped so system prompt, code and completion fit the model's
+    "context_window" when one is configured.
+
+    Args:
+        config_entry: Config list entry of the model
+        system_prompt: Reviewer system prompt
+        default_budget: Budget used when the entry does not set one
+        completion_reserve: Tokens kept free for the answer
+
+    Returns:
+        Token budget for the code part of the prompt
+    """
+    model = config_entry.get("model", "")
+    budget = int(config_entry.get("prompt_token_budget") or default_budget)
+    context_window = config_entry.get("context_window")
+    if context_window:
+        available = int(context_window) - count_tokens(system_prompt, model) - completion_reserve
+        budget = min(budget, available)
+    return max(budget, 1)
@@ -0,0 +1,142 @@
+import subprocess
+
+import pytest
+
+from git_discovery import git_changed_files, parse_raw_diff, split_patches
+
+OLD_SHA = "1" * 40
+NEW_SHA = "2" * 40
+ZERO_SHA = "0" * 40
+
+
+def raw_record(status, *paths, old_sha=OLD_SHA, new_sha=NEW_SHA):
+    """Builds one "--raw -z" record: the metadata field followed by its path fields."""
+    return [f":100644 100644 {old_sha} {new_sha} {status}", *paths]
+
+
+def diff_output(*fields):
+    return "\0".join(fields) + "\0"
+
+
+def test_parse_raw_diff_modification_addition_and_deletion():
+    output = diff_output(
+        *raw_record("M", "src/app.py"),
+        *raw_record("A", "new.py", old_sha=ZERO_SHA),
+        *raw_record("D", "gone.py", new_sha=ZERO_SHA),
+        "3\t1\tsrc/app.py",
+        "5\t0\tnew.py",
+        "0\t7\tgone.py",
+    )
+    changes, line_counts = parse_raw_diff(output)
+    assert changes == [
+        ("M", "src/app.py", None, NEW_SHA),
+        ("A", "new.py", None, NEW_SHA),
+        ("D", "gone.py", None, None),
+    ]
+    assert line_counts == {"src/app.py": (3, 1), "new.py": (5, 0), "gone.py": (0, 7)}
+
+
+def test_parse_raw_diff_rename_and_copy_records():
+    output = diff_output(
+        *raw_record("R087", "old name.py", "new name.py"),
+        *raw_record("C100", "template.py", "copy.py"),
+        "2\t1\t", "old name.py", "new name.py",
+        "0\t0\t", "template.py", "copy.py",
+    )
+    changes, line_counts = parse_raw_diff(output)
+    assert changes == [
+        ("R", "new name.py", "old name.py", NEW_SHA),
+        ("C", "copy.py", "template.py", NEW_SHA),
+    ]
+    assert line_counts == {"new name.py": (2, 1), "copy.py": (0, 0)}
+
+
+def test_parse_raw_diff_binary_numstat():
+    output = diff_output(*raw_record("M", "logo.png"), "-\t-\tlogo.png")
+    _, line_counts = parse_raw_diff(output)
+    assert line_counts == {"logo.png": (None, None)}
+
+
+def test_parse_raw_diff_keeps_spaces_tabs_and_newlines_in_paths():
+    odd_path = "dir with space/line\nbreak\tand tab.py"
+    output = diff_output(*raw_record("M", odd_path), f"1\t1\t{odd_path}")
+    changes, line_counts = parse_raw_diff(output)
+    assert changes == [("M", odd_path, None, NEW_SHA)]
+    assert line_counts == {odd_path: (1, 1)}
+
+
+def test_split_patches_keeps_hunks_per_file():
+    diff = "\n".join([
+        "diff --git a/app.py b/app.py",
+        "index 1111111..2222222 100644",
+        "--- a/app.py",
+        "+++ b/app.py",
+        "@@ -1,2 +1,2 @@",
+        " import os",
+        "-x = 1",
+        "+x = 2",
+        "diff --git a/gone.py b/gone.py",
+        "deleted file mode 100644",
+        "--- a/gone.py",
+        "+++ /dev/null",
+        "@@ -1 +0,0 @@",
+        "-print('bye')",
+        "diff --git a/logo.png b/logo.png",
+        "Binary files a/logo.png and b/logo.png differ",
+    ])
+    assert split_patches(diff) == {
+        "app.py": "@@ -1,2 +1,2 @@\n import os\n-x = 1\n+x = 2",
+        "gone.py": "@@ -1 +0,0 @@\n-print('bye')",
+    }
+
+
+def test_split_patches_rename_and_path_with_space():
+    diff = "\n".join([
+        "diff --git a/old name.py b/new name.py",
+        "similarity index 80%",
+        "rename from old name.py",
+        "rename to new name.py",
+        "--- a/old name.py\t",
+        "+++ b/new name.py\t",
+        "@@ -1 +1 @@",
+        "-a = 1",
+        "+a = 2",
+    ])
+    assert split_patches(diff) == {"new name.py": "@@ -1 +1 @@\n-a = 1\n+a = 2"}
+
+
+@pytest.fixture
+def repo(tmp_path):
+    def git(*args):
+        return subprocess.run(
+            ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+            cwd=tmp_path, check=True, capture_output=True, text=True
+        ).stdout.strip()
+
+    git("init", "-q")
+    (tmp_path / "keep.py").write_text("a = 1\n")
+    (tmp_path / "rename me.py").write_text("".join(f"line_{n} = {n}\n" for n in range(20)))
+    (tmp_path / "drop.py").write_text("b = 2\n")
+    git("add", "-A")
+    git("commit", "-qm", "base")
+    (tmp_path / "keep.py").write_text("a = 2\n")
+    (tmp_path / "rename me.py").unlink()
+    (tmp_path / "renamed\nfile.py").write_text("".join(f"line_{n} = {n * 2 if n == 3 else n}\n" for n in range(20)))
+    (tmp_path / "drop.py").unlink()
+    (tmp_path / "image.bin").write_bytes(b"\0\1\2binary")
+    git("add", "-A")
+    git("commit", "-qm", "change")
+    return tmp_path, git("rev-parse", "HEAD")
+
+
+def test_git_changed_files_against_a_real_repository(repo):
+    repo_dir, commit_sha = repo
+    changed = {changed_file.path: changed_file for changed_file in git_changed_files(commit_sha, str(repo_dir))}
+    assert set(changed) == {"keep.py", "renamed\nfile.py", "drop.py", "image.bin"}
+    assert changed["keep.py"].status == "modified"
+    assert changed["keep.py"].patch == "@@ -1 +1 @@\n-a = 1\n+a = 2"
+    assert changed["renamed\nfile.py"].status == "renamed"
+    assert "+line_3 = 6" in changed["renamed\nfile.py"].patch
+    assert changed["drop.py"].status == "removed"
+    assert changed["drop.py"].blob_sha is None
+    assert changed["image.bin"].is_binary
@@ -0,0 +1,57 @@
+from path_filter import PathFilter, parse_ignore_file
+
+REVIEWIGNORE = """
+# Generated assets
+dist/
+*.min.js
+!keep.min.js
+
+docs/**/*.md
+!docs/guide/important.md
+/build
+\\#not-a-comment.txt
+"""
+
+
+def reviewignore_filter():
+    return PathFilter(exclude=parse_ignore_file(REVIEWIGNORE))
+
+
+def test_parse_ignore_file_drops_comments_and_blank_lines():
+    assert parse_ignore_file(REVIEWIGNORE) == [
+        "dist/", "*.min.js", "!keep.min.js", "docs/**/*.md", "!docs/guide/important.md", "/build",
+        "#not-a-comment.txt",
+    ]
+
+
+def test_directory_pattern_excludes_everything_below_it_at_any_depth():
+    path_filter = reviewignore_filter()
+    assert path_filter.is_excluded("dist/app.js")
+    assert path_filter.is_excluded("packages/web/dist/deep/app.js")
+    assert not path_filter.is_excluded("distribution/app.js")
+    # A trailing slash matches directories only, never a file of that name
+    assert not path_filter.is_excluded("src/dist")
+
+
+def test_anchored_pattern_matches_only_at_the_root():
+    path_filter = reviewignore_filter()
+    assert path_filter.is_excluded("build/out.js")
+    assert not path_filter.is_excluded("src/build/out.js")
+
+
+def test_negation_reincludes_and_last_matching_rule_wins():
+    path_filter = reviewignore_filter()
+    assert path_filter.is_excluded("static/vendor.min.js")
+    assert not path_filter.is_excluded("static/keep.min.js")
+    assert path_filter.is_excluded("docs/api/index.md")
+    assert not path_filter.is_excluded("docs/guide/important.md")
+    assert PathFilter(exclude=["!keep.min.js", "*.min.js"]).is_excluded("keep.min.js")
+
+
+def test_escaped_hash_is_a_literal_pattern():
+    assert reviewignore_filter().is_excluded("#not-a-comment.txt")
+
+
+def test_include_rules_restrict_review_before_excludes_apply():
+    path_filter = PathFilter(exclude=["src/legacy/"], include=["src/**"])
+    assert path_filter.filter(["src/app.py", "src/legacy/old.py", "README.md"]) == ["src/app.py"]
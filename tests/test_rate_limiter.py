@@ -0,0 +1,108 @@
+import pytest
+
+import rate_limiter
+from rate_limiter import RateLimiter, parse_reset_seconds
+
+
+class FakeClock:
+    """Stands in for the time module; sleeping advances the clock instantly."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter, "time", fake)
+    return fake
+
+
+def test_parse_reset_seconds_formats():
+    assert parse_reset_seconds("6m0s") == 360
+    assert parse_reset_seconds("1.5s") == 1.5
+    assert parse_reset_seconds("20ms") == pytest.approx(0.02)
+    assert parse_reset_seconds("12") == 12
+    assert parse_reset_seconds("1700000030000", now=1700000000.0) == 30
+    assert parse_reset_seconds("soon") is None
+    assert parse_reset_seconds(None) is None
+
+
+def test_request_bucket_starts_full_then_refills_over_time(clock):
+    limiter = RateLimiter(requests_per_minute=60)
+    for _ in range(60):
+        assert limiter.acquire() == 0
+    # Empty bucket: one request refills every second
+    assert limiter.acquire() == pytest.approx(1.0)
+    clock.now += 5
+    for _ in range(5):
+        assert limiter.acquire() == 0
+    assert limiter.acquire() == pytest.approx(1.0)
+
+
+def test_refill_never_exceeds_the_quota(clock):
+    limiter = RateLimiter(requests_per_minute=2)
+    clock.now += 3600
+    assert limiter.acquire() == 0
+    assert limiter.acquire() == 0
+    assert limiter.acquire() == pytest.approx(30.0)
+
+
+def test_token_bucket_settles_reservations_against_real_usage(clock):
+    limiter = RateLimiter(tokens_per_minute=600)
+    assert limiter.acquire(tokens=500) == 0
+    limiter.record_usage(reserved_tokens=500, actual_tokens=100)
+    assert limiter.acquire(tokens=500) == 0
+    # 0 left; 300 tokens refill in 30 seconds
+    assert limiter.acquire(tokens=300) == pytest.approx(30.0)
+
+
+def test_unlimited_limiter_never_waits(clock):
+    limiter = RateLimiter()
+    for _ in range(1000):
+        assert limiter.acquire(tokens=10000) == 0
+    assert clock.slept == []
+
+
+def test_429_retry_after_blocks_every_caller(clock):
+    limiter = RateLimiter()
+    limiter.observe_headers({"Retry-After": "7"}, status_code=429)
+    assert limiter.acquire() == pytest.approx(7.0)
+    assert limiter.acquire() == 0
+
+
+def test_429_without_retry_after_falls_back_to_the_reset_header(clock):
+    limiter = RateLimiter()
+    limiter.observe_headers({"x-ratelimit-reset-requests": "2s"}, status_code=429)
+    assert limiter.acquire() == pytest.approx(2.0)
+
+
+def test_exhausted_remaining_quota_blocks_until_reset(clock):
+    limiter = RateLimiter(requests_per_minute=100)
+    limiter.observe_headers({"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "4s"})
+    assert limiter.acquire() == pytest.approx(4.0)
+
+
+def test_unconfigured_quota_is_learned_from_limit_headers(clock):
+    limiter = RateLimiter()
+    limiter.observe_headers({"x-ratelimit-limit-requests": "60", "x-ratelimit-remaining-requests": "1"})
+    assert limiter.requests_per_minute == 60
+    assert limiter.acquire() == 0
+    assert limiter.acquire() == pytest.approx(1.0)
+
+
+def test_configured_quota_is_not_raised_by_limit_headers(clock):
+    limiter = RateLimiter(requests_per_minute=10)
+    limiter.observe_headers({"x-ratelimit-limit-requests": "10000", "x-ratelimit-remaining-requests": "9999"})
+    assert limiter.requests_per_minute == 10
@@ -0,0 +1,34 @@
+from review_batching import FILE_MARKER, PackedFile, build_batch_task, split_batch_review
+
+PATHS = ["src/app.py", "web/index.html", "web/style.css"]
+
+
+def test_split_batch_review_round_trips_the_request_headers():
+    task = build_batch_task([PackedFile(path, "Python", "x = 1", 3, False) for path in PATHS])
+    assert all(f"{FILE_MARKER} {path} (Python, full file)" in task for path in PATHS)
+    response = "\n\n".join(f"{FILE_MARKER} {path} (Python, full file)\nLooks fine: {path}" for path in PATHS)
+    assert split_batch_review(response, PATHS) == {path: f"Looks fine: {path}" for path in PATHS}
+
+
+def test_files_without_a_header_are_missing_from_the_result():
+    response = (
+        "Overall the batch looks good.\n\n"
+        "### FILE: src/app.py\nRename `x`.\n\n"
+        "## FILE: `web/style.css`\nUse a variable for the colour.\n"
+    )
+    sections = split_batch_review(response, PATHS)
+    assert sections == {"src/app.py": "Rename `x`.", "web/style.css": "Use a variable for the colour."}
+    assert "web/index.html" not in sections
+
+
+def test_unknown_headers_and_empty_sections_are_ignored():
+    response = (
+        "### FILE: src/app.py\n\n"
+        "### FILE: other/file.py\nNot part of this request.\n"
+        "### FILE: web/index.html\nAdd a lang attribute.\n"
+    )
+    assert split_batch_review(response, PATHS) == {"web/index.html": "Add a lang attribute."}
+
+
+def test_response_without_any_header_yields_nothing():
+    assert split_batch_review("I reviewed all three files; no issues.", PATHS) == {}